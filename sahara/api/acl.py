@@ -23,6 +23,7 @@ from oslo_policy import policy
 
 from sahara import context
 from sahara import exceptions
+from sahara.utils import timing
 
 ENFORCER = None
 
@@ -38,8 +39,9 @@ def enforce(rule):
         @functools.wraps(func)
         def handler(*args, **kwargs):
             ctx = context.ctx()
-            ENFORCER.enforce(rule, {}, ctx.to_dict(), do_raise=True,
-                             exc=exceptions.Forbidden)
+            with timing.measure('auth'):
+                ENFORCER.enforce(rule, {}, ctx.to_dict(), do_raise=True,
+                                 exc=exceptions.Forbidden)
 
             return func(*args, **kwargs)
         return handler
@@ -0,0 +1,61 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from sahara.utils import timing
+
+
+class RequestTimer(object):
+    """Measures the time spent on the phases of the requests.
+
+    It should wrap the whole application including the authentication
+    middleware. Streamed response bodies are accounted to the
+    serialization phase while they are produced.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, env, start_response):
+        request_timing = timing.start(env['REQUEST_METHOD'],
+                                      env['PATH_INFO'])
+        try:
+            app_iter = self.app(env, start_response)
+        except Exception:
+            timing.finish(request_timing)
+            raise
+
+        return self._iterate(request_timing, app_iter)
+
+    @staticmethod
+    def _iterate(request_timing, app_iter):
+        try:
+            iterator = iter(app_iter)
+            while True:
+                with timing.measure('serialization'):
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        break
+                yield chunk
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+            timing.finish(request_timing)
+
+
+def wrap(app):
+    """Wrap wsgi application with request timing."""
+
+    return RequestTimer(app)
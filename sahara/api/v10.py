@@ -27,6 +27,7 @@ from sahara.service.validations import node_group_template_schema as ngt_schema
 from sahara.service.validations import node_group_templates as v_ngt
 from sahara.service.validations import plugins as v_p
 import sahara.utils.api as u
+from sahara.utils import types
 
 
 LOG = logging.getLogger(__name__)
@@ -39,8 +40,13 @@ rest = u.Rest('v10', __name__)
 @rest.get('/clusters')
 @acl.enforce("clusters:get_all")
 def clusters_list():
-    return u.render(clusters=[c.to_dict() for c in api.get_clusters(
-        **u.get_request_args().to_dict())])
+    args = u.get_search_args()
+    if u.is_summary_view():
+        return u.render_list('clusters', api.get_cluster_summaries(**args))
+
+    fields = u.get_fields()
+    return u.render_list('clusters', api.get_clusters(
+        u.get_load_fields(fields), **args), fields)
 
 
 @rest.post('/clusters')
@@ -50,6 +56,32 @@ def clusters_create(data):
     return u.render(api.create_cluster(data).to_wrapped_dict())
 
 
+@rest.post('/clusters/bulk')
+@acl.enforce("clusters:create")
+@v.validate(v_c.CLUSTERS_BULK_SCHEMA, v_c.check_clusters_bulk_create)
+def clusters_bulk_create(data):
+    return u.render(clusters=[c.to_dict() for c in api.create_clusters(
+        data['clusters'])])
+
+
+@rest.put('/clusters/bulk')
+@acl.enforce("clusters:scale")
+@v.validate(v_c_s.CLUSTERS_BULK_SCALING_SCHEMA,
+            v_c_s.check_clusters_bulk_scaling)
+def clusters_bulk_scale(data):
+    scalings = [(s.pop('id'), s) for s in data['clusters']]
+    return u.render(clusters=[c.to_dict() for c in api.scale_clusters(
+        scalings)])
+
+
+@rest.post('/clusters/bulk-delete', status_code=204)
+@acl.enforce("clusters:delete")
+@v.validate(v_c.CLUSTERS_BULK_DELETE_SCHEMA, v_c.check_clusters_bulk_delete)
+def clusters_bulk_delete(data):
+    api.terminate_clusters(data['cluster_ids'])
+    return u.render()
+
+
 @rest.put('/clusters/<cluster_id>')
 @acl.enforce("clusters:scale")
 @v.check_exists(api.get_cluster, 'cluster_id')
@@ -60,11 +92,20 @@ def clusters_scale(cluster_id, data):
 
 @rest.get('/clusters/<cluster_id>')
 @acl.enforce("clusters:get")
-@v.check_exists(api.get_cluster, 'cluster_id')
+@u.conditional(api.get_cluster_revision, id='cluster_id')
+@v.check_exists(api.get_cluster_status, 'cluster_id')
 def clusters_get(cluster_id):
+    if u.is_summary_view():
+        return u.render(api.get_cluster_summary(cluster_id).to_wrapped_dict())
+
     data = u.get_request_args()
     show_events = unicode(data.get('show_progress', 'false')).lower() == 'true'
-    return u.render(api.get_cluster(cluster_id, show_events).to_wrapped_dict())
+    fields = u.get_fields()
+    if fields and not show_events:
+        cluster = api.get_cluster(cluster_id, fields=fields)
+    else:
+        cluster = api.get_cluster(cluster_id, show_events)
+    return u.render(cluster=types.select_fields(cluster.to_dict(), fields))
 
 
 @rest.delete('/clusters/<cluster_id>')
@@ -75,14 +116,29 @@ def clusters_delete(cluster_id):
     return u.render()
 
 
+# Event ops
+
+@rest.get('/events')
+@acl.enforce("events:get")
+def events_stream():
+    return u.render_events(api.get_events())
+
+
+# Stats ops
+
+@rest.get('/stats/requests')
+@acl.enforce("stats:get")
+def request_stats_get():
+    return u.render(requests=api.get_request_stats())
+
+
 # ClusterTemplate ops
 
 @rest.get('/cluster-templates')
 @acl.enforce("cluster-templates:get_all")
 def cluster_templates_list():
-    return u.render(
-        cluster_templates=[t.to_dict() for t in api.get_cluster_templates(
-            **u.get_request_args().to_dict())])
+    return u.render_list('cluster_templates', api.get_cluster_templates(
+        **u.get_search_args()), u.get_fields())
 
 
 @rest.post('/cluster-templates')
@@ -126,10 +182,9 @@ def cluster_templates_delete(cluster_template_id):
 @rest.get('/node-group-templates')
 @acl.enforce("node-group-templates:get_all")
 def node_group_templates_list():
-    return u.render(
-        node_group_templates=[t.to_dict()
-                              for t in api.get_node_group_templates(
-                              **u.get_request_args().to_dict())])
+    return u.render_list('node_group_templates',
+                         api.get_node_group_templates(
+                             **u.get_search_args()), u.get_fields())
 
 
 @rest.post('/node-group-templates')
@@ -172,21 +227,31 @@ def node_group_templates_delete(node_group_template_id):
 @rest.get('/plugins')
 @acl.enforce("plugins:get_all")
 def plugins_list():
-    return u.render(plugins=[p.dict for p in api.get_plugins()])
+    # plugin descriptors don't change while the plugins are loaded
+    return u.render_list('plugins', [
+        u.serialized(('plugin-dict', p.name), lambda: p.dict,
+                     u.get_plugin_cache())
+        for p in api.get_plugins()])
 
 
 @rest.get('/plugins/<plugin_name>')
 @acl.enforce("plugins:get")
 @v.check_exists(api.get_plugin, plugin_name='plugin_name')
 def plugins_get(plugin_name):
-    return u.render(api.get_plugin(plugin_name).wrapped_dict)
+    return u.render_static(
+        ('plugin-document', plugin_name, None),
+        lambda: api.get_plugin(plugin_name).wrapped_dict,
+        u.get_plugin_cache())
 
 
 @rest.get('/plugins/<plugin_name>/<version>')
 @acl.enforce("plugins:get_version")
 @v.check_exists(api.get_plugin, plugin_name='plugin_name', version='version')
 def plugins_get_version(plugin_name, version):
-    return u.render(api.get_plugin(plugin_name, version).wrapped_dict)
+    return u.render_static(
+        ('plugin-document', plugin_name, version),
+        lambda: api.get_plugin(plugin_name, version).wrapped_dict,
+        u.get_plugin_cache())
 
 
 @rest.post_file('/plugins/<plugin_name>/<version>/convert-config/<name>')
@@ -36,13 +36,21 @@ rest = u.Rest('v11', __name__)
 @rest.get('/job-executions')
 @acl.enforce("job-executions:get_all")
 def job_executions_list():
-    job_executions = [je.to_dict() for je in api.job_execution_list(
-        **u.get_request_args().to_dict())]
-    return u.render(job_executions=job_executions)
+    return u.render_list('job_executions', api.job_execution_list(
+        **u.get_search_args()), u.get_fields())
+
+
+@rest.post('/job-executions/bulk')
+@acl.enforce("jobs:execute")
+@v.validate(v_j_e.JOB_EXEC_BULK_SCHEMA, v_j_e.check_job_executions_bulk)
+def job_executions_bulk_execute(data):
+    return u.render(job_executions=[
+        je.to_dict() for je in api.execute_jobs(data['job_executions'])])
 
 
 @rest.get('/job-executions/<job_execution_id>')
 @acl.enforce("job-executions:get")
+@u.conditional(api.get_job_execution_revision, id='job_execution_id')
 @v.check_exists(api.get_job_execution, id='job_execution_id')
 def job_executions(job_execution_id):
     job_execution = api.get_job_execution(job_execution_id)
@@ -78,9 +86,8 @@ def job_executions_delete(job_execution_id):
 @rest.get('/data-sources')
 @acl.enforce("data-sources:get_all")
 def data_sources_list():
-    return u.render(
-        data_sources=[ds.to_dict() for ds in api.get_data_sources(
-            **u.get_request_args().to_dict())])
+    return u.render_list('data_sources', api.get_data_sources(
+        **u.get_search_args()), u.get_fields())
 
 
 @rest.post('/data-sources')
@@ -110,8 +117,8 @@ def data_source_delete(data_source_id):
 @rest.get('/jobs')
 @acl.enforce("jobs:get_all")
 def job_list():
-    return u.render(jobs=[j.to_dict() for j in api.get_jobs(
-        **u.get_request_args().to_dict())])
+    return u.render_list('jobs', api.get_jobs(
+        **u.get_search_args()), u.get_fields())
 
 
 @rest.post('/jobs')
@@ -157,8 +164,17 @@ def job_types_get():
     # We want to use flat=False with to_dict() so that
     # the value of each arg is given as a list. This supports
     # filters of the form ?type=Pig&type=Java, etc.
-    return u.render(job_types=api.get_job_types(
-        **u.get_request_args().to_dict(flat=False)))
+    args = u.get_request_args().to_dict(flat=False)
+    if set(args) - {'hints'}:
+        return u.render(job_types=api.get_job_types(**args))
+
+    # unfiltered job types are static, so they are served from the
+    # cached document, there is one document with hints and one without
+    hints = args.get('hints', ['false'])[0].lower() == 'true'
+    return u.render_static(
+        ('job-types-document', hints),
+        lambda: {'job_types': api.get_job_types(**args)},
+        u.get_plugin_cache())
 
 # Job binary ops
 
@@ -173,8 +189,8 @@ def job_binary_create(data):
 @rest.get('/job-binaries')
 @acl.enforce("job-binaries:get_all")
 def job_binary_list():
-    return u.render(binaries=[j.to_dict() for j in api.get_job_binaries(
-        **u.get_request_args().to_dict())])
+    return u.render_list('binaries', api.get_job_binaries(
+        **u.get_search_args()), u.get_fields())
 
 
 @rest.get('/job-binaries/<job_binary_id>')
@@ -214,9 +230,8 @@ def job_binary_internal_create(**values):
 @rest.get('/job-binary-internals')
 @acl.enforce("job-binary-internals:get_all")
 def job_binary_internal_list():
-    return u.render(binaries=[j.to_dict() for j in
-                              api.get_job_binary_internals(
-                                  **u.get_request_args().to_dict())])
+    return u.render_list('binaries', api.get_job_binary_internals(
+        **u.get_search_args()), u.get_fields())
 
 
 @rest.get('/job-binary-internals/<job_binary_internal_id>')
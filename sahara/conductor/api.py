@@ -15,11 +15,14 @@
 
 """Handles all requests to the conductor service."""
 
+import functools
+
 from oslo_config import cfg
 from oslo_log import log as logging
 
 from sahara.conductor import manager
 from sahara.conductor import resource as r
+from sahara.utils import timing
 
 
 conductor_opts = [
@@ -50,6 +53,57 @@ def _get_id(obj):
         return obj
 
 
+def _cached_read(kind):
+    """Serve repeated reads from the read cache of the context.
+
+    The cache is only used when the context carries one, see
+    sahara.context.ReadCacheManager.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def handle(self, context, obj, *args, **kwargs):
+            cache = getattr(context, 'read_cache', None)
+            if cache is None:
+                return func(self, context, obj, *args, **kwargs)
+
+            key = (_get_id(obj),) + args + tuple(sorted(kwargs.items()))
+            ret = cache.get(kind, key)
+            if ret is None:
+                generation = cache.generation(kind)
+                ret = func(self, context, obj, *args, **kwargs)
+                if ret is not None:
+                    cache.put(kind, key, ret, generation)
+            return ret
+
+        return handle
+
+    return decorator
+
+
+def _invalidates(*kinds):
+    """Drop cached reads of the given kinds once the write is done.
+
+    Objects embedding the written one, e.g. clusters embedding their
+    template, are listed as additional kinds.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def handle(self, context, *args, **kwargs):
+            try:
+                return func(self, context, *args, **kwargs)
+            finally:
+                cache = getattr(context, 'read_cache', None)
+                if cache is not None:
+                    for kind in kinds:
+                        cache.invalidate(kind)
+
+        return handle
+
+    return decorator
+
+
 class LocalApi(object):
     """A local version of the conductor API.
 
@@ -57,15 +111,24 @@ class LocalApi(object):
     """
 
     def __init__(self):
-        self._manager = manager.ConductorManager()
+        self._manager = timing.Measured(manager.ConductorManager(),
+                                        'conductor')
 
     # Cluster ops
 
     @r.wrap(r.ClusterResource)
     def cluster_get(self, context, cluster, show_progress=False):
         """Return the cluster or None if it does not exist."""
-        return self._manager.cluster_get(
-            context, _get_id(cluster), show_progress)
+        if show_progress:
+            # progress is refreshed on read and changes with every event,
+            # so it is never served from the read cache
+            return self._manager.cluster_get(
+                context, _get_id(cluster), show_progress)
+        return self._cluster_get(context, cluster)
+
+    @_cached_read('cluster')
+    def _cluster_get(self, context, cluster):
+        return self._manager.cluster_get(context, _get_id(cluster))
 
     @r.wrap(r.ClusterResource)
     def cluster_get_all(self, context, **kwargs):
@@ -75,7 +138,75 @@ class LocalApi(object):
         """
         return self._manager.cluster_get_all(context, **kwargs)
 
+    @r.wrap(r.ClusterStatusResource)
+    def cluster_status_get(self, context, cluster):
+        """Return the cluster status or None if it does not exist.
+
+        Only id, name, tenant_id, status, status_description and updated_at
+        fields are loaded, node groups and instances are not.
+        """
+        return self._manager.cluster_status_get(context, _get_id(cluster))
+
+    @r.wrap(r.ClusterSummaryResource)
+    def cluster_summary_get(self, context, cluster):
+        """Return the cluster summary or None if it does not exist.
+
+        The summary contains the top level cluster fields needed to
+        identify and track a cluster, node groups and instances are
+        not loaded.
+        """
+        return self._manager.cluster_summary_get(context, _get_id(cluster))
+
     @r.wrap(r.ClusterResource)
+    def cluster_fields_get(self, context, cluster, fields):
+        """Return the cluster with the given fields only.
+
+        Returns None if the cluster does not exist.
+        """
+        return self._manager.cluster_fields_get(context, _get_id(cluster),
+                                                fields)
+
+    @r.wrap(r.ClusterResource)
+    def cluster_fields_get_all(self, context, fields, **kwargs):
+        """Get all clusters with the given fields only filtered by **kwargs.
+
+        e.g.  cluster_fields_get_all(['id', 'name', 'status'],
+                                     plugin_name='vanilla')
+        """
+        return self._manager.cluster_fields_get_all(context, fields, **kwargs)
+
+    @r.wrap(r.ClusterSummaryResource)
+    def cluster_summary_get_all(self, context, **kwargs):
+        """Get summaries of all clusters filtered by **kwargs.
+
+        e.g.  cluster_summary_get_all(status='Active', is_transient=True)
+        """
+        return self._manager.cluster_summary_get_all(context, **kwargs)
+
+    @r.wrap(r.ClusterSummaryResource)
+    def cluster_stale_get_all(self, context, updated_before,
+                              exclude_status=(), idle=False, **kwargs):
+        """Get summaries of clusters not updated since updated_before.
+
+        :param exclude_status: statuses of clusters to skip
+        :param idle: if True, skip clusters with unfinished job executions
+
+        e.g.  cluster_stale_get_all(updated_before, idle=True,
+                                    status='Active', is_transient=True)
+        """
+        return self._manager.cluster_stale_get_all(
+            context, updated_before, exclude_status, idle, **kwargs)
+
+    def cluster_revision_get(self, context, cluster):
+        """Return the revision of the cluster or None if it does not exist.
+
+        The revision changes whenever the cluster or any of its node
+        groups, instances and provision steps change.
+        """
+        return self._manager.cluster_revision_get(context, _get_id(cluster))
+
+    @r.wrap(r.ClusterResource)
+    @_invalidates('cluster')
     def cluster_create(self, context, values):
         """Create a cluster from the values dictionary.
 
@@ -84,6 +215,7 @@ class LocalApi(object):
         return self._manager.cluster_create(context, values)
 
     @r.wrap(r.ClusterResource)
+    @_invalidates('cluster')
     def cluster_update(self, context, cluster, values):
         """Update the cluster with the given values dictionary.
 
@@ -92,6 +224,7 @@ class LocalApi(object):
         return self._manager.cluster_update(context, _get_id(cluster),
                                             values)
 
+    @_invalidates('cluster')
     def cluster_destroy(self, context, cluster):
         """Destroy the cluster or raise if it does not exist.
 
@@ -101,6 +234,7 @@ class LocalApi(object):
 
     # Node Group ops
 
+    @_invalidates('cluster')
     def node_group_add(self, context, cluster, values):
         """Create a node group from the values dictionary.
 
@@ -108,6 +242,7 @@ class LocalApi(object):
         """
         return self._manager.node_group_add(context, _get_id(cluster), values)
 
+    @_invalidates('cluster')
     def node_group_update(self, context, node_group, values):
         """Update the node group with the given values dictionary.
 
@@ -115,6 +250,7 @@ class LocalApi(object):
         """
         self._manager.node_group_update(context, _get_id(node_group), values)
 
+    @_invalidates('cluster')
     def node_group_remove(self, context, node_group):
         """Destroy the node group or raise if it does not exist.
 
@@ -124,6 +260,7 @@ class LocalApi(object):
 
     # Instance ops
 
+    @_invalidates('cluster')
     def instance_add(self, context, node_group, values):
         """Create an instance from the values dictionary.
 
@@ -131,6 +268,7 @@ class LocalApi(object):
         """
         return self._manager.instance_add(context, _get_id(node_group), values)
 
+    @_invalidates('cluster')
     def instance_update(self, context, instance, values):
         """Update the instance with the given values dictionary.
 
@@ -138,6 +276,7 @@ class LocalApi(object):
         """
         self._manager.instance_update(context, _get_id(instance), values)
 
+    @_invalidates('cluster')
     def instance_remove(self, context, instance):
         """Destroy the instance or raise if it does not exist.
 
@@ -147,10 +286,12 @@ class LocalApi(object):
 
     # Volumes ops
 
+    @_invalidates('cluster')
     def append_volume(self, context, instance, volume_id):
         """Append volume_id to instance."""
         self._manager.append_volume(context, _get_id(instance), volume_id)
 
+    @_invalidates('cluster')
     def remove_volume(self, context, instance, volume_id):
         """Remove volume_id in instance."""
         self._manager.remove_volume(context, _get_id(instance), volume_id)
@@ -158,6 +299,7 @@ class LocalApi(object):
     # Cluster Template ops
 
     @r.wrap(r.ClusterTemplateResource)
+    @_cached_read('cluster_template')
     def cluster_template_get(self, context, cluster_template):
         """Return the cluster template or None if it does not exist."""
         return self._manager.cluster_template_get(context,
@@ -173,6 +315,7 @@ class LocalApi(object):
         return self._manager.cluster_template_get_all(context, **kwargs)
 
     @r.wrap(r.ClusterTemplateResource)
+    @_invalidates('cluster_template')
     def cluster_template_create(self, context, values):
         """Create a cluster template from the values dictionary.
 
@@ -180,6 +323,7 @@ class LocalApi(object):
         """
         return self._manager.cluster_template_create(context, values)
 
+    @_invalidates('cluster_template')
     def cluster_template_destroy(self, context, cluster_template,
                                  ignore_default=False):
         """Destroy the cluster template or raise if it does not exist.
@@ -191,6 +335,7 @@ class LocalApi(object):
                                                ignore_default)
 
     @r.wrap(r.ClusterTemplateResource)
+    @_invalidates('cluster_template', 'cluster')
     def cluster_template_update(self, context, id, cluster_template,
                                 ignore_default=False):
         """Update the cluster template or raise if it does not exist.
@@ -205,6 +350,7 @@ class LocalApi(object):
     # Node Group Template ops
 
     @r.wrap(r.NodeGroupTemplateResource)
+    @_cached_read('node_group_template')
     def node_group_template_get(self, context, node_group_template):
         """Return the node group template or None if it does not exist."""
         return self._manager.node_group_template_get(
@@ -220,6 +366,7 @@ class LocalApi(object):
         return self._manager.node_group_template_get_all(context, **kwargs)
 
     @r.wrap(r.NodeGroupTemplateResource)
+    @_invalidates('node_group_template')
     def node_group_template_create(self, context, values):
         """Create a node group template from the values dictionary.
 
@@ -227,6 +374,7 @@ class LocalApi(object):
         """
         return self._manager.node_group_template_create(context, values)
 
+    @_invalidates('node_group_template')
     def node_group_template_destroy(self, context, node_group_template,
                                     ignore_default=False):
         """Destroy the node group template or raise if it does not exist.
@@ -238,6 +386,7 @@ class LocalApi(object):
                                                   ignore_default)
 
     @r.wrap(r.NodeGroupTemplateResource)
+    @_invalidates('node_group_template', 'cluster_template', 'cluster')
     def node_group_template_update(self, context, id, values,
                                    ignore_default=False):
         """Update a node group template from the values dictionary.
@@ -250,6 +399,7 @@ class LocalApi(object):
     # Data Source ops
 
     @r.wrap(r.DataSource)
+    @_cached_read('data_source')
     def data_source_get(self, context, data_source):
         """Return the Data Source or None if it does not exist."""
         return self._manager.data_source_get(context, _get_id(data_source))
@@ -271,10 +421,12 @@ class LocalApi(object):
         return self._manager.data_source_count(context, **kwargs)
 
     @r.wrap(r.DataSource)
+    @_invalidates('data_source')
     def data_source_create(self, context, values):
         """Create a Data Source from the values dictionary."""
         return self._manager.data_source_create(context, values)
 
+    @_invalidates('data_source')
     def data_source_destroy(self, context, data_source):
         """Destroy the Data Source or raise if it does not exist."""
         self._manager.data_source_destroy(context, _get_id(data_source))
@@ -297,6 +449,8 @@ class LocalApi(object):
         'cluster.name' -- name of the Cluster referenced by the JobExecution
         'job.name' -- name of the Job referenced by the JobExecution
         'status' -- JobExecution['info']['status']
+        'exclude_status' -- statuses JobExecution['info']['status'] is not
+                            in, a job execution without status is kept
 
         e.g. job_execution_get_all(cluster_id=12, input_id=123)
              job_execution_get_all(**{'cluster.name': 'test',
@@ -311,11 +465,26 @@ class LocalApi(object):
         """
         return self._manager.job_execution_count(context, **kwargs)
 
+    def job_execution_revision_get(self, context, job_execution):
+        """Return the revision of the JobExecution or None."""
+        return self._manager.job_execution_revision_get(
+            context, _get_id(job_execution))
+
     @r.wrap(r.JobExecution)
     def job_execution_create(self, context, values):
         """Create a JobExecution from the values dictionary."""
         return self._manager.job_execution_create(context, values)
 
+    @r.wrap(r.JobExecution)
+    def job_execution_create_all(self, context, values_list):
+        """Create JobExecutions from the values dictionaries.
+
+        All of the JobExecutions are created in a single transaction.
+
+        :returns: the list of the created JobExecutions.
+        """
+        return self._manager.job_execution_create_all(context, values_list)
+
     @r.wrap(r.JobExecution)
     def job_execution_update(self, context, job_execution, values):
         """Update the JobExecution or raise if it does not exist."""
@@ -330,6 +499,7 @@ class LocalApi(object):
     # Job ops
 
     @r.wrap(r.Job)
+    @_cached_read('job')
     def job_get(self, context, job):
         """Return the Job or None if it does not exist."""
         return self._manager.job_get(context, _get_id(job))
@@ -343,15 +513,18 @@ class LocalApi(object):
         return self._manager.job_get_all(context, **kwargs)
 
     @r.wrap(r.Job)
+    @_invalidates('job')
     def job_create(self, context, values):
         """Create a Job from the values dictionary."""
         return self._manager.job_create(context, values)
 
+    @_invalidates('job')
     def job_update(self, context, job, values):
         """Update the Job or raise if it does not exist."""
         return self._manager.job_update(context, _get_id(job),
                                         values)
 
+    @_invalidates('job')
     def job_destroy(self, context, job):
         """Destroy the Job or raise if it does not exist."""
         self._manager.job_destroy(context, _get_id(job))
@@ -391,15 +564,18 @@ class LocalApi(object):
         return self._manager.job_binary_get_all(context, **kwargs)
 
     @r.wrap(r.JobBinary)
+    @_cached_read('job_binary')
     def job_binary_get(self, context, job_binary):
         """Return the JobBinary or None if it does not exist."""
         return self._manager.job_binary_get(context, _get_id(job_binary))
 
     @r.wrap(r.JobBinary)
+    @_invalidates('job_binary')
     def job_binary_create(self, context, values):
         """Create a JobBinary from the values dictionary."""
         return self._manager.job_binary_create(context, values)
 
+    @_invalidates('job_binary')
     def job_binary_destroy(self, context, job_binary):
         """Destroy the JobBinary or raise if it does not exist."""
         self._manager.job_binary_destroy(context, _get_id(job_binary))
@@ -415,6 +591,7 @@ class LocalApi(object):
         return self._manager.job_binary_internal_get_all(context, **kwargs)
 
     @r.wrap(r.JobBinaryInternal)
+    @_cached_read('job_binary_internal')
     def job_binary_internal_get(self, context, job_binary_internal):
         """Return the JobBinaryInternal or None if it does not exist."""
         return self._manager.job_binary_internal_get(
@@ -422,10 +599,12 @@ class LocalApi(object):
             _get_id(job_binary_internal))
 
     @r.wrap(r.JobBinaryInternal)
+    @_invalidates('job_binary_internal')
     def job_binary_internal_create(self, context, values):
         """Create a JobBinaryInternal from the values dictionary."""
         return self._manager.job_binary_internal_create(context, values)
 
+    @_invalidates('job_binary_internal')
     def job_binary_internal_destroy(self, context, job_binary_internal_id):
         """Destroy the JobBinaryInternal or raise if it does not exist."""
         self._manager.job_binary_internal_destroy(
@@ -440,6 +619,10 @@ class LocalApi(object):
             job_binary_internal_id)
 
     # Events ops
+    #
+    # Steps and events don't invalidate the cached clusters: provisioning
+    # writes them for every instance and the progress is only read
+    # through cluster_get(show_progress=True), which bypasses the cache.
 
     def cluster_provision_step_add(self, context, cluster_id, values):
         """Create a provisioning step assigned to cluster from values dict."""
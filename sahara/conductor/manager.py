@@ -56,6 +56,17 @@ DATA_SOURCE_DEFAULTS = {
     "credentials": {}
 }
 
+# Cluster projections used by the lightweight cluster getters
+
+CLUSTER_STATUS_FIELDS = (
+    "id", "name", "tenant_id", "status", "status_description", "updated_at"
+)
+
+CLUSTER_SUMMARY_FIELDS = CLUSTER_STATUS_FIELDS + (
+    "description", "trust_id", "is_transient", "plugin_name",
+    "hadoop_version", "cluster_template_id", "created_at"
+)
+
 
 def _apply_defaults(values, defaults):
     new_values = copy.deepcopy(defaults)
@@ -132,6 +143,50 @@ class ConductorManager(db_base.Base):
         """
         return self.db.cluster_get_all(context, **kwargs)
 
+    def cluster_status_get(self, context, cluster):
+        """Return the cluster status fields or None if it does not exist."""
+        return self.db.cluster_fields_get(context, cluster,
+                                          CLUSTER_STATUS_FIELDS)
+
+    def cluster_summary_get(self, context, cluster):
+        """Return the cluster summary fields or None if it does not exist."""
+        return self.db.cluster_fields_get(context, cluster,
+                                          CLUSTER_SUMMARY_FIELDS)
+
+    def cluster_fields_get(self, context, cluster, fields):
+        """Return the given cluster fields or None if it does not exist."""
+        return self.db.cluster_fields_get(context, cluster, fields)
+
+    def cluster_fields_get_all(self, context, fields, **kwargs):
+        """Get the given fields of all clusters filtered by **kwargs.
+
+        e.g. cluster_fields_get_all(['id', 'name'], status='Active')
+        """
+        return self.db.cluster_fields_get_all(context, fields, **kwargs)
+
+    def cluster_summary_get_all(self, context, **kwargs):
+        """Get summary fields of all clusters filtered by **kwargs.
+
+        e.g. cluster_summary_get_all(status='Active', is_transient=True)
+        """
+        return self.db.cluster_fields_get_all(context, CLUSTER_SUMMARY_FIELDS,
+                                              **kwargs)
+
+    def cluster_stale_get_all(self, context, updated_before,
+                              exclude_status=(), idle=False, **kwargs):
+        """Get summary fields of clusters not updated since updated_before.
+
+        e.g. cluster_stale_get_all(updated_before, idle=True,
+                                   status='Active', is_transient=True)
+        """
+        return self.db.cluster_stale_get_all(context, CLUSTER_SUMMARY_FIELDS,
+                                             updated_before, exclude_status,
+                                             idle, **kwargs)
+
+    def cluster_revision_get(self, context, cluster):
+        """Return the revision of the cluster or None if it does not exist."""
+        return self.db.cluster_revision_get(context, cluster)
+
     def cluster_create(self, context, values):
         """Create a cluster from the values dictionary."""
 
@@ -352,6 +407,8 @@ class ConductorManager(db_base.Base):
         'cluster.name' -- name of the Cluster referenced by the JobExecution
         'job.name' -- name of the Job referenced by the JobExecution
         'status' -- JobExecution['info']['status']
+        'exclude_status' -- statuses JobExecution['info']['status'] is not
+                            in, a job execution without status is kept
 
         e.g. job_execution_get_all(cluster_id=12, input_id=123)
              job_execution_get_all(**{'cluster.name': 'test',
@@ -366,12 +423,23 @@ class ConductorManager(db_base.Base):
         """
         return self.db.job_execution_count(context, **kwargs)
 
+    def job_execution_revision_get(self, context, job_execution):
+        """Return the revision of the JobExecution or None."""
+        return self.db.job_execution_revision_get(context, job_execution)
+
     def job_execution_create(self, context, values):
         """Create a JobExecution from the values dictionary."""
         values = copy.deepcopy(values)
         values['tenant_id'] = context.tenant_id
         return self.db.job_execution_create(context, values)
 
+    def job_execution_create_all(self, context, values_list):
+        """Create JobExecutions from the values dictionaries at once."""
+        values_list = copy.deepcopy(values_list)
+        for values in values_list:
+            values['tenant_id'] = context.tenant_id
+        return self.db.job_execution_create_all(context, values_list)
+
     def job_execution_update(self, context, job_execution, values):
         """Updates a JobExecution from the values dictionary."""
         return self.db.job_execution_update(context, job_execution, values)
@@ -77,6 +77,11 @@ class Resource(types.FrozenDict):
     in the following format: {refname: (child_class, backref_name)}
     Back reference is a reference to parent object which is
     injected into a Resource during wrapping.
+
+    Wrapping is lazy: values are kept as they came from the DB layer
+    and a nested dict or list is wrapped only when it is accessed for
+    the first time. The wrapped value then replaces the raw one, so
+    untouched sub-trees are never copied.
     """
 
     _resource_name = 'resource'
@@ -86,11 +91,7 @@ class Resource(types.FrozenDict):
 
     def __init__(self, dct):
         super(Resource, self).__setattr__('_initial_dict', dct)
-        newdct = dict()
-        for refname, entity in dct.iteritems():
-            newdct[refname] = self._wrap_entity(refname, entity)
-
-        super(Resource, self).__init__(newdct)
+        super(Resource, self).__init__(dct)
 
     def to_dict(self):
         """Return dictionary representing the Resource for REST API.
@@ -104,6 +105,16 @@ class Resource(types.FrozenDict):
 
     # Construction
 
+    def _materialize(self, refname):
+        entity = dict.__getitem__(self, refname)
+        if (isinstance(entity, (Resource, types.FrozenList)) or
+                self._is_passthrough_type(entity)):
+            return entity
+
+        entity = self._wrap_entity(refname, entity)
+        dict.__setitem__(self, refname, entity)
+        return entity
+
     def _wrap_entity(self, refname, entity):
         if isinstance(entity, Resource):
             # that is a back reference
@@ -165,6 +176,33 @@ class Resource(types.FrozenDict):
     def _list_to_dict(self, lst, childs_backref):
         return [self._entity_to_dict(entity, childs_backref) for entity in lst]
 
+    # Lazy access
+
+    def __getitem__(self, item):
+        return self._materialize(item)
+
+    def get(self, k, d=None):
+        if k in self:
+            return self._materialize(k)
+        return d
+
+    def iteritems(self):
+        for refname in self.keys():
+            yield refname, self._materialize(refname)
+
+    def itervalues(self):
+        for refname in self.keys():
+            yield self._materialize(refname)
+
+    def items(self):
+        return list(self.iteritems())
+
+    def values(self):
+        return list(self.itervalues())
+
+    def copy(self):
+        return dict(self.iteritems())
+
     def __getattr__(self, item):
         return self[item]
 
@@ -221,10 +259,22 @@ class ClusterResource(Resource, objects.Cluster):
     }
 
     _filter_fields = ['management_private_key', 'extra', 'rollback_info',
-                      'sahara_info']
+                      'sahara_info', 'revision', 'quota_reservation']
     _sanitize_fields = {'cluster_configs': sanitize_cluster_configs}
 
 
+class ClusterStatusResource(Resource):
+    """Cluster projection containing only the status fields."""
+
+    _resource_name = 'cluster'
+
+
+class ClusterSummaryResource(Resource):
+    """Cluster projection without node groups, instances and configs."""
+
+    _resource_name = 'cluster'
+
+
 # EDP Resources
 
 class DataSource(Resource, objects.DataSource):
@@ -255,7 +305,7 @@ class JobExecution(Resource, objects.JobExecution):
         return info
 
     _resource_name = "job_execution"
-    _filter_fields = ['extra']
+    _filter_fields = ['extra', 'status', 'revision']
     _sanitize_fields = {'job_configs': sanitize_job_configs,
                         'info': sanitize_info}
 
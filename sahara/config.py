@@ -22,6 +22,7 @@ from sahara import exceptions as ex
 from sahara.i18n import _
 from sahara.plugins import base as plugins_base
 from sahara.topology import topology_helper
+from sahara.utils.notification import events
 from sahara.utils.notification import sender
 from sahara.utils.openstack import cinder
 from sahara.utils.openstack import keystone
@@ -125,14 +126,20 @@ def list_opts():
     from sahara.conductor import api
     from sahara import main as sahara_main
     from sahara.service.edp import job_utils
+    from sahara.service import networks
     from sahara.service import periodic
+    from sahara.service import quotas
     from sahara.utils import cluster_progress_ops as cpo
+    from sahara.utils.openstack import base as openstack_base
     from sahara.utils.openstack import heat
     from sahara.utils.openstack import neutron
     from sahara.utils.openstack import nova
+    from sahara.utils.openstack import resilience
+    from sahara.utils.openstack import simulated
     from sahara.utils.openstack import swift
     from sahara.utils import poll_utils
     from sahara.utils import proxy
+    from sahara.utils import timing
     from sahara.utils import wsgi
 
     return [
@@ -144,13 +151,19 @@ def list_opts():
                          plugins_base.opts,
                          topology_helper.opts,
                          sender.notifier_opts,
+                         events.event_stream_opts,
                          keystone.opts,
+                         openstack_base.opts,
+                         resilience.opts,
                          remote.ssh_opts,
                          sahara_main.opts,
                          job_utils.opts,
+                         networks.opts,
                          periodic.periodic_opts,
+                         quotas.quota_opts,
                          proxy.opts,
                          cpo.event_log_opts,
+                         timing.timing_opts,
                          wsgi.wsgi_opts)),
         (poll_utils.timeouts.name,
          itertools.chain(poll_utils.timeouts_opts)),
@@ -166,6 +179,8 @@ def list_opts():
          itertools.chain(nova.opts)),
         (swift.swift_group.name,
          itertools.chain(swift.opts)),
+        (simulated.simulated_group.name,
+         itertools.chain(simulated.opts)),
         (keystone.keystone_group.name,
          itertools.chain(keystone.ssl_opts))
     ]
@@ -45,6 +45,9 @@ class Context(context.RequestContext):
                  auth_uri=None,
                  resource_uuid=None,
                  current_instance_info=None,
+                 read_cache=None,
+                 clients=None,
+                 retry_budget=None,
                  overwrite=True,
                  **kwargs):
         if kwargs:
@@ -74,6 +77,14 @@ class Context(context.RequestContext):
         else:
             self.current_instance_info = InstanceInfo()
 
+        self.read_cache = read_cache
+        # OpenStack clients shared by the threads of the context, see
+        # sahara.utils.openstack.base.cached_client
+        self.clients = clients if clients is not None else {}
+        # retries of the OpenStack calls left to the operation, see
+        # sahara.utils.openstack.resilience.retry_budget
+        self.retry_budget = retry_budget
+
     def clone(self):
         return Context(
             self.user_id,
@@ -88,6 +99,9 @@ class Context(context.RequestContext):
             self.auth_uri,
             self.resource_uuid,
             self.current_instance_info,
+            self.read_cache,
+            self.clients,
+            self.retry_budget,
             overwrite=False)
 
     def to_dict(self):
@@ -301,3 +315,42 @@ class InstanceInfoManager(object):
 
     def __exit__(self, *args):
         current().current_instance_info = self.prev_instance_info
+
+
+class ReadCache(object):
+    """Cache of conductor reads made during a single operation.
+
+    Entries are grouped by object kind, e.g. 'cluster' or 'job'. A write
+    to an object of some kind drops all cached entries of that kind.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._generations = {}
+
+    def get(self, kind, key):
+        return self._entries.get(kind, {}).get(key)
+
+    def generation(self, kind):
+        return self._generations.get(kind, 0)
+
+    def put(self, kind, key, value, generation):
+        # the entry is stale if an invalidation happened while it was read
+        if self.generation(kind) == generation:
+            self._entries.setdefault(kind, {})[key] = value
+
+    def invalidate(self, kind):
+        self._generations[kind] = self.generation(kind) + 1
+        self._entries.pop(kind, None)
+
+
+class ReadCacheManager(object):
+    def __init__(self):
+        self.prev_read_cache = current().read_cache
+
+    def __enter__(self):
+        if self.prev_read_cache is None:
+            current().read_cache = ReadCache()
+
+    def __exit__(self, *args):
+        current().read_cache = self.prev_read_cache
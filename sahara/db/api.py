@@ -124,6 +124,9 @@ def cluster_get_all(context, **kwargs):
     """Get all clusters filtered by **kwargs.
 
     e.g. cluster_get_all(ctx, plugin_name='vanilla', hadoop_version='1.1')
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.cluster_get_all(context, **kwargs)
 
@@ -145,6 +148,51 @@ def cluster_destroy(context, cluster):
     IMPL.cluster_destroy(context, cluster)
 
 
+def cluster_fields_get(context, cluster, fields):
+    """Return a dict of the given cluster fields or None if not found.
+
+    If all of the fields are cluster columns only they are selected from
+    the database, related node groups, instances and templates are not
+    loaded.
+    """
+    return IMPL.cluster_fields_get(context, cluster, fields)
+
+
+def cluster_fields_get_all(context, fields, **kwargs):
+    """Get the given fields of all clusters filtered by **kwargs.
+
+    e.g. cluster_fields_get_all(ctx, ['id', 'status'], is_transient=True)
+
+    See cluster_fields_get for the selection of the fields and
+    cluster_get_all for the supported kwargs.
+    """
+    return IMPL.cluster_fields_get_all(context, fields, **kwargs)
+
+
+def cluster_stale_get_all(context, fields, updated_before,
+                          exclude_status=(), idle=False, **kwargs):
+    """Get the given fields of clusters not updated since updated_before.
+
+    :param exclude_status: statuses of clusters to skip
+    :param idle: if True, skip clusters with unfinished job executions
+
+    Remaining **kwargs are used as filters like in cluster_fields_get_all.
+    """
+    return IMPL.cluster_stale_get_all(context, fields, updated_before,
+                                      exclude_status, idle, **kwargs)
+
+
+def cluster_revision_get(context, cluster):
+    """Return the revision of the cluster or None if it does not exist.
+
+    The revision is an opaque string which changes whenever the cluster,
+    its node groups, instances or provision steps are changed. It's
+    a counter incremented by every such write, read without loading
+    the cluster.
+    """
+    return IMPL.cluster_revision_get(context, cluster)
+
+
 # Node Group ops
 
 def node_group_add(context, cluster, values):
@@ -205,6 +253,9 @@ def cluster_template_get_all(context, **kwargs):
 
     e.g.  cluster_template_get_all(plugin_name='vanilla',
                                    hadoop_version='1.1')
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.cluster_template_get_all(context, **kwargs)
 
@@ -242,6 +293,9 @@ def node_group_template_get_all(context, **kwargs):
 
     e.g.  node_group_template_get_all(plugin_name='vanilla',
                                       hadoop_version='1.1')
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.node_group_template_get_all(context, **kwargs)
 
@@ -281,6 +335,9 @@ def data_source_get_all(context, **kwargs):
     """Get all Data Sources filtered by **kwargs.
 
     e.g.  data_source_get_all(name='myfile', type='swift')
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.data_source_get_all(context, **kwargs)
 
@@ -324,10 +381,15 @@ def job_execution_get_all(context, **kwargs):
     'cluster.name' -- name of the Cluster referenced by the JobExecution
     'job.name' -- name of the Job referenced by the JobExecution
     'status' -- JobExecution['info']['status']
+    'exclude_status' -- statuses JobExecution['info']['status'] is not
+                        in, a job execution without status is kept
 
     e.g. job_execution_get_all(cluster_id=12, input_id=123)
          job_execution_get_all(**{'cluster.name': 'test',
                                   'job.name': 'wordcount'})
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.job_execution_get_all(context, **kwargs)
 
@@ -340,12 +402,27 @@ def job_execution_count(context, **kwargs):
     return IMPL.job_execution_count(context, **kwargs)
 
 
+def job_execution_revision_get(context, job_execution):
+    """Return the revision of the JobExecution or None if it does not exist.
+
+    The revision is an opaque string which changes whenever the
+    JobExecution is updated.
+    """
+    return IMPL.job_execution_revision_get(context, job_execution)
+
+
 @to_dict
 def job_execution_create(context, values):
     """Create a JobExecution from the values dictionary."""
     return IMPL.job_execution_create(context, values)
 
 
+@to_dict
+def job_execution_create_all(context, values_list):
+    """Create JobExecutions from the values dictionaries in a transaction."""
+    return IMPL.job_execution_create_all(context, values_list)
+
+
 @to_dict
 def job_execution_update(context, job_execution, values):
     """Create a JobExecution from the values dictionary."""
@@ -370,6 +447,9 @@ def job_get_all(context, **kwargs):
     """Get all Jobs filtered by **kwargs.
 
     e.g.  job_get_all(name='myjob', type='MapReduce')
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.job_get_all(context, **kwargs)
 
@@ -395,6 +475,9 @@ def job_binary_get_all(context, **kwargs):
     """Get all JobBinarys filtered by **kwargs.
 
     e.g.  job_binary_get_all(name='wordcount.jar')
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.job_binary_get_all(context, **kwargs)
 
@@ -423,6 +506,9 @@ def job_binary_internal_get_all(context, **kwargs):
     e.g.  job_binary_internal_get_all(ctx, name='wordcount.jar')
 
     The JobBinaryInternals returned do not contain a data field.
+
+    The 'limit', 'marker' and 'sort_by' kwargs paginate the result,
+    see sahara.db.sqlalchemy.api.paginate.
     """
     return IMPL.job_binary_internal_get_all(context, **kwargs)
 
@@ -0,0 +1,79 @@
+# Copyright 2015 OpenStack Foundation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add status column and indexes to job executions
+
+Revision ID: 021
+Revises: 020
+Create Date: 2015-04-20 11:23:36.718513
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '021'
+down_revision = '020'
+
+from alembic import op
+import sqlalchemy as sa
+
+from sahara.db.sqlalchemy import types as st
+
+# number of job executions read and updated at once
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    op.add_column('job_executions',
+                  sa.Column('status', sa.String(length=80), nullable=True))
+
+    # copy the status of existing job executions out of 'info'
+    job_executions = sa.table('job_executions',
+                              sa.column('id', sa.String(length=36)),
+                              sa.column('info', st.JsonEncoded()),
+                              sa.column('status', sa.String(length=80)))
+    update = job_executions.update().where(
+        job_executions.c.id == sa.bindparam('_id')).values(
+            status=sa.bindparam('_status'))
+    connection = op.get_bind()
+
+    # the rows are read in batches ordered by id and each batch is
+    # updated with a single executemany
+    last_id = None
+    while True:
+        query = sa.select([job_executions.c.id, job_executions.c.info]
+                          ).order_by(job_executions.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(job_executions.c.id > last_id)
+        rows = connection.execute(query).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        values = []
+        for row in rows:
+            status = (row.info or {}).get('status')
+            if status:
+                values.append({'_id': row.id, '_status': status.upper()})
+        if values:
+            connection.execute(update, values)
+
+    op.create_index('ix_job_executions_status', 'job_executions',
+                    ['status'])
+    op.create_index('ix_job_executions_start_time', 'job_executions',
+                    ['start_time'])
+    op.create_index('ix_job_executions_end_time', 'job_executions',
+                    ['end_time'])
+    op.create_index('ix_job_executions_cluster_id', 'job_executions',
+                    ['cluster_id'])
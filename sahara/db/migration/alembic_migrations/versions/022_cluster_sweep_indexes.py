@@ -0,0 +1,34 @@
+# Copyright 2015 OpenStack Foundation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add cluster indexes used by periodic tasks
+
+Revision ID: 022
+Revises: 021
+Create Date: 2015-04-22 16:05:12.402217
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '022'
+down_revision = '021'
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_clusters_status_is_transient_updated_at', 'clusters',
+                    ['status', 'is_transient', 'updated_at'])
+    op.create_index('ix_clusters_updated_at', 'clusters', ['updated_at'])
@@ -21,14 +21,17 @@ import threading
 from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
+from oslo_db.sqlalchemy import utils as db_utils
 from oslo_log import log as logging
 import six
 import sqlalchemy as sa
 
+from sahara.db.sqlalchemy import model_base as mb
 from sahara.db.sqlalchemy import models as m
 from sahara import exceptions as ex
 from sahara.i18n import _
 from sahara.i18n import _LW
+from sahara.utils import types
 
 
 LOG = logging.getLogger(__name__)
@@ -99,6 +102,65 @@ def count_query(model, context, session=None, project_only=None):
     return model_query(sa.func.count(model.id), context, session, project_only)
 
 
+def fields_query(model, context, fields, session=None, project_only=True):
+    """Column-restricted query helper.
+
+    Selects only the columns of 'model' named in 'fields' instead of
+    loading full model objects with all of their relationships. Names
+    which do not match a column of 'model' are skipped.
+
+    :param model: base model to query
+    :param context: context to query under
+    :param fields: names of the columns to select
+    :param project_only: if present and context is user-type, then restrict
+            query to match the context's tenant_id.
+    :returns: a tuple containing the query and the list of selected
+    column names
+    """
+    session = session or get_session()
+
+    names = [f for f in fields if f in model.__table__.columns]
+    query = session.query(*[getattr(model, name) for name in names])
+
+    if project_only and not context.is_admin:
+        query = query.filter(model.tenant_id == context.tenant_id)
+
+    return query, names
+
+
+def is_projection(model, fields):
+    """Check if all of the fields are columns of the model."""
+    return all(f in model.__table__.columns for f in fields)
+
+
+def row_to_dict(names, row):
+    """Convert a row returned by a fields_query into a dictionary."""
+    d = dict(zip(names, row))
+
+    mb.datetime_to_str(d, 'created_at')
+    mb.datetime_to_str(d, 'updated_at')
+
+    return d
+
+
+def _bump_revision(session, model, object_id):
+    """Increment the revision of the object within the transaction.
+
+    updated_at is kept as is, the periodic sweeps rely on it.
+    """
+    session.query(model).filter(model.id == object_id).update(
+        {model.revision: model.revision + 1,
+         model.updated_at: model.updated_at}, synchronize_session=False)
+
+
+def _revision_get(context, model, object_id):
+    query, names = fields_query(model, context, ['revision'])
+    row = query.filter(model.id == object_id).first()
+    if row is None:
+        return None
+    return six.text_type(row[0])
+
+
 def in_filter(query, cls, search_opts):
     """Add 'in' filters for specified columns.
 
@@ -169,6 +231,70 @@ def like_filter(query, cls, search_opts):
     return query, remaining
 
 
+def pagination_opts(search_opts):
+    """Split pagination options off the search options.
+
+    :param search_opts: a dictionary of search options which may also
+    contain the 'limit', 'marker' and 'sort_by' pagination options
+    :returns: a tuple containing a dictionary of the remaining search
+    options and a dictionary of the pagination options
+    """
+    search_opts = dict(search_opts)
+    opts = {k: search_opts.pop(k) for k in ['limit', 'marker', 'sort_by']
+            if k in search_opts}
+    return search_opts, opts
+
+
+def paginate(query, model, context, limit=None, marker=None, sort_by=None):
+    """Add sorting and marker based pagination to the query.
+
+    :param query: a non-null query object
+    :param model: the database model class the query selects
+    :param context: context to look up the marker under
+    :param limit: maximum number of objects to return
+    :param marker: ID of the last object of the previous page
+    :param sort_by: name of the column to sort by, prefixed by '-' for
+    descending order
+    :returns: the modified query
+    """
+    if limit is None and marker is None and sort_by is None:
+        return query
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit <= 0:
+            raise ex.InvalidDataException(
+                _("Limit must be a positive integer"))
+
+    sort_dir = 'asc'
+    sort_keys = []
+    if sort_by:
+        if sort_by.startswith('-'):
+            sort_dir = 'desc'
+            sort_by = sort_by[1:]
+        if sort_by not in model.__table__.columns:
+            raise ex.InvalidDataException(
+                _("Unknown sort key: %s") % sort_by)
+        sort_keys.append(sort_by)
+
+    # ID is unique, so that the order of the pages is stable
+    if 'id' not in sort_keys:
+        sort_keys.append('id')
+
+    marker_obj = None
+    if marker is not None:
+        marker_obj = model_query(model, context, query.session).filter_by(
+            id=marker).first()
+        if not marker_obj:
+            raise ex.NotFoundException(marker, _("Marker '%s' not found!"))
+
+    return db_utils.paginate_query(query, model, limit, sort_keys,
+                                   marker=marker_obj, sort_dir=sort_dir)
+
+
 def setup_db():
     try:
         engine = get_engine()
@@ -245,8 +371,9 @@ def cluster_get(context, cluster_id):
 
 def cluster_get_all(context, **kwargs):
     query = model_query(m.Cluster, context)
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        return query.filter_by(**kwargs).all()
+        query = query.filter_by(**kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -255,6 +382,8 @@ def cluster_get_all(context, **kwargs):
             return []
         raise e
 
+    return paginate(query, m.Cluster, context, **pagination).all()
+
 
 def cluster_create(context, values):
     values = values.copy()
@@ -292,6 +421,7 @@ def cluster_update(context, cluster_id, values):
             raise ex.NotFoundException(cluster_id,
                                        _("Cluster id '%s' not found!"))
         cluster.update(values)
+        _bump_revision(session, m.Cluster, cluster_id)
 
     return cluster
 
@@ -307,6 +437,74 @@ def cluster_destroy(context, cluster_id):
         session.delete(cluster)
 
 
+def cluster_fields_get(context, cluster_id, fields):
+    if not is_projection(m.Cluster, fields):
+        # relationships can't be selected as columns
+        cluster = cluster_get(context, cluster_id)
+        if cluster is None:
+            return None
+        return types.select_fields(cluster.to_dict(), fields)
+
+    query, names = fields_query(m.Cluster, context, fields)
+    row = query.filter(m.Cluster.id == cluster_id).first()
+    return row_to_dict(names, row) if row else None
+
+
+def cluster_fields_get_all(context, fields, **kwargs):
+    if not is_projection(m.Cluster, fields):
+        # relationships can't be selected as columns
+        return [types.select_fields(cluster.to_dict(), fields)
+                for cluster in cluster_get_all(context, **kwargs)]
+
+    query, names = fields_query(m.Cluster, context, fields)
+    kwargs, pagination = pagination_opts(kwargs)
+    try:
+        query = query.filter_by(**kwargs)
+    except sa.exc.InvalidRequestError as e:
+        if kwargs:
+            # If kwargs is non-empty then we assume this
+            # is a bad field reference. User asked for something
+            # that doesn't exist, so return empty list
+            return []
+        raise e
+
+    return [row_to_dict(names, row)
+            for row in paginate(query, m.Cluster, context, **pagination)]
+
+
+def cluster_stale_get_all(context, fields, updated_before,
+                          exclude_status=(), idle=False, **kwargs):
+    query, names = fields_query(m.Cluster, context, fields)
+    query = query.filter(sa.or_(
+        m.Cluster.updated_at <= updated_before,
+        sa.and_(m.Cluster.updated_at.is_(None),
+                m.Cluster.created_at <= updated_before)))
+
+    if exclude_status:
+        query = query.filter(~m.Cluster.status.in_(exclude_status))
+
+    if idle:
+        running = sa.exists().where(sa.and_(
+            m.JobExecution.cluster_id == m.Cluster.id,
+            m.JobExecution.end_time.is_(None)))
+        query = query.filter(~running)
+
+    try:
+        return [row_to_dict(names, row)
+                for row in query.filter_by(**kwargs).all()]
+    except sa.exc.InvalidRequestError as e:
+        if kwargs:
+            # If kwargs is non-empty then we assume this
+            # is a bad field reference. User asked for something
+            # that doesn't exist, so return empty list
+            return []
+        raise e
+
+
+def cluster_revision_get(context, cluster_id):
+    return _revision_get(context, m.Cluster, cluster_id)
+
+
 # Node Group ops
 
 def _node_group_get(context, session, node_group_id):
@@ -327,6 +525,7 @@ def node_group_add(context, cluster_id, values):
         node_group.update({"cluster_id": cluster_id})
         node_group.update(values)
         session.add(node_group)
+        _bump_revision(session, m.Cluster, cluster_id)
 
     return node_group.id
 
@@ -340,6 +539,7 @@ def node_group_update(context, node_group_id, values):
                                        _("Node Group id '%s' not found!"))
 
         node_group.update(values)
+        _bump_revision(session, m.Cluster, node_group.cluster_id)
 
 
 def node_group_remove(context, node_group_id):
@@ -352,6 +552,7 @@ def node_group_remove(context, node_group_id):
                                        _("Node Group id '%s' not found!"))
 
         session.delete(node_group)
+        _bump_revision(session, m.Cluster, node_group.cluster_id)
 
 
 # Instance ops
@@ -377,6 +578,7 @@ def instance_add(context, node_group_id, values):
 
         node_group = _node_group_get(context, session, node_group_id)
         node_group.count += 1
+        _bump_revision(session, m.Cluster, node_group.cluster_id)
 
     return instance.id
 
@@ -390,6 +592,7 @@ def instance_update(context, instance_id, values):
                                        _("Instance id '%s' not found!"))
 
         instance.update(values)
+        _bump_revision(session, m.Cluster, instance.node_group.cluster_id)
 
 
 def instance_remove(context, instance_id):
@@ -405,6 +608,7 @@ def instance_remove(context, instance_id):
         node_group_id = instance.node_group_id
         node_group = _node_group_get(context, session, node_group_id)
         node_group.count -= 1
+        _bump_revision(session, m.Cluster, node_group.cluster_id)
 
 
 # Volumes ops
@@ -418,6 +622,7 @@ def append_volume(context, instance_id, volume_id):
                                        _("Instance id '%s' not found!"))
 
         instance.volumes.append(volume_id)
+        _bump_revision(session, m.Cluster, instance.node_group.cluster_id)
 
 
 def remove_volume(context, instance_id, volume_id):
@@ -429,6 +634,7 @@ def remove_volume(context, instance_id, volume_id):
                                        _("Instance id '%s' not found!"))
 
         instance.volumes.remove(volume_id)
+        _bump_revision(session, m.Cluster, instance.node_group.cluster_id)
 
 
 # Cluster Template ops
@@ -444,8 +650,9 @@ def cluster_template_get(context, cluster_template_id):
 
 def cluster_template_get_all(context, **kwargs):
     query = model_query(m.ClusterTemplate, context)
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        return query.filter_by(**kwargs).all()
+        query = query.filter_by(**kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -454,6 +661,8 @@ def cluster_template_get_all(context, **kwargs):
             return []
         raise e
 
+    return paginate(query, m.ClusterTemplate, context, **pagination).all()
+
 
 def cluster_template_create(context, values):
     values = values.copy()
@@ -567,8 +776,9 @@ def node_group_template_get(context, node_group_template_id):
 
 def node_group_template_get_all(context, **kwargs):
     query = model_query(m.NodeGroupTemplate, context)
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        return query.filter_by(**kwargs).all()
+        query = query.filter_by(**kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -577,6 +787,8 @@ def node_group_template_get_all(context, **kwargs):
             return []
         raise e
 
+    return paginate(query, m.NodeGroupTemplate, context, **pagination).all()
+
 
 def node_group_template_create(context, values):
     node_group_template = m.NodeGroupTemplate()
@@ -698,8 +910,9 @@ def data_source_count(context, **kwargs):
 
 def data_source_get_all(context, **kwargs):
     query = model_query(m.DataSource, context)
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        return query.filter_by(**kwargs).all()
+        query = query.filter_by(**kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -708,6 +921,8 @@ def data_source_get_all(context, **kwargs):
             return []
         raise e
 
+    return paginate(query, m.DataSource, context, **pagination).all()
+
 
 def data_source_create(context, values):
     data_source = m.DataSource()
@@ -751,6 +966,58 @@ def job_execution_get(context, job_execution_id):
     return _job_execution_get(context, get_session(), job_execution_id)
 
 
+def _job_execution_filter(query, kwargs):
+    # Remove the external fields if present, they'll
+    # be handled with a join and filter
+    kwargs = dict(kwargs)
+    externals = {k: kwargs.pop(k) for k in ['cluster.name',
+                                            'job.name',
+                                            'status',
+                                            'exclude_status'] if k in kwargs}
+
+    # Filter JobExecution by the remaining kwargs. This has to be done
+    # before application of the joins and filters because those
+    # change the class that query.filter_by will apply to
+    query = query.filter_by(**kwargs)
+
+    # Now add the joins and filters for the externals
+    if 'cluster.name' in externals:
+        query = query.join(m.Cluster).filter(
+            m.Cluster.name == externals['cluster.name'])
+
+    if 'job.name' in externals:
+        query = query.join(m.Job).filter(
+            m.Job.name == externals['job.name'])
+
+    # 'info' is a JsonDictType which is stored as a string and can't be
+    # searched reliably, so the status is kept upper-cased in a separate
+    # indexed column
+    if 'status' in externals:
+        query = query.filter(
+            m.JobExecution.status == externals['status'].upper())
+
+    if 'exclude_status' in externals:
+        statuses = externals['exclude_status']
+        if isinstance(statuses, six.string_types):
+            statuses = [statuses]
+        query = query.filter(sa.or_(
+            m.JobExecution.status.is_(None),
+            ~m.JobExecution.status.in_([s.upper() for s in statuses])))
+
+    return query
+
+
+def _job_execution_status(values):
+    """Keep the status column in sync with values['info']['status']."""
+    if 'info' not in values:
+        return values
+
+    values = dict(values)
+    status = (values['info'] or {}).get('status')
+    values['status'] = status.upper() if status else None
+    return values
+
+
 def job_execution_get_all(context, **kwargs):
     """Get all JobExecutions filtered by **kwargs.
 
@@ -760,24 +1027,17 @@ def job_execution_get_all(context, **kwargs):
     'cluster.name' -- name of the Cluster referenced by the JobExecution
     'job.name' -- name of the Job referenced by the JobExecution
     'status' -- JobExecution['info']['status']
+    'exclude_status' -- statuses JobExecution['info']['status'] is not
+                        in, a job execution without status is kept
 
     e.g. job_execution_get_all(cluster_id=12, input_id=123)
          job_execution_get_all(**{'cluster.name': 'test',
                                   'job.name': 'wordcount'})
     """
     query = model_query(m.JobExecution, context)
-
-    # Remove the external fields if present, they'll
-    # be handled with a join and filter
-    externals = {k: kwargs.pop(k) for k in ['cluster.name',
-                                            'job.name',
-                                            'status'] if k in kwargs}
-
-    # Filter JobExecution by the remaining kwargs. This has to be done
-    # before application of the joins and filters because those
-    # change the class that query.filter_by will apply to
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        query = query.filter_by(**kwargs)
+        query = _job_execution_filter(query, kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -786,34 +1046,16 @@ def job_execution_get_all(context, **kwargs):
             return []
         raise e
 
-    # Now add the joins and filters for the externals
-    if 'cluster.name' in externals:
-        query = query.join(m.Cluster).filter(
-            m.Cluster.name == externals['cluster.name'])
-
-    if 'job.name' in externals:
-        query = query.join(m.Job).filter(
-            m.Job.name == externals['job.name'])
+    return paginate(query, m.JobExecution, context, **pagination).all()
 
-    res = query.all()
 
-    # 'info' is a JsonDictType which is stored as a string.
-    # It would be possible to search for the substring containing
-    # the value of 'status' in 'info', but 'info' also contains
-    # data returned from a client and not managed by Sahara.
-    # In the case of Oozie jobs, for example, other fields (actions)
-    # also contain 'status'. Therefore we can't filter on it reliably
-    # by a substring search in the query.
-    if 'status' in externals:
-        status = externals['status'].lower()
-        res = [je for je in res if (
-            je['info'] and je['info'].get('status', '').lower() == status)]
-    return res
+def job_execution_count(context, **kwargs):
+    query = model_query(m.JobExecution, context)
+    return _job_execution_filter(query, kwargs).count()
 
 
-def job_execution_count(context, **kwargs):
-    query = count_query(m.JobExecution, context)
-    return query.filter_by(**kwargs).first()[0]
+def job_execution_revision_get(context, job_execution_id):
+    return _revision_get(context, m.JobExecution, job_execution_id)
 
 
 def job_execution_create(context, values):
@@ -821,7 +1063,7 @@ def job_execution_create(context, values):
 
     with session.begin():
         job_ex = m.JobExecution()
-        job_ex.update(values)
+        job_ex.update(_job_execution_status(values))
         try:
             job_ex.save(session=session)
         except db_exc.DBDuplicateEntry as e:
@@ -831,6 +1073,25 @@ def job_execution_create(context, values):
     return job_ex
 
 
+def job_execution_create_all(context, values_list):
+    session = get_session()
+
+    with session.begin():
+        job_exs = []
+        for values in values_list:
+            job_ex = m.JobExecution()
+            job_ex.update(_job_execution_status(values))
+            session.add(job_ex)
+            job_exs.append(job_ex)
+        try:
+            session.flush()
+        except db_exc.DBDuplicateEntry as e:
+            raise ex.DBDuplicateEntry(
+                _("Duplicate entry for JobExecution: %s") % e.columns)
+
+    return job_exs
+
+
 def job_execution_update(context, job_execution_id, values):
     session = get_session()
 
@@ -839,7 +1100,8 @@ def job_execution_update(context, job_execution_id, values):
         if not job_ex:
             raise ex.NotFoundException(job_execution_id,
                                        _("JobExecution id '%s' not found!"))
-        job_ex.update(values)
+        job_ex.update(_job_execution_status(values))
+        _bump_revision(session, m.JobExecution, job_execution_id)
 
     return job_ex
 
@@ -868,8 +1130,9 @@ def job_get(context, job_id):
 
 def job_get_all(context, **kwargs):
     query = model_query(m.Job, context)
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        return query.filter_by(**kwargs).all()
+        query = query.filter_by(**kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -878,6 +1141,8 @@ def job_get_all(context, **kwargs):
             return []
         raise e
 
+    return paginate(query, m.Job, context, **pagination).all()
+
 
 def _append_job_binaries(context, session, from_list, to_list):
     for job_binary_id in from_list:
@@ -953,8 +1218,9 @@ def job_binary_get_all(context, **kwargs):
     The data column uses deferred loading.
     """
     query = model_query(m.JobBinary, context)
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        return query.filter_by(**kwargs).all()
+        query = query.filter_by(**kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -963,6 +1229,8 @@ def job_binary_get_all(context, **kwargs):
             return []
         raise e
 
+    return paginate(query, m.JobBinary, context, **pagination).all()
+
 
 def job_binary_get(context, job_binary_id):
     """Returns a JobBinary object that does not contain a data field
@@ -1029,8 +1297,9 @@ def job_binary_internal_get_all(context, **kwargs):
     The data column uses deferred loading.
     """
     query = model_query(m.JobBinaryInternal, context)
+    kwargs, pagination = pagination_opts(kwargs)
     try:
-        return query.filter_by(**kwargs).all()
+        query = query.filter_by(**kwargs)
     except sa.exc.InvalidRequestError as e:
         if kwargs:
             # If kwargs is non-empty then we assume this
@@ -1039,6 +1308,8 @@ def job_binary_internal_get_all(context, **kwargs):
             return []
         raise e
 
+    return paginate(query, m.JobBinaryInternal, context, **pagination).all()
+
 
 def job_binary_internal_get(context, job_binary_internal_id):
     """Returns a JobBinaryInternal object that does not contain a data field
@@ -1128,6 +1399,7 @@ def _cluster_provision_step_update(context, session, step_id):
         for event in step.events:
             session.delete(event)
         step.update({'successful': True})
+        _bump_revision(session, m.Cluster, step.cluster_id)
 
 
 def cluster_provision_step_add(context, cluster_id, values):
@@ -1144,6 +1416,7 @@ def cluster_provision_step_add(context, cluster_id, values):
         values['tenant_id'] = context.tenant_id
         provision_step.update(values)
         session.add(provision_step)
+        _bump_revision(session, m.Cluster, cluster_id)
 
     return provision_step.id
 
@@ -1191,5 +1464,6 @@ def cluster_event_add(context, step_id, values):
             provision_step.update({'successful': False})
         event.update(values)
         session.add(event)
+        _bump_revision(session, m.Cluster, provision_step.cluster_id)
 
     return event.id
@@ -44,6 +44,10 @@ class Cluster(mb.SaharaBase):
 
     __table_args__ = (
         sa.UniqueConstraint('name', 'tenant_id'),
+        # used by the periodic cluster sweeps
+        sa.Index('ix_clusters_status_is_transient_updated_at',
+                 'status', 'is_transient', 'updated_at'),
+        sa.Index('ix_clusters_updated_at', 'updated_at'),
     )
 
     id = _id_column()
@@ -67,6 +71,11 @@ class Cluster(mb.SaharaBase):
     extra = sa.Column(st.JsonDictType())
     rollback_info = sa.Column(st.JsonDictType())
     sahara_info = sa.Column(st.JsonDictType())
+    # incremented by the db layer on every change of the cluster graph
+    revision = sa.Column(sa.Integer, nullable=False, default=0,
+                         server_default='0')
+    # resources reserved by the quota check of the operation in flight
+    quota_reservation = sa.Column(st.JsonDictType())
     provision_progress = relationship('ClusterProvisionStep',
                                       cascade="all,delete",
                                       backref='cluster',
@@ -290,15 +299,21 @@ class JobExecution(mb.SaharaBase):
                          sa.ForeignKey('data_sources.id'))
     output_id = sa.Column(sa.String(36),
                           sa.ForeignKey('data_sources.id'))
-    start_time = sa.Column(sa.DateTime())
-    end_time = sa.Column(sa.DateTime())
+    start_time = sa.Column(sa.DateTime(), index=True)
+    end_time = sa.Column(sa.DateTime(), index=True)
     cluster_id = sa.Column(sa.String(36),
-                           sa.ForeignKey('clusters.id'))
+                           sa.ForeignKey('clusters.id'), index=True)
     info = sa.Column(st.JsonDictType())
+    # upper-cased copy of info['status'] maintained by the db layer,
+    # allows to filter job executions by status in SQL
+    status = sa.Column(sa.String(80), index=True)
     oozie_job_id = sa.Column(sa.String(100))
     return_code = sa.Column(sa.String(80))
     job_configs = sa.Column(st.JsonDictType())
     extra = sa.Column(st.JsonDictType())
+    # incremented by the db layer on every update
+    revision = sa.Column(sa.Integer, nullable=False, default=0,
+                         server_default='0')
 
 mains_association = sa.Table("mains_association",
                              mb.SaharaBase.metadata,
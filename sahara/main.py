@@ -25,11 +25,13 @@ from werkzeug import exceptions as werkzeug_exceptions
 from sahara.api import acl
 from sahara.api.middleware import auth_valid
 from sahara.api.middleware import log_exchange
+from sahara.api.middleware import timing
 from sahara.api import v10 as api_v10
 from sahara.api import v11 as api_v11
 from sahara import config
 from sahara import context
 from sahara.i18n import _LI
+from sahara.i18n import _LW
 from sahara.openstack.common import systemd
 from sahara.plugins import base as plugins_base
 from sahara.service import api as service_api
@@ -37,6 +39,7 @@ from sahara.service.edp import api as edp_api
 from sahara.service import ops as service_ops
 from sahara.service import periodic
 from sahara.utils import api as api_utils
+from sahara.utils.notification import events
 from sahara.utils.openstack import cinder
 from sahara.utils import remote
 from sahara.utils import rpc as messaging
@@ -83,6 +86,7 @@ def setup_common(possible_topdir, service_name):
 
     if service_name != 'all-in-one' or cfg.CONF.enable_notifications:
         messaging.setup()
+    events.setup(service_name != 'all-in-one')
 
     plugins_base.setup_plugins()
 
@@ -157,6 +161,7 @@ def make_app():
 
     app.wsgi_app = auth_valid.wrap(app.wsgi_app)
     app.wsgi_app = acl.wrap(app.wsgi_app)
+    app.wsgi_app = timing.wrap(app.wsgi_app)
 
     return app
 
@@ -194,8 +199,24 @@ def _get_ops_driver(driver_name):
     return _load_driver('sahara.run.mode', driver_name)
 
 
+def warm_up():
+    """Build the read-only state shared by the API workers.
+
+    Plugin resources and job types are built before the workers are forked
+    instead of on the first requests of every worker.
+    """
+    try:
+        for plugin in service_api.get_plugins():
+            for version in [None] + plugin.get_versions():
+                service_api.get_plugin(plugin.name, version)
+        edp_api.get_job_types(hints=['true'])
+    except Exception as e:
+        LOG.warning(_LW("Failed to warm up the API caches: {error}").format(
+            error=e))
+
+
 def start_server(app):
     server = wsgi.Server()
-    server.start(app)
+    server.start(app, warm_up, reload=plugins_base.setup_plugins)
     systemd.notify_once()
     server.wait()
@@ -87,6 +87,10 @@ class PluginInterface(resources.BaseResource):
 class PluginManager(object):
     def __init__(self):
         self.plugins = {}
+        # data derived from the loaded plugins, e.g. resources and
+        # documents served by the API, it's dropped with the manager
+        # when plugins are set up again
+        self.cache = {}
         self._load_cluster_plugins()
 
     def _load_cluster_plugins(self):
@@ -24,9 +24,12 @@ from sahara import context
 from sahara.plugins import base as plugin_base
 from sahara.plugins import provisioning
 from sahara.service import quotas
+from sahara.utils import api as u
 from sahara.utils import general as g
+from sahara.utils.notification import events
 from sahara.utils.notification import sender
 from sahara.utils.openstack import nova
+from sahara.utils import timing
 
 
 conductor = c.API
@@ -45,19 +48,106 @@ def setup_service_api(ops):
 
 # Cluster ops
 
-def get_clusters(**kwargs):
+def get_clusters(fields=None, **kwargs):
+    if fields:
+        return conductor.cluster_fields_get_all(context.ctx(), fields,
+                                                **kwargs)
     return conductor.cluster_get_all(context.ctx(), **kwargs)
 
 
-def get_cluster(id, show_progress=False):
+def get_cluster_summaries(**kwargs):
+    return conductor.cluster_summary_get_all(context.ctx(), **kwargs)
+
+
+def get_cluster(id, show_progress=False, fields=None):
+    if fields:
+        return conductor.cluster_fields_get(context.ctx(), id, fields)
     return conductor.cluster_get(context.ctx(), id, show_progress)
 
 
+def get_cluster_status(id):
+    return conductor.cluster_status_get(context.ctx(), id)
+
+
+def get_cluster_revision(id):
+    return conductor.cluster_revision_get(context.ctx(), id)
+
+
+def get_cluster_summary(id):
+    return conductor.cluster_summary_get(context.ctx(), id)
+
+
 def scale_cluster(id, data):
     ctx = context.ctx()
 
     cluster = conductor.cluster_get(ctx, id)
     plugin = plugin_base.PLUGINS.get_plugin(cluster.plugin_name)
+    cluster, to_be_enlarged, additional = _prepare_scaling(ctx, cluster,
+                                                           plugin, data)
+
+    try:
+        cluster = g.change_cluster_status(cluster, "Validating")
+        quotas.check_scaling(cluster, to_be_enlarged, additional)
+        plugin.validate_scaling(cluster, to_be_enlarged, additional)
+    except Exception as e:
+        with excutils.save_and_reraise_exception():
+            quotas.release(cluster.id)
+            g.clean_cluster_from_empty_ng(cluster)
+            g.change_cluster_status(cluster, "Active", six.text_type(e))
+
+    OPS.provision_scaled_cluster(
+        id, _get_scaled_node_groups(cluster, to_be_enlarged, additional))
+    return cluster
+
+
+def scale_clusters(scalings):
+    """Scale the clusters as a batch.
+
+    The scalings are validated together and the quotas are checked once
+    for all of them. If any of them fails, none of the clusters is
+    scaled.
+
+    :param scalings: a list of (cluster_id, data) pairs with the
+    arguments of scale_cluster
+    :returns: the list of the scaled clusters
+    """
+    ctx = context.ctx()
+
+    # the clusters may get empty node groups from the preparation on
+    cluster_ids = []
+    prepared = []
+    try:
+        for cluster_id, data in scalings:
+            cluster = conductor.cluster_get(ctx, cluster_id)
+            cluster_ids.append(cluster_id)
+            plugin = plugin_base.PLUGINS.get_plugin(cluster.plugin_name)
+            prepared.append(
+                (plugin,) + _prepare_scaling(ctx, cluster, plugin, data))
+
+        prepared = [(plugin, g.change_cluster_status(cluster, "Validating"),
+                     to_be_enlarged, additional)
+                    for plugin, cluster, to_be_enlarged, additional
+                    in prepared]
+        quotas.check_scalings([scaling[1:] for scaling in prepared])
+        for plugin, cluster, to_be_enlarged, additional in prepared:
+            plugin.validate_scaling(cluster, to_be_enlarged, additional)
+    except Exception as e:
+        with excutils.save_and_reraise_exception():
+            for cluster_id in cluster_ids:
+                quotas.release(cluster_id)
+                cluster = conductor.cluster_get(ctx, cluster_id)
+                g.clean_cluster_from_empty_ng(cluster)
+                g.change_cluster_status(cluster, "Active",
+                                        six.text_type(e))
+
+    OPS.provision_scaled_clusters({
+        cluster.id: _get_scaled_node_groups(cluster, to_be_enlarged,
+                                            additional)
+        for plugin, cluster, to_be_enlarged, additional in prepared})
+    return [scaling[1] for scaling in prepared]
+
+
+def _prepare_scaling(ctx, cluster, plugin, data):
     existing_node_groups = data.get('resize_node_groups', [])
     additional_node_groups = data.get('add_node_groups', [])
 
@@ -71,43 +161,35 @@ def scale_cluster(id, data):
     additional = construct_ngs_for_scaling(cluster, additional_node_groups)
     cluster = conductor.cluster_get(ctx, cluster)
     _add_ports_for_auto_sg(ctx, cluster, plugin)
+    return cluster, to_be_enlarged, additional
 
-    try:
-        cluster = g.change_cluster_status(cluster, "Validating")
-        quotas.check_scaling(cluster, to_be_enlarged, additional)
-        plugin.validate_scaling(cluster, to_be_enlarged, additional)
-    except Exception as e:
-        with excutils.save_and_reraise_exception():
-            g.clean_cluster_from_empty_ng(cluster)
-            g.change_cluster_status(cluster, "Active", six.text_type(e))
 
+def _get_scaled_node_groups(cluster, to_be_enlarged, additional):
     # If we are here validation is successful.
     # So let's update to_be_enlarged map:
-    to_be_enlarged.update(additional)
+    node_group_id_map = dict(to_be_enlarged)
+    node_group_id_map.update(additional)
 
     for node_group in cluster.node_groups:
-        if node_group.id not in to_be_enlarged:
-            to_be_enlarged[node_group.id] = node_group.count
-
-    OPS.provision_scaled_cluster(id, to_be_enlarged)
-    return cluster
+        if node_group.id not in node_group_id_map:
+            node_group_id_map[node_group.id] = node_group.count
+    return node_group_id_map
 
 
 def create_cluster(values):
     ctx = context.ctx()
-    cluster = conductor.cluster_create(ctx, values)
-    sender.notify(ctx, cluster.id, cluster.name, "New",
-                  "create")
-    plugin = plugin_base.PLUGINS.get_plugin(cluster.plugin_name)
-    _add_ports_for_auto_sg(ctx, cluster, plugin)
+    cluster = _create_cluster(ctx, values)
+    cluster = _prepare_cluster(ctx, cluster)
 
     # validating cluster
     try:
         cluster = g.change_cluster_status(cluster, "Validating")
         quotas.check_cluster(cluster)
+        plugin = plugin_base.PLUGINS.get_plugin(cluster.plugin_name)
         plugin.validate(cluster)
     except Exception as e:
         with excutils.save_and_reraise_exception():
+            quotas.release(cluster.id)
             g.change_cluster_status(cluster, "Error",
                                     six.text_type(e))
 
@@ -116,6 +198,53 @@ def create_cluster(values):
     return cluster
 
 
+def create_clusters(values_list):
+    """Create the clusters as a batch.
+
+    The clusters are validated together and the quotas are checked once
+    against their aggregated demand. If any of them fails, all of the
+    clusters are put into the 'Error' status and none is provisioned.
+
+    :returns: the list of the created clusters
+    """
+    ctx = context.ctx()
+    clusters = []
+
+    try:
+        for values in values_list:
+            clusters.append(_create_cluster(ctx, values))
+        clusters = [_prepare_cluster(ctx, cluster) for cluster in clusters]
+        clusters = [g.change_cluster_status(cluster, "Validating")
+                    for cluster in clusters]
+        quotas.check_clusters(clusters)
+        for cluster in clusters:
+            plugin = plugin_base.PLUGINS.get_plugin(cluster.plugin_name)
+            plugin.validate(cluster)
+    except Exception as e:
+        with excutils.save_and_reraise_exception():
+            for cluster in clusters:
+                quotas.release(cluster.id)
+                g.change_cluster_status(cluster, "Error",
+                                        six.text_type(e))
+
+    OPS.provision_clusters([cluster.id for cluster in clusters])
+
+    return clusters
+
+
+def _create_cluster(ctx, values):
+    cluster = conductor.cluster_create(ctx, values)
+    sender.notify(ctx, cluster.id, cluster.name, "New",
+                  "create")
+    return cluster
+
+
+def _prepare_cluster(ctx, cluster):
+    plugin = plugin_base.PLUGINS.get_plugin(cluster.plugin_name)
+    _add_ports_for_auto_sg(ctx, cluster, plugin)
+    return cluster
+
+
 def _add_ports_for_auto_sg(ctx, cluster, plugin):
     for ng in cluster.node_groups:
         if ng.auto_security_group:
@@ -130,6 +259,44 @@ def terminate_cluster(id):
     sender.notify(context.ctx(), cluster.id, cluster.name, cluster.status,
                   "delete")
 
+
+def terminate_clusters(ids):
+    """Terminate the clusters as a batch."""
+    clusters = [g.change_cluster_status(id, "Deleting") for id in ids]
+
+    OPS.terminate_clusters(ids)
+    for cluster in clusters:
+        sender.notify(context.ctx(), cluster.id, cluster.name,
+                      cluster.status, "delete")
+
+
+# Event ops
+
+def get_events():
+    """Return a generator of the status events of the current tenant.
+
+    The generator yields None when there was no event for
+    event_stream_keepalive_interval seconds. It ends when the subscription
+    is closed, e.g. by a worker being replaced.
+    """
+    events.check_available()
+    tenant_id = context.ctx().tenant_id
+
+    def generator():
+        with events.subscribe(tenant_id) as subscription:
+            while not subscription.closed:
+                yield subscription.get(CONF.event_stream_keepalive_interval)
+
+    return generator()
+
+
+# Stats ops
+
+def get_request_stats():
+    """Return percentiles of the request timings of this API process."""
+    return timing.get_stats()
+
+
 # ClusterTemplate ops
 
 
@@ -183,6 +350,19 @@ def get_plugins():
 
 
 def get_plugin(plugin_name, version=None):
+    # plugin resources don't change while the plugins are loaded, they
+    # are built once, unknown plugins and versions aren't cached
+    cache = u.get_plugin_cache()
+    key = ('plugin', plugin_name, version)
+    if key not in cache:
+        res = _get_plugin(plugin_name, version)
+        if res is None:
+            return None
+        cache[key] = res
+    return cache[key]
+
+
+def _get_plugin(plugin_name, version=None):
     plugin = plugin_base.PLUGINS.get_plugin(plugin_name)
     if plugin:
         res = plugin.as_resource()
@@ -221,7 +401,7 @@ def construct_ngs_for_scaling(cluster, additional_node_groups):
 
 
 def get_images(name, tags):
-    return nova.client().images.list_registered(name, tags)
+    return nova.get_registered_images().list(name, tags)
 
 
 def get_image(**kwargs):
@@ -238,22 +418,26 @@ def get_registered_image(id):
 def register_image(image_id, username, description=None):
     client = nova.client()
     client.images.set_description(image_id, username, description)
+    nova.invalidate_images()
     return client.images.get(image_id)
 
 
 def unregister_image(image_id):
     client = nova.client()
     client.images.unset_description(image_id)
+    nova.invalidate_images()
     return client.images.get(image_id)
 
 
 def add_image_tags(image_id, tags):
     client = nova.client()
     client.images.tag(image_id, tags)
+    nova.invalidate_images()
     return client.images.get(image_id)
 
 
 def remove_image_tags(image_id, tags):
     client = nova.client()
     client.images.untag(image_id, tags)
+    nova.invalidate_images()
     return client.images.get(image_id)
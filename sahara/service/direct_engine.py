@@ -281,6 +281,7 @@ class DirectEngine(e.Engine):
         if instances_to_delete:
             cluster = g.change_cluster_status(cluster, "Deleting Instances")
 
+            self._delete_floating_ips(instances_to_delete)
             for instance in instances_to_delete:
                 self._shutdown_instance(instance)
 
@@ -417,11 +418,10 @@ class DirectEngine(e.Engine):
         return False
 
     def _assign_floating_ips(self, instances):
-        for instance in instances:
-            node_group = instance.node_group
-            if node_group.floating_ip_pool:
-                networks.assign_floating_ip(instance.instance_id,
-                                            node_group.floating_ip_pool)
+        networks.assign_floating_ips(
+            [(instance.instance_id, instance.node_group.floating_ip_pool)
+             for instance in instances
+             if instance.node_group.floating_ip_pool])
 
     @poll_utils.poll_status(
         'await_for_instances_active',
@@ -502,6 +502,7 @@ class DirectEngine(e.Engine):
     def _rollback_cluster_scaling(self, cluster, instances, ex):
         """Attempt to rollback cluster scaling."""
 
+        self._delete_floating_ips(instances)
         for i in instances:
             self._shutdown_instance(i)
 
@@ -510,6 +511,7 @@ class DirectEngine(e.Engine):
 
     def _shutdown_instances(self, cluster):
         for node_group in cluster.node_groups:
+            self._delete_floating_ips(node_group.instances)
             for instance in node_group.instances:
                 self._shutdown_instance(instance)
 
@@ -540,18 +542,15 @@ class DirectEngine(e.Engine):
             LOG.warning(_LW("Failed to delete security group {name}").format(
                 name=name))
 
+    def _delete_floating_ips(self, instances):
+        networks.delete_floating_ips(
+            [instance.instance_id for instance in instances
+             if instance.node_group.floating_ip_pool])
+
     def _shutdown_instance(self, instance):
+        """Shutdown the instance, its floating IPs should be deleted."""
         ctx = context.ctx()
 
-        if instance.node_group.floating_ip_pool:
-            try:
-                networks.delete_floating_ip(instance.instance_id)
-            except nova_exceptions.NotFound:
-                LOG.warning(_LW("Attempted to delete non-existent floating IP "
-                                "in pool {pool} from instance {instance}")
-                            .format(pool=instance.node_group.floating_ip_pool,
-                                    instance=instance.instance_id))
-
         try:
             volumes.detach_from_instance(instance)
         except Exception:
@@ -15,6 +15,7 @@
 
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import excutils
 import six
 
 from sahara import conductor as c
@@ -25,6 +26,7 @@ from sahara.plugins import base as plugin_base
 from sahara.plugins import provisioning
 from sahara.service.edp.binary_retrievers import dispatch
 from sahara.service.edp import job_manager as manager
+from sahara.utils import api as u
 from sahara.utils import edp
 from sahara.utils import proxy as p
 
@@ -43,6 +45,24 @@ def setup_edp_api(ops):
     OPS = ops
 
 
+def _get_edp_job_types(plugin):
+    # job types and config hints of the plugins don't change while the
+    # plugins are loaded, they are looked up once for all versions
+    cache = u.get_plugin_cache()
+    key = ('edp-job-types', plugin.name)
+    if key not in cache:
+        cache[key] = plugin.get_edp_job_types()
+    return cache[key]
+
+
+def _get_edp_config_hints(plugin, job_type, version):
+    cache = u.get_plugin_cache()
+    key = ('edp-config-hints', plugin.name, job_type, version)
+    if key not in cache:
+        cache[key] = plugin.get_edp_config_hints(job_type, version)
+    return cache[key]
+
+
 def get_job_types(**kwargs):
     # Return a dictionary of all the job types that can be run
     # by this instance of Sahara. For each job type, the value
@@ -74,7 +94,7 @@ def get_job_types(**kwargs):
                      "plugins": []}
 
         for plugin in plugins:
-            types_for_plugin = plugin.get_edp_job_types(versions)
+            types_for_plugin = _get_edp_job_types(plugin)
 
             # dict returns a new object so we are not modifying the plugin
             p = plugin.dict
@@ -85,10 +105,12 @@ def get_job_types(**kwargs):
             p["versions"] = {}
 
             for version, supported_types in six.iteritems(types_for_plugin):
+                if versions and version not in versions:
+                    continue
                 if job_type in supported_types:
                     if hints:
-                        config_hints = plugin.get_edp_config_hints(job_type,
-                                                                   version)
+                        config_hints = _get_edp_config_hints(
+                            plugin, job_type, version)
                     else:
                         config_hints = {}
                     p["versions"][version] = config_hints
@@ -107,7 +129,7 @@ def get_job_config_hints(job_type):
     return manager.get_job_config_hints(job_type)
 
 
-def execute_job(job_id, data):
+def _get_job_execution_values(job_id, data):
     # Elements common to all job types
     cluster_id = data['cluster_id']
     configs = data.get('job_configs', {})
@@ -118,28 +140,75 @@ def execute_job(job_id, data):
 
     # Since we will use a unified class in the database, we pass
     # a superset for all job types
-    job_ex_dict = {'input_id': input_id, 'output_id': output_id,
-                   'job_id': job_id, 'cluster_id': cluster_id,
-                   'info': {'status': edp.JOB_STATUS_PENDING},
-                   'job_configs': configs, 'extra': {}}
-    job_execution = conductor.job_execution_create(context.ctx(), job_ex_dict)
+    return {'input_id': input_id, 'output_id': output_id,
+            'job_id': job_id, 'cluster_id': cluster_id,
+            'info': {'status': edp.JOB_STATUS_PENDING},
+            'job_configs': configs, 'extra': {}}
+
 
+def _create_proxy_user(job_execution):
     # check to use proxy user
     if p.job_execution_requires_proxy_user(job_execution):
-        try:
-            p.create_proxy_user_for_job_execution(job_execution)
-        except ex.SaharaException as e:
-            LOG.error(_LE("Can't run job execution {job} "
-                          "(reasons: {reason})").format(job=job_execution.id,
-                                                        reason=e))
-            conductor.job_execution_destroy(context.ctx(), job_execution)
-            raise e
+        p.create_proxy_user_for_job_execution(job_execution)
+
+
+def execute_job(job_id, data):
+    job_ex_dict = _get_job_execution_values(job_id, data)
+    job_execution = conductor.job_execution_create(context.ctx(), job_ex_dict)
+
+    try:
+        _create_proxy_user(job_execution)
+    except ex.SaharaException as e:
+        LOG.error(_LE("Can't run job execution {job} "
+                      "(reasons: {reason})").format(job=job_execution.id,
+                                                    reason=e))
+        conductor.job_execution_destroy(context.ctx(), job_execution)
+        raise e
 
     OPS.run_edp_job(job_execution.id)
 
     return job_execution
 
 
+def execute_jobs(values_list):
+    """Submit job executions as a batch.
+
+    The job executions are created in a single transaction and handed to
+    the EDP engine at once. Clusters, jobs and data sources shared by the
+    job executions of the batch are looked up once. If a proxy user
+    can't be created for any of them, none of them is run.
+
+    :param values_list: a list of dicts with the job_id and the data of
+    execute_job
+    :returns: the list of the created job executions
+    """
+    ctx = context.ctx()
+    with context.ReadCacheManager():
+        job_executions = conductor.job_execution_create_all(
+            ctx, [_get_job_execution_values(values['job_id'], values)
+                  for values in values_list])
+
+        try:
+            for job_execution in job_executions:
+                _create_proxy_user(job_execution)
+        except ex.SaharaException as e:
+            with excutils.save_and_reraise_exception():
+                ids = [job_execution.id for job_execution in job_executions]
+                LOG.error(_LE("Can't run job executions {jobs} "
+                              "(reasons: {reason})").format(jobs=ids,
+                                                            reason=e))
+                for job_execution in job_executions:
+                    # the proxy users created so far are in job_configs
+                    job_execution = conductor.job_execution_get(
+                        ctx, job_execution.id)
+                    p.delete_proxy_user_for_job_execution(job_execution)
+                    conductor.job_execution_destroy(ctx, job_execution)
+
+    OPS.run_edp_jobs([job_execution.id for job_execution in job_executions])
+
+    return job_executions
+
+
 def get_job_execution_status(id):
     return manager.get_job_status(id)
 
@@ -152,6 +221,10 @@ def get_job_execution(id):
     return conductor.job_execution_get(context.ctx(), id)
 
 
+def get_job_execution_revision(id):
+    return conductor.job_execution_revision_get(context.ctx(), id)
+
+
 def cancel_job_execution(id):
     job_execution = conductor.job_execution_get(context.ctx(), id)
     OPS.cancel_job_execution(id)
@@ -41,21 +41,31 @@ def _get_raw_data(job_binary, conn):
     if container.endswith(su.SWIFT_URL_SUFFIX):
         container = container[:-len(su.SWIFT_URL_SUFFIX)]
 
-    try:
-        # First check the size
-        headers = conn.head_object(container, obj)
-        total_KB = int(headers.get('content-length', 0)) / 1024.0
-        if total_KB > CONF.job_binary_max_KB:
+    max_bytes = CONF.job_binary_max_KB * 1024
+
+    def check_size(size):
+        if size > max_bytes:
             raise ex.DataTooBigException(
-                round(total_KB, 1), CONF.job_binary_max_KB,
+                round(size / 1024.0, 1), CONF.job_binary_max_KB,
                 _("Size of swift object (%(size)sKB) is greater "
                   "than maximum (%(maximum)sKB)"))
 
-        headers, body = conn.get_object(container, obj)
+    try:
+        # First check the size
+        headers = sw.get_object_metadata(conn, container, obj)
+        check_size(int(headers.get('content-length', 0)))
+
+        # the object could grow since its metadata was cached
+        body = []
+        size = 0
+        for chunk in sw.iter_object(conn, container, obj):
+            size += len(chunk)
+            check_size(size)
+            body.append(chunk)
     except swiftclient.ClientException as e:
         raise ex.SwiftClientException(six.text_type(e))
 
-    return body
+    return b''.join(body)
 
 
 def _validate_job_binary_url(f):
@@ -88,11 +98,11 @@ def get_raw_data(job_binary, proxy_configs=None):
         conn_kwargs.update(username=job_binary.extra.get('user'),
                            password=job_binary.extra.get('password'))
 
-    conn = sw.client(**conn_kwargs)
-    return _get_raw_data(job_binary, conn)
+    with sw.connection(**conn_kwargs) as conn:
+        return _get_raw_data(job_binary, conn)
 
 
 @_validate_job_binary_url
 def get_raw_data_with_context(job_binary):
-    conn = sw.client_from_token(context.ctx().auth_token)
-    return _get_raw_data(job_binary, conn)
+    with sw.connection_from_token(context.ctx().auth_token) as conn:
+        return _get_raw_data(job_binary, conn)
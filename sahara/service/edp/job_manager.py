@@ -30,6 +30,7 @@ from sahara.service.edp import job_utils
 from sahara.service.edp.oozie import engine as oozie_engine
 from sahara.service.edp.spark import engine as spark_engine
 from sahara.utils import edp
+from sahara.utils.notification import events
 from sahara.utils import proxy as p
 
 
@@ -53,6 +54,21 @@ def _get_job_engine(cluster, job_execution):
                                                             job_execution))
 
 
+def _get_status(job_execution):
+    return (job_execution.info or {}).get('status')
+
+
+def _publish_status(job_execution, old_status=None):
+    if job_execution is None:
+        return
+    status = _get_status(job_execution)
+    if status != old_status:
+        events.publish(job_execution.tenant_id, 'job_execution.status',
+                       job_execution_id=job_execution.id,
+                       cluster_id=job_execution.cluster_id,
+                       job_id=job_execution.job_id, status=status)
+
+
 def _write_job_status(job_execution, job_info):
     update = {"info": job_info}
     if job_info['status'] in edp.JOB_STATUSES_TERMINATED:
@@ -60,9 +76,12 @@ def _write_job_status(job_execution, job_info):
         job_configs = p.delete_proxy_user_for_job_execution(job_execution)
         if job_configs:
             update['job_configs'] = job_configs
-    return conductor.job_execution_update(context.ctx(),
-                                          job_execution,
-                                          update)
+    old_status = _get_status(job_execution)
+    job_execution = conductor.job_execution_update(context.ctx(),
+                                                   job_execution,
+                                                   update)
+    _publish_status(job_execution, old_status)
+    return job_execution
 
 
 def _update_job_status(engine, job_execution):
@@ -113,23 +132,27 @@ def _run_job(job_execution_id):
         curr_extra.update(extra)
         update_dict['extra'] = curr_extra
 
+    old_status = _get_status(job_execution)
     job_execution = conductor.job_execution_update(
         ctx, job_execution, update_dict)
+    _publish_status(job_execution, old_status)
 
 
 def run_job(job_execution_id):
     try:
-        _run_job(job_execution_id)
+        with context.ReadCacheManager():
+            _run_job(job_execution_id)
     except Exception as ex:
         LOG.warning(
             _LW("Can't run job execution {job} (reason: {reason})").format(
                 job=job_execution_id, reason=ex))
 
-        conductor.job_execution_update(
+        job_execution = conductor.job_execution_update(
             context.ctx(), job_execution_id,
             {'info': {'status': edp.JOB_STATUS_FAILED},
              'start_time': datetime.datetime.now(),
              'end_time': datetime.datetime.now()})
+        _publish_status(job_execution)
 
 
 def cancel_job(job_execution_id):
@@ -145,6 +168,7 @@ def cancel_job(job_execution_id):
         job_execution = conductor.job_execution_update(
             ctx, job_execution_id,
             {'info': {'status': edp.JOB_STATUS_TOBEKILLED}})
+        _publish_status(job_execution)
 
         timeout = CONF.job_canceling_timeout
         s_time = timeutils.utcnow()
@@ -185,8 +209,11 @@ def cancel_job(job_execution_id):
 def get_job_status(job_execution_id):
     ctx = context.ctx()
     job_execution = conductor.job_execution_get(ctx, job_execution_id)
-    cluster = conductor.cluster_get(ctx, job_execution.cluster_id)
+    # Check the status first, the full cluster is only needed to query
+    # the job engine of an active cluster
+    cluster = conductor.cluster_status_get(ctx, job_execution.cluster_id)
     if cluster is not None and cluster.status == 'Active':
+        cluster = conductor.cluster_get(ctx, cluster)
         engine = _get_job_engine(cluster, job_execution)
         if engine is not None:
             job_execution = _update_job_status(engine,
@@ -196,12 +223,15 @@ def get_job_status(job_execution_id):
 
 def update_job_statuses():
     ctx = context.ctx()
-    for je in conductor.job_execution_get_all(ctx, end_time=None):
-        try:
-            get_job_status(je.id)
-        except Exception as e:
-            LOG.error(_LE("Error during update job execution {job}: {error}")
-                      .format(job=je.id, error=e))
+    # job executions of the same cluster share the cluster and often the
+    # job, so fetch them only once per sweep
+    with context.ReadCacheManager():
+        for je in conductor.job_execution_get_all(ctx, end_time=None):
+            try:
+                get_job_status(je.id)
+            except Exception as e:
+                LOG.error(_LE("Error during update job execution {job}: "
+                              "{error}").format(job=je.id, error=e))
 
 
 def get_job_config_hints(job_type):
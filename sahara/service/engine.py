@@ -63,8 +63,8 @@ class Engine(object):
          """
 
     def get_node_group_image_username(self, node_group):
-        image_id = node_group.get_image_id()
-        return nova.client().images.get(image_id).username
+        # not cached, the image may be re-registered by another process
+        return nova.client().images.get(node_group.get_image_id()).username
 
     @poll_utils.poll_status('ips_assign_timeout', _("Assign IPs"), sleep=1)
     def _ips_assign(self, ips_assigned, cluster, instances):
@@ -13,19 +13,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from novaclient import exceptions as nova_exceptions
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import excutils
 import six
 
 from sahara import conductor as c
 from sahara import context
+from sahara.i18n import _LW
 from sahara.utils.openstack import neutron
 from sahara.utils.openstack import nova
 
 LOG = logging.getLogger(__name__)
 
+opts = [
+    cfg.IntOpt('floating_ip_concurrency',
+               default=20,
+               help='Maximum number of concurrent Nova calls made to '
+                    'allocate, associate or release the floating IPs of '
+                    'the instances.')
+]
+
 conductor = c.API
 CONF = cfg.CONF
+CONF.register_opts(opts)
 
 
 def init_instances_ips(instance):
@@ -91,12 +103,68 @@ def init_instances_ips(instance):
     return internal_ip and management_ip
 
 
-def assign_floating_ip(instance_id, pool):
-    ip = nova.client().floating_ips.create(pool)
-    nova.client().servers.get(instance_id).add_floating_ip(ip)
+def assign_floating_ips(instance_pools):
+    """Allocate and associate floating IPs of the instances.
+
+    All of the IPs are allocated first, then they are associated with the
+    instances, both steps are done concurrently. If either step fails,
+    the IPs not associated with an instance are released, the associated
+    ones are released with their instances.
+
+    :param instance_pools: a list of (instance_id, pool) tuples
+    """
+    ips = {}
+    associated = set()
+
+    def allocate(instance_id, pool):
+        ips[instance_id] = nova.client().floating_ips.create(pool)
+
+    def associate(instance_id):
+        nova.client().servers.add_floating_ip(instance_id, ips[instance_id])
+        associated.add(instance_id)
+
+    try:
+        with context.ThreadGroup(CONF.floating_ip_concurrency) as tg:
+            for instance_id, pool in instance_pools:
+                tg.spawn('allocate-floating-ip-%s' % instance_id,
+                         allocate, instance_id, pool)
+    except Exception:
+        with excutils.save_and_reraise_exception():
+            _release_floating_ips([ip.id for ip in six.itervalues(ips)])
+
+    try:
+        with context.ThreadGroup(CONF.floating_ip_concurrency) as tg:
+            for instance_id in ips:
+                tg.spawn('associate-floating-ip-%s' % instance_id,
+                         associate, instance_id)
+    except Exception:
+        with excutils.save_and_reraise_exception():
+            _release_floating_ips([ip.id for instance_id, ip in
+                                   six.iteritems(ips)
+                                   if instance_id not in associated])
+
+
+def delete_floating_ips(instance_ids):
+    """Release floating IPs of the instances.
+
+    The IPs are looked up in a single listing and released concurrently.
+    """
+    instance_ids = set(instance_ids)
+    if not instance_ids:
+        return
+
+    _release_floating_ips([ip.id for ip in nova.client().floating_ips.list()
+                           if ip.instance_id in instance_ids])
+
 
+def _release_floating_ips(ip_ids):
+    def release(ip_id):
+        try:
+            nova.client().floating_ips.delete(ip_id)
+        except nova_exceptions.NotFound:
+            LOG.warning(_LW("Attempted to delete non-existent floating IP "
+                            "{ip}").format(ip=ip_id))
 
-def delete_floating_ip(instance_id):
-    fl_ips = nova.client().floating_ips.findall(instance_id=instance_id)
-    for fl_ip in fl_ips:
-        nova.client().floating_ips.delete(fl_ip.id)
+    with context.ThreadGroup(CONF.floating_ip_concurrency) as tg:
+        for ip_id in ip_ids:
+            tg.spawn('release-floating-ip-%s' % ip_id, release, ip_id)
@@ -28,8 +28,10 @@ from sahara.i18n import _
 from sahara.i18n import _LE
 from sahara.plugins import base as plugin_base
 from sahara.service.edp import job_manager
+from sahara.service import quotas
 from sahara.service import trusts
 from sahara.utils import general as g
+from sahara.utils.openstack import resilience
 from sahara.utils import remote
 from sahara.utils import rpc as rpc_utils
 
@@ -61,10 +63,25 @@ class LocalOps(object):
         context.spawn("cluster-terminating-%s" % cluster_id,
                       terminate_cluster, cluster_id)
 
+    def provision_clusters(self, cluster_ids):
+        _spawn_batch(_provision_cluster, "cluster-creating-%s", cluster_ids)
+
+    def provision_scaled_clusters(self, node_group_id_maps):
+        _spawn_batch(_provision_scaled_cluster, "cluster-scaling-%s",
+                     node_group_id_maps)
+
+    def terminate_clusters(self, cluster_ids):
+        _spawn_batch(terminate_cluster, "cluster-terminating-%s",
+                     cluster_ids)
+
     def run_edp_job(self, job_execution_id):
         context.spawn("Starting Job Execution %s" % job_execution_id,
                       _run_edp_job, job_execution_id)
 
+    def run_edp_jobs(self, job_execution_ids):
+        _spawn_batch(_run_edp_job, "Starting Job Execution %s",
+                     job_execution_ids)
+
     def cancel_job_execution(self, job_execution_id):
         context.spawn("Canceling Job Execution %s" % job_execution_id,
                       _cancel_job_execution, job_execution_id)
@@ -92,9 +109,22 @@ class RemoteOps(rpc_utils.RPCClient):
     def terminate_cluster(self, cluster_id):
         self.cast('terminate_cluster', cluster_id=cluster_id)
 
+    def provision_clusters(self, cluster_ids):
+        self.cast('provision_clusters', cluster_ids=cluster_ids)
+
+    def provision_scaled_clusters(self, node_group_id_maps):
+        self.cast('provision_scaled_clusters',
+                  node_group_id_maps=node_group_id_maps)
+
+    def terminate_clusters(self, cluster_ids):
+        self.cast('terminate_clusters', cluster_ids=cluster_ids)
+
     def run_edp_job(self, job_execution_id):
         self.cast('run_edp_job', job_execution_id=job_execution_id)
 
+    def run_edp_jobs(self, job_execution_ids):
+        self.cast('run_edp_jobs', job_execution_ids=job_execution_ids)
+
     def cancel_job_execution(self, job_execution_id):
         self.cast('cancel_job_execution',
                   job_execution_id=job_execution_id)
@@ -134,10 +164,32 @@ class OpsServer(rpc_utils.RPCServer):
     def terminate_cluster(self, cluster_id):
         terminate_cluster(cluster_id)
 
+    # batches are received by a single engine, which handles the
+    # clusters of the batch in parallel
+
+    @request_context
+    def provision_clusters(self, cluster_ids):
+        _spawn_batch(_provision_cluster, "cluster-creating-%s", cluster_ids)
+
+    @request_context
+    def provision_scaled_clusters(self, node_group_id_maps):
+        _spawn_batch(_provision_scaled_cluster, "cluster-scaling-%s",
+                     node_group_id_maps)
+
+    @request_context
+    def terminate_clusters(self, cluster_ids):
+        _spawn_batch(terminate_cluster, "cluster-terminating-%s",
+                     cluster_ids)
+
     @request_context
     def run_edp_job(self, job_execution_id):
         _run_edp_job(job_execution_id)
 
+    @request_context
+    def run_edp_jobs(self, job_execution_ids):
+        _spawn_batch(_run_edp_job, "Starting Job Execution %s",
+                     job_execution_ids)
+
     @request_context
     def cancel_job_execution(self, job_execution_id):
         _cancel_job_execution(job_execution_id)
@@ -151,6 +203,18 @@ class OpsServer(rpc_utils.RPCServer):
         return INFRA.get_type_and_version()
 
 
+def _spawn_batch(func, description, ids):
+    """Run func for each object of the batch in its own thread.
+
+    If ids is a dict, its values are passed to func as well.
+    """
+    for id in ids:
+        args = [id]
+        if isinstance(ids, dict):
+            args.append(ids[id])
+        context.spawn(description % id, func, *args)
+
+
 def ops_error_handler(description):
     def decorator(f):
         @functools.wraps(f)
@@ -159,8 +223,13 @@ def ops_error_handler(description):
             try:
                 # Clearing status description before executing
                 g.change_cluster_status_description(cluster_id, "")
-                f(cluster_id, *args, **kwds)
+                with context.ReadCacheManager(), resilience.retry_budget():
+                    f(cluster_id, *args, **kwds)
             except Exception as ex:
+                # the resources reserved by the quota check are created or
+                # about to be rolled back
+                quotas.release(cluster_id)
+
                 # something happened during cluster operation
                 cluster = conductor.cluster_get(ctx, cluster_id)
                 # check if cluster still exists (it might have been removed)
@@ -179,7 +248,10 @@ def ops_error_handler(description):
                 try:
                     # trying to rollback
                     desc = description.format(reason=msg)
-                    if _rollback_cluster(cluster, ex):
+                    # the budget of the operation may be spent already
+                    with resilience.retry_budget():
+                        rolled_back = _rollback_cluster(cluster, ex)
+                    if rolled_back:
                         g.change_cluster_status(cluster, "Active", desc)
                     else:
                         g.change_cluster_status(cluster, "Error", desc)
@@ -253,6 +325,7 @@ def _provision_cluster(cluster_id):
     cluster = conductor.cluster_get(ctx, cluster_id)
     context.set_step_type(_("Engine: create cluster"))
     INFRA.create_cluster(cluster)
+    quotas.release(cluster_id)
 
     # configure cluster
     cluster = g.change_cluster_status(cluster, "Configuring")
@@ -296,6 +369,7 @@ def _provision_scaled_cluster(cluster_id, node_group_id_map):
     cluster = g.change_cluster_status(cluster, "Scaling")
     context.set_step_type(_("Engine: scale cluster"))
     instance_ids = INFRA.scale_cluster(cluster, node_group_id_map)
+    quotas.release(cluster_id)
 
     # Setting up new nodes with the plugin
     if instance_ids:
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 import random
 
 from oslo_config import cfg
@@ -69,15 +70,6 @@ CONF.register_opts(periodic_opts)
 conductor = c.API
 
 
-def get_time_since_last_update(cluster):
-    cluster_updated_at = timeutils.normalize_time(
-        timeutils.parse_isotime(cluster.updated_at))
-    current_time = timeutils.utcnow()
-    spacing = timeutils.delta_seconds(cluster_updated_at,
-                                      current_time)
-    return spacing
-
-
 def terminate_cluster(ctx, cluster, description):
     if CONF.use_identity_api_v3:
         trusts.use_os_admin_auth_token(cluster)
@@ -131,21 +123,11 @@ def _make_periodic_tasks():
             LOG.debug('Terminating unneeded transient clusters')
             ctx = context.get_admin_context()
             context.set_ctx(ctx)
-            for cluster in conductor.cluster_get_all(ctx, status='Active'):
-                if not cluster.is_transient:
-                    continue
-
-                jc = conductor.job_execution_count(ctx,
-                                                   end_time=None,
-                                                   cluster_id=cluster.id)
-
-                if jc > 0:
-                    continue
-
-                spacing = get_time_since_last_update(cluster)
-                if spacing < CONF.min_transient_cluster_active_time:
-                    continue
-
+            updated_before = timeutils.utcnow() - datetime.timedelta(
+                seconds=CONF.min_transient_cluster_active_time)
+            for cluster in conductor.cluster_stale_get_all(
+                    ctx, updated_before, idle=True,
+                    status='Active', is_transient=True):
                 terminate_cluster(ctx, cluster, description='transient')
                 # Add event log info cleanup
                 context.ctx().current_instance_info = context.InstanceInfo()
@@ -155,7 +137,13 @@ def _make_periodic_tasks():
         def check_for_zombie_proxy_users(self, ctx):
             ctx = context.get_admin_context()
             context.set_ctx(ctx)
-            for user in p.proxy_domain_users_list():
+            p.POOL.reap()
+            users = p.proxy_domain_users_list()
+            for user in p.zombie_pooled_users(users):
+                LOG.debug('Found zombie proxy user {username}'.format(
+                    username=user.name))
+                p.proxy_user_delete(user_id=user.id)
+            for user in users:
                 if user.name.startswith('job_'):
                     je_id = user.name[4:]
                     je = conductor.job_execution_get(ctx, je_id)
@@ -175,17 +163,11 @@ def _make_periodic_tasks():
             ctx = context.get_admin_context()
 
             context.set_ctx(ctx)
-            # NOTE(alazarev) Retrieving all clusters once in hour for now.
-            # Criteria support need to be implemented in sahara db API to
-            # have SQL filtering.
-            for cluster in conductor.cluster_get_all(ctx):
-                if cluster.status in ['Active', 'Error', 'Deleting']:
-                    continue
-
-                spacing = get_time_since_last_update(cluster)
-                if spacing < CONF.cleanup_time_for_incomplete_clusters * 3600:
-                    continue
-
+            updated_before = timeutils.utcnow() - datetime.timedelta(
+                hours=CONF.cleanup_time_for_incomplete_clusters)
+            for cluster in conductor.cluster_stale_get_all(
+                    ctx, updated_before,
+                    exclude_status=('Active', 'Error', 'Deleting')):
                 terminate_cluster(ctx, cluster, description='incomplete')
                 # Add event log info cleanup
                 context.ctx().current_instance_info = context.InstanceInfo()
@@ -13,21 +13,53 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 from oslo_config import cfg
+from oslo_utils import excutils
 import six
 
+from sahara import conductor as c
 from sahara import context
 from sahara import exceptions as ex
 from sahara.i18n import _
+from sahara.utils.openstack import base
 from sahara.utils.openstack import cinder as cinder_client
 from sahara.utils.openstack import neutron as neutron_client
 from sahara.utils.openstack import nova as nova_client
 
 
+quota_opts = [
+    cfg.IntOpt('quota_usage_cache_ttl',
+               default=10,
+               help='Number of seconds the quotas and the resource usage '
+                    'of a tenant are cached for by the quota checks (0 '
+                    'disables the cache).'),
+    cfg.IntOpt('quota_reservation_timeout',
+               default=3600,
+               help='Maximum number of seconds the resources requested by '
+                    'a cluster operation which passed the quota check are '
+                    'reserved for, so that concurrent operations can\'t '
+                    'exceed the quotas before the resources are created. '
+                    'The reservations are released once the resources '
+                    'are created or the operation fails, the timeout only '
+                    'covers the operations which never finish.')
+]
+
+conductor = c.API
 CONF = cfg.CONF
+CONF.register_opts(quota_opts)
 
 UNLIMITED = 'unlimited'
 
+# the resources of the clusters in these statuses are created or rolled
+# back, clusters being provisioned or scaled are in other statuses
+SETTLED_STATUSES = ('Configuring', 'Starting', 'Active', 'Error',
+                    'Deleting')
+
+# available limits of the tenants, see _get_avail_limits()
+_USAGE = base.TTLCache()
+
 
 def _is_unlimited(limit):
     return limit == -1
@@ -48,16 +80,121 @@ def _get_zero_limits():
 
 
 def check_cluster(cluster):
-    req_limits = _get_req_cluster_limits(cluster)
-    _check_limits(req_limits)
+    """Check the quotas and reserve the resources of the cluster.
+
+    The reservation should be released with release() once the resources
+    of the cluster are created or if the cluster isn't provisioned.
+    """
+    _check_and_reserve({cluster.id: _get_req_cluster_limits(cluster)})
+
+
+def check_clusters(clusters):
+    """Check the quotas once against the demand of all of the clusters."""
+    _check_and_reserve({cluster.id: _get_req_cluster_limits(cluster)
+                        for cluster in clusters})
 
 
 def check_scaling(cluster, to_be_enlarged, additional):
-    req_limits = _get_req_scaling_limits(cluster, to_be_enlarged, additional)
-    _check_limits(req_limits)
+    _check_and_reserve({cluster.id: _get_req_scaling_limits(
+        cluster, to_be_enlarged, additional)})
+
+
+def check_scalings(scalings):
+    """Check the quotas once against the demand of all of the scalings.
+
+    :param scalings: a list of (cluster, to_be_enlarged, additional)
+    tuples with the arguments of check_scaling
+    """
+    _check_and_reserve({cluster.id: _get_req_scaling_limits(
+        cluster, to_be_enlarged, additional)
+        for cluster, to_be_enlarged, additional in scalings})
+
+
+def release(cluster_id):
+    """Release the resources reserved for the cluster by the checks.
 
+    The resources the cluster operation has created are counted in the
+    usage of the tenant from now on.
+    """
+    try:
+        conductor.cluster_update(context.ctx(), cluster_id,
+                                 {'quota_reservation': None})
+    except ex.NotFoundException:
+        # the reservation is gone with the cluster
+        pass
 
-def _check_limits(req_limits):
+
+def _check_and_reserve(cluster_limits):
+    """Reserve the resources of the clusters if the quotas allow it.
+
+    The reservations are stored with the clusters before the check, so
+    concurrent checks made by any process see each other. Two of them
+    racing may both fail, but they can't both pass over the quotas.
+
+    :param cluster_limits: a dict of the requested limits by cluster id
+    """
+    req_limits = _get_zero_limits()
+    for limits in six.itervalues(cluster_limits):
+        _add_limits(req_limits, limits)
+
+    expires_at = time.time() + CONF.quota_reservation_timeout
+    ctx = context.ctx()
+    for cluster_id, limits in six.iteritems(cluster_limits):
+        conductor.cluster_update(
+            ctx, cluster_id, {'quota_reservation': {
+                'expires_at': expires_at, 'limits': limits}})
+
+    try:
+        _check_limits(req_limits, exclude=set(cluster_limits))
+    except Exception:
+        with excutils.save_and_reraise_exception():
+            for cluster_id in cluster_limits:
+                release(cluster_id)
+
+
+def _get_reservations(exclude):
+    """Return the reservations of the operations in flight by cluster id.
+
+    The reservations of the clusters which got to a settled status or
+    expired are ignored, their resources are created or rolled back.
+    """
+    ctx = context.ctx()
+    now = time.time()
+    reservations = {}
+    for cluster in conductor.cluster_fields_get_all(
+            ctx, ['id', 'status', 'quota_reservation'],
+            tenant_id=ctx.tenant_id):
+        reservation = cluster['quota_reservation']
+        if (reservation and cluster['id'] not in exclude and
+                cluster['status'] not in SETTLED_STATUSES and
+                reservation['expires_at'] > now):
+            reservations[cluster['id']] = reservation['limits']
+    return reservations
+
+
+def _get_reserved_limits(reservations):
+    """Return the resources reserved by the operations in flight."""
+    reserved = _get_zero_limits()
+    for limits in six.itervalues(reservations):
+        for quota, value in six.iteritems(limits):
+            if quota == 'security_group_rules' and not CONF.use_neutron:
+                # the limit is per security group, not per tenant
+                continue
+            # scaling down frees the resources only when it's done
+            reserved[quota] += max(value, 0)
+    return reserved
+
+
+def _add_limits(limits, other):
+    for quota, value in six.iteritems(other):
+        if quota == 'security_group_rules' and not CONF.use_neutron:
+            # nova-network limits the number of rules per security group
+            limits[quota] = max(limits[quota], value)
+        else:
+            limits[quota] += value
+
+
+def _check_limits(req_limits, exclude=()):
     limits_name_map = {
         'ram': _("RAM"),
         'cpu': _("VCPU"),
@@ -70,12 +207,15 @@ def _check_limits(req_limits):
         'volume_gbs': _("volume storage")
     }
 
-    avail_limits = _get_avail_limits()
+    reservations = _get_reservations(exclude)
+    avail_limits = _get_avail_limits(frozenset(reservations))
+    reserved_limits = _get_reserved_limits(reservations)
     for quota, quota_name in six.iteritems(limits_name_map):
         if avail_limits[quota] != UNLIMITED:
-            if avail_limits[quota] < req_limits[quota]:
+            avail = avail_limits[quota] - reserved_limits[quota]
+            if avail < req_limits[quota]:
                 raise ex.QuotaException(quota_name, req_limits[quota],
-                                        avail_limits[quota])
+                                        avail)
 
 
 def _get_req_cluster_limits(cluster):
@@ -97,9 +237,8 @@ def _get_req_scaling_limits(cluster, to_be_enlarged, additional):
 
 def _update_limits_for_ng(limits, ng, count):
     sign = lambda x: (1, -1)[x < 0]
-    nova = nova_client.client()
     limits['instances'] += count
-    flavor = nova.flavors.get(ng.flavor_id)
+    flavor = nova_client.get_flavor_by_id(ng.flavor_id)
     limits['ram'] += flavor.ram * count
     limits['cpu'] += flavor.vcpus * count
     if ng.floating_ip_pool:
@@ -120,7 +259,18 @@ def _update_limits_for_ng(limits, ng, count):
         limits['ports'] += count
 
 
-def _get_avail_limits():
+def _get_avail_limits(reserved_ids):
+    """Return the available limits, they are cached for a few seconds.
+
+    The resources of an operation are counted either in its reservation
+    or in the usage, so the cached usage is only used while the set of
+    the reserved clusters stays the same.
+    """
+    return _USAGE.get('limits', (context.ctx().tenant_id, reserved_ids),
+                      _load_avail_limits, CONF.quota_usage_cache_ttl)
+
+
+def _load_avail_limits():
     limits = _get_zero_limits()
     limits.update(_get_nova_limits())
     limits.update(_get_neutron_limits())
@@ -163,23 +313,25 @@ def _get_neutron_limits():
     tenant_id = context.ctx().tenant_id
     total_lim = neutron.show_quota(tenant_id)['quota']
 
+    # only ids of the resources are fetched to count them
     if CONF.use_floating_ips:
         usage_fip = neutron.list_floatingips(
-            tenant_id=tenant_id)['floatingips']
+            tenant_id=tenant_id, fields='id')['floatingips']
         limits['floatingips'] = _sub_limit(total_lim['floatingip'],
                                            len(usage_fip))
 
     usage_sg = neutron.list_security_groups(
-        tenant_id=tenant_id)['security_groups']
+        tenant_id=tenant_id, fields='id')['security_groups']
     limits['security_groups'] = _sub_limit(total_lim['security_group'],
                                            len(usage_sg))
 
     usage_sg_rules = (neutron.list_security_group_rules(
-        tenant_id=tenant_id)['security_group_rules'])
+        tenant_id=tenant_id, fields='id')['security_group_rules'])
     limits['security_group_rules'] = _sub_limit(
         total_lim['security_group_rule'], len(usage_sg_rules))
 
-    usage_ports = neutron.list_ports(tenant_id=tenant_id)['ports']
+    usage_ports = neutron.list_ports(tenant_id=tenant_id,
+                                     fields='id')['ports']
     limits['ports'] = _sub_limit(total_lim['port'], len(usage_ports))
 
     return limits
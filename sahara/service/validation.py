@@ -21,6 +21,7 @@ from sahara import exceptions as ex
 from sahara.i18n import _
 from sahara.utils import api as u
 from sahara.utils import api_validator
+from sahara.utils import timing
 
 
 def validate(schema, *validators):
@@ -29,12 +30,13 @@ def validate(schema, *validators):
         def handler(*args, **kwargs):
             request_data = u.request_data()
             try:
-                if schema:
-                    validator = api_validator.ApiValidator(schema)
-                    validator.validate(request_data)
-                if validators:
-                    for validator in validators:
-                        validator(**kwargs)
+                with timing.measure('validation'):
+                    if schema:
+                        validator = api_validator.ApiValidator(schema)
+                        validator.validate(request_data)
+                    if validators:
+                        for validator in validators:
+                            validator(**kwargs)
             except jsonschema.ValidationError as e:
                 e.code = "VALIDATION_ERROR"
                 return u.bad_request(e)
@@ -64,7 +66,8 @@ def check_exists(get_func, *id_prop, **get_args):
 
             obj = None
             try:
-                obj = get_func(**get_kwargs)
+                with timing.measure('validation'):
+                    obj = get_func(**get_kwargs)
             except Exception as e:
                 if 'notfound' not in e.__class__.__name__.lower():
                     raise e
@@ -76,7 +76,7 @@ def check_plugin_supports_version(p_name, version):
 
 
 def check_image_registered(image_id):
-    if image_id not in [i.id for i in nova.client().images.list_registered()]:
+    if nova.get_registered_image(image_id) is None:
         raise ex.InvalidReferenceException(
             _("Requested image '%s' is not registered") % image_id)
 
@@ -162,10 +162,7 @@ def check_node_group_basic_fields(plugin_name, hadoop_version, ng,
 
 
 def check_flavor_exists(flavor_id):
-    flavor_list = nova.client().flavors.list()
-    if flavor_id not in [flavor.id for flavor in flavor_list]:
-        raise ex.NotFoundException(
-            flavor_id, _("Requested flavor '%s' not found"))
+    nova.get_flavor_by_id(flavor_id)
 
 
 def check_security_groups_exist(security_groups):
@@ -253,13 +250,32 @@ def check_cluster_unique_name(name):
     check_heat_stack_name(name)
 
 
+def check_cluster_unique_names(names):
+    existing = set(cluster.name for cluster in api.get_clusters(['name']))
+    stack_names = _get_heat_stack_names()
+    for name in names:
+        if name in existing:
+            raise ex.NameAlreadyExistsException(
+                _("Cluster with name '%s' already exists") % name)
+        existing.add(name)
+        _check_heat_stack_name(name, stack_names)
+
+
+def _get_heat_stack_names():
+    if CONF.infrastructure_engine != 'heat':
+        return set()
+    return set(stack.stack_name for stack in heat.client().stacks.list())
+
+
+def _check_heat_stack_name(cluster_name, stack_names):
+    if cluster_name in stack_names:
+        raise ex.NameAlreadyExistsException(
+            _("Cluster name '%s' is already used as Heat stack name")
+            % cluster_name)
+
+
 def check_heat_stack_name(cluster_name):
-    if CONF.infrastructure_engine == 'heat':
-        for stack in heat.client().stacks.list():
-            if stack.stack_name == cluster_name:
-                raise ex.NameAlreadyExistsException(
-                    _("Cluster name '%s' is already used as Heat stack name")
-                    % cluster_name)
+    _check_heat_stack_name(cluster_name, _get_heat_stack_names())
 
 
 def check_cluster_hostnames_lengths(cluster_name, node_groups):
@@ -392,9 +408,13 @@ def check_add_node_groups(cluster, add_node_groups):
 
 
 def check_required_image_tags(plugin_name, hadoop_version, image_id):
-    image = api.get_image(id=image_id)
     plugin = plugin_base.PLUGINS.get_plugin(plugin_name)
     req_tags = set(plugin.get_required_image_tags(hadoop_version))
+    image = nova.get_registered_image(image_id)
+    if image is None or not req_tags.issubset(set(image.tags)):
+        # the tags may have been changed through another process
+        image = (nova.get_registered_images(refresh=True).get(image_id) or
+                 api.get_image(id=image_id))
     if not req_tags.issubset(set(image.tags)):
             raise ex.InvalidReferenceException(
                 _("Tags of requested image '%(image)s' don't contain required"
@@ -46,9 +46,58 @@ def _build_cluster_schema():
 
 CLUSTER_SCHEMA = _build_cluster_schema()
 
+CLUSTERS_BULK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "clusters": {
+            "type": "array",
+            "items": CLUSTER_SCHEMA,
+            "minItems": 1,
+        },
+    },
+    "additionalProperties": False,
+    "required": ["clusters"],
+}
+
+CLUSTERS_BULK_DELETE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "cluster_ids": {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "format": "uuid",
+            },
+            "minItems": 1,
+            "uniqueItems": True,
+        },
+    },
+    "additionalProperties": False,
+    "required": ["cluster_ids"],
+}
+
 
 def check_cluster_create(data, **kwargs):
     b.check_cluster_unique_name(data['name'])
+    _check_cluster_create(data)
+
+
+def check_clusters_bulk_create(data, **kwargs):
+    # existing clusters are listed once for the whole batch
+    b.check_cluster_unique_names(
+        [cluster['name'] for cluster in data['clusters']])
+    for cluster in data['clusters']:
+        _check_cluster_create(cluster)
+
+
+def check_clusters_bulk_delete(data, **kwargs):
+    for cluster_id in data['cluster_ids']:
+        if api.get_cluster_summary(cluster_id) is None:
+            raise ex.NotFoundException(
+                cluster_id, _("Cluster id '%s' not found!"))
+
+
+def _check_cluster_create(data):
     b.check_plugin_name_exists(data['plugin_name'])
     b.check_plugin_supports_version(data['plugin_name'],
                                     data['hadoop_version'])
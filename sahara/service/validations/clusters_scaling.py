@@ -67,6 +67,43 @@ CLUSTER_SCALING_SCHEMA = {
 }
 
 
+def _build_clusters_bulk_scaling_schema():
+    scaling_schema = copy.deepcopy(CLUSTER_SCALING_SCHEMA)
+    scaling_schema['properties']['id'] = {
+        "type": "string",
+        "format": "uuid",
+    }
+    scaling_schema['required'] = ['id']
+    return {
+        "type": "object",
+        "properties": {
+            "clusters": {
+                "type": "array",
+                "items": scaling_schema,
+                "minItems": 1,
+            },
+        },
+        "additionalProperties": False,
+        "required": ["clusters"],
+    }
+
+
+CLUSTERS_BULK_SCALING_SCHEMA = _build_clusters_bulk_scaling_schema()
+
+
+def check_clusters_bulk_scaling(data, **kwargs):
+    cluster_ids = [scaling['id'] for scaling in data['clusters']]
+    if len(set(cluster_ids)) != len(cluster_ids):
+        raise ex.InvalidDataException(
+            _("Each cluster can be scaled only once in a batch"))
+
+    for scaling in data['clusters']:
+        if api.get_cluster_summary(scaling['id']) is None:
+            raise ex.NotFoundException(
+                scaling['id'], _("Cluster id '%s' not found!"))
+        check_cluster_scaling(scaling, scaling['id'])
+
+
 def check_cluster_scaling(data, cluster_id, **kwargs):
     cluster = api.get_cluster(id=cluster_id)
 
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 from sahara import conductor as c
 from sahara import context
 from sahara import exceptions as ex
@@ -44,6 +46,32 @@ JOB_EXEC_SCHEMA = {
 }
 
 
+def _build_job_exec_bulk_schema():
+    job_exec_schema = copy.deepcopy(JOB_EXEC_SCHEMA)
+    job_exec_schema['properties']['job_id'] = {
+        "type": "string",
+        "format": "uuid",
+    }
+    job_exec_schema['required'].append("job_id")
+    return {
+        "type": "object",
+        "properties": {
+            "job_executions": {
+                "type": "array",
+                "items": job_exec_schema,
+                "minItems": 1,
+            },
+        },
+        "additionalProperties": False,
+        "required": [
+            "job_executions"
+        ]
+    }
+
+
+JOB_EXEC_BULK_SCHEMA = _build_job_exec_bulk_schema()
+
+
 conductor = c.API
 
 
@@ -95,6 +123,17 @@ def check_job_execution(data, job_id):
     edp_engine.validate_job_execution(cluster, job, data)
 
 
+def check_job_executions_bulk(data, **kwargs):
+    # job executions of a batch usually share clusters and jobs
+    with context.ReadCacheManager():
+        for job_execution in data['job_executions']:
+            job_id = job_execution['job_id']
+            if not conductor.job_get(context.ctx(), job_id):
+                raise ex.InvalidReferenceException(
+                    _("Job with id '%s' doesn't exist") % job_id)
+            check_job_execution(job_execution, job_id)
+
+
 def check_data_sources(data, job):
     if not ('input_id' in data and 'output_id' in data):
         raise ex.InvalidDataException(_("%s job requires 'input_id' "
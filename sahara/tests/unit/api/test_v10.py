@@ -0,0 +1,75 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import flask
+import mock
+from oslo_policy import policy as cpolicy
+
+from sahara.api import acl
+from sahara.api import v10 as api_v10
+from sahara.tests.unit import base
+from sahara.utils import api as u
+
+
+HEADERS = {'X-User-Id': 'user_1',
+           'X-Tenant-Id': 'tenant_1',
+           'X-Auth-Token': 'token',
+           'X-Service-Catalog': '[]',
+           'X-User-Name': 'user',
+           'X-Tenant-Name': 'tenant',
+           'X-Roles': 'member'}
+
+
+class TestEvents(base.SaharaTestCase):
+
+    def setUp(self):
+        super(TestEvents, self).setUp()
+        acl.setup_policy()
+        acl.ENFORCER.set_rules(cpolicy.Rules.load_json('{"events:get": ""}'),
+                               use_conf=False)
+        self.app = flask.Flask('sahara.api')
+        self.app.register_blueprint(api_v10.rest, url_prefix='/v1.1')
+
+    def test_render_events(self):
+        event = {'type': 'cluster.status', 'timestamp': 'now',
+                 'body': {'status': 'Active'}}
+        with self.app.test_request_context('/v1.1/tenant_1/events'):
+            resp = u.render_events(iter([event, None]))
+            self.assertEqual('text/event-stream', resp.mimetype)
+            self.assertEqual('no-cache', resp.headers['Cache-Control'])
+            chunks = list(resp.response)
+
+        self.assertEqual('event: cluster.status\n', chunks[0].split('data')[0])
+        self.assertIn('"status": "Active"', chunks[0])
+        self.assertEqual(': keepalive\n\n', chunks[1])
+
+    @mock.patch('sahara.service.api.get_events')
+    def test_events_stream(self, get_events):
+        get_events.return_value = iter([None])
+        resp = self.app.test_client().get('/v1.1/tenant_1/events',
+                                          headers=HEADERS)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(b': keepalive\n\n', resp.data)
+
+    def test_events_stream_refused(self):
+        # without the message bus the events published by the other
+        # workers are not delivered
+        self.override_config('api_workers', 2)
+        resp = self.app.test_client().get('/v1.1/tenant_1/events',
+                                          headers=HEADERS)
+
+        self.assertEqual(400, resp.status_code)
+        self.assertIn(b'NOT_IMPLEMENTED', resp.data)
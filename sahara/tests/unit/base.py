@@ -27,6 +27,12 @@ class SaharaTestCase(base.BaseTestCase):
         super(SaharaTestCase, self).setUp()
 
         self.setup_context()
+        # results of mocked clients must not be shared by tests
+        self.override_config('metadata_cache_ttl', 0, group='nova')
+        self.override_config('quota_usage_cache_ttl', 0)
+        self.override_config('object_metadata_cache_ttl', 0, group='swift')
+        self.override_config('connection_pool_size', 0, group='swift')
+        self.override_config('api_retry_count', 0)
 
     def setup_context(self, username="test_user", tenant_id="tenant_1",
                       auth_token="test_auth_token", tenant_name='test_tenant',
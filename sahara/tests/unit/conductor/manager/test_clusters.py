@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import copy
+import datetime
 
 import testtools
 
@@ -313,3 +314,86 @@ class ClusterTest(test_base.ConductorManagerTestCase):
         # Invalid field
         lst = self.api.cluster_get_all(ctx, **{'badfield': 'somevalue'})
         self.assertEqual(0, len(lst))
+
+    def test_cluster_stale_get_all(self):
+        ctx = context.ctx()
+        updated_at = datetime.datetime(2005, 2, 1, 0, 0)
+        for name, status in [('c1', 'Active'), ('c2', 'Error'),
+                             ('c3', 'Spawning')]:
+            values = copy.deepcopy(SAMPLE_CLUSTER)
+            values.update({'name': name, 'status': status,
+                           'updated_at': updated_at})
+            self.api.cluster_create(ctx, values)
+
+        lst = self.api.cluster_stale_get_all(
+            ctx, updated_at - datetime.timedelta(seconds=1))
+        self.assertEqual(0, len(lst))
+
+        lst = self.api.cluster_stale_get_all(ctx, updated_at)
+        self.assertEqual(3, len(lst))
+        self.assertNotIn('node_groups', lst[0])
+
+        lst = self.api.cluster_stale_get_all(
+            ctx, updated_at, exclude_status=('Active', 'Error'))
+        self.assertEqual(['c3'], [c['name'] for c in lst])
+
+        lst = self.api.cluster_stale_get_all(
+            ctx, updated_at, idle=True, status='Active')
+        self.assertEqual(['c1'], [c['name'] for c in lst])
+
+        # Invalid field
+        lst = self.api.cluster_stale_get_all(
+            ctx, updated_at, **{'badfield': 'somevalue'})
+        self.assertEqual(0, len(lst))
+
+    def test_cluster_revision_get(self):
+        ctx = context.ctx()
+        cluster = self.api.cluster_create(ctx, SAMPLE_CLUSTER)
+        revision = self.api.cluster_revision_get(ctx, cluster['id'])
+        self.assertIsNotNone(revision)
+        self.assertEqual(
+            revision, self.api.cluster_revision_get(ctx, cluster['id']))
+
+        ng_id = cluster['node_groups'][-1]['id']
+        instance_id = self._add_instance(ctx, ng_id)
+        added = self.api.cluster_revision_get(ctx, cluster['id'])
+        self.assertNotEqual(revision, added)
+
+        self.api.instance_update(ctx, instance_id, {'internal_ip': '10.0.0.1'})
+        updated = self.api.cluster_revision_get(ctx, cluster['id'])
+        self.assertNotEqual(added, updated)
+
+        self.api.instance_remove(ctx, instance_id)
+        self.assertNotEqual(
+            updated, self.api.cluster_revision_get(ctx, cluster['id']))
+
+        self.assertIsNone(self.api.cluster_revision_get(ctx, 'unknown'))
+
+    def test_cluster_pagination(self):
+        ctx = context.ctx()
+        for name in ['c3', 'c1', 'c2']:
+            values = copy.deepcopy(SAMPLE_CLUSTER)
+            values['name'] = name
+            self.api.cluster_create(ctx, values)
+
+        lst = self.api.cluster_get_all(ctx, sort_by='name')
+        self.assertEqual(['c1', 'c2', 'c3'], [c['name'] for c in lst])
+
+        lst = self.api.cluster_get_all(ctx, sort_by='-name', limit=2)
+        self.assertEqual(['c3', 'c2'], [c['name'] for c in lst])
+
+        lst = self.api.cluster_get_all(ctx, sort_by='-name', limit='2',
+                                       marker=lst[-1]['id'])
+        self.assertEqual(['c1'], [c['name'] for c in lst])
+
+        lst = self.api.cluster_get_all(ctx, name='c2', limit=2)
+        self.assertEqual(['c2'], [c['name'] for c in lst])
+
+        with testtools.ExpectedException(ex.InvalidDataException):
+            self.api.cluster_get_all(ctx, sort_by='badfield')
+
+        with testtools.ExpectedException(ex.InvalidDataException):
+            self.api.cluster_get_all(ctx, limit='-1')
+
+        with testtools.ExpectedException(ex.NotFoundException):
+            self.api.cluster_get_all(ctx, marker='badmarker')
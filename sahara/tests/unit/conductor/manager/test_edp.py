@@ -407,6 +407,68 @@ class JobExecutionTest(test_base.ConductorManagerTestCase):
         lst = self.api.job_execution_get_all(ctx, **kwargs)
         self.assertEqual(0, len(lst))
 
+    def test_job_execution_status_filter(self):
+        ctx = context.ctx()
+        job = self.api.job_create(ctx, SAMPLE_JOB)
+        ds_input = self.api.data_source_create(ctx, SAMPLE_DATA_SOURCE)
+        SAMPLE_DATA_OUTPUT = copy.copy(SAMPLE_DATA_SOURCE)
+        SAMPLE_DATA_OUTPUT['name'] = 'output'
+        ds_output = self.api.data_source_create(ctx, SAMPLE_DATA_OUTPUT)
+
+        my_sample_job_exec = copy.copy(SAMPLE_JOB_EXECUTION)
+        my_sample_job_exec['job_id'] = job['id']
+        my_sample_job_exec['input_id'] = ds_input['id']
+        my_sample_job_exec['output_id'] = ds_output['id']
+        my_sample_job_exec['info'] = {'status': 'Running'}
+        job_ex = self.api.job_execution_create(ctx, my_sample_job_exec)
+
+        self.assertEqual(
+            1, self.api.job_execution_count(ctx, status='RUNNING'))
+        self.assertEqual(
+            0, self.api.job_execution_count(ctx, status='SUCCEEDED'))
+        self.assertEqual(0, self.api.job_execution_count(
+            ctx, exclude_status=['RUNNING', 'SUCCEEDED']))
+        self.assertEqual(1, self.api.job_execution_count(
+            ctx, exclude_status=['SUCCEEDED']))
+        revision = self.api.job_execution_revision_get(ctx, job_ex['id'])
+
+        self.api.job_execution_update(
+            ctx, job_ex['id'], {'info': {'status': 'SUCCEEDED'}})
+        self.assertNotEqual(
+            revision, self.api.job_execution_revision_get(ctx, job_ex['id']))
+        self.assertEqual(
+            0, self.api.job_execution_count(ctx, status='running'))
+        lst = self.api.job_execution_get_all(ctx, status='succeeded')
+        self.assertEqual(1, len(lst))
+        self.assertEqual('SUCCEEDED', lst[0]['status'])
+
+        self.api.job_execution_update(ctx, job_ex['id'], {'info': {}})
+        self.assertEqual(
+            0, self.api.job_execution_count(ctx, status='succeeded'))
+        self.assertEqual(1, self.api.job_execution_count(
+            ctx, exclude_status=['SUCCEEDED']))
+
+    def test_job_execution_create_all(self):
+        ctx = context.ctx()
+        job = self.api.job_create(ctx, SAMPLE_JOB)
+        ds_input = self.api.data_source_create(ctx, SAMPLE_DATA_SOURCE)
+        SAMPLE_DATA_OUTPUT = copy.copy(SAMPLE_DATA_SOURCE)
+        SAMPLE_DATA_OUTPUT['name'] = 'output'
+        ds_output = self.api.data_source_create(ctx, SAMPLE_DATA_OUTPUT)
+
+        values_list = []
+        for status in ['PENDING', 'RUNNING']:
+            values = copy.copy(SAMPLE_JOB_EXECUTION)
+            values.update({'job_id': job['id'], 'input_id': ds_input['id'],
+                           'output_id': ds_output['id'],
+                           'info': {'status': status}})
+            values_list.append(values)
+
+        lst = self.api.job_execution_create_all(ctx, values_list)
+        self.assertEqual(2, len(lst))
+        self.assertEqual(['PENDING', 'RUNNING'], [je['status'] for je in lst])
+        self.assertEqual(2, self.api.job_execution_count(ctx))
+
 
 class JobTest(test_base.ConductorManagerTestCase):
     def __init__(self, *args, **kwargs):
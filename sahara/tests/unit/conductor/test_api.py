@@ -13,7 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-
+import mock
 import testtools
 
 from sahara import conductor
@@ -175,3 +175,106 @@ class TestConductorClusterApi(base.SaharaWithDbTestCase):
 
         with testtools.ExpectedException(exceptions.NotFoundException):
             self._get_events(ctx, cluster.id, step_id)
+
+    def test_cluster_status_get(self):
+        ctx, cluster = self._make_sample()
+        self.api.cluster_update(ctx, cluster.id, {'status': 'Active'})
+
+        status = self.api.cluster_status_get(ctx, cluster)
+        self.assertEqual(cluster.id, status.id)
+        self.assertEqual('Active', status.status)
+        self.assertNotIn('node_groups', status)
+        self.assertNotIn('cluster_configs', status)
+
+        self.api.cluster_destroy(ctx, cluster.id)
+        self.assertIsNone(self.api.cluster_status_get(ctx, cluster.id))
+
+    def test_cluster_summary_get_all(self):
+        ctx, cluster = self._make_sample()
+
+        summaries = self.api.cluster_summary_get_all(ctx)
+        self.assertEqual(1, len(summaries))
+        self.assertEqual('test_cluster', summaries[0].name)
+        self.assertEqual('test_plugin', summaries[0].plugin_name)
+        self.assertNotIn('node_groups', summaries[0])
+        self.assertNotIn('management_private_key', summaries[0])
+
+        self.assertEqual(
+            [], self.api.cluster_summary_get_all(ctx, status='Active'))
+        self.assertEqual(
+            [], self.api.cluster_summary_get_all(ctx, badfield='value'))
+
+    def test_cluster_get_read_cache(self):
+        ctx, cluster = self._make_sample()
+
+        with context.ReadCacheManager():
+            self.assertIsNotNone(ctx.read_cache)
+            self.api.cluster_get(ctx, cluster)
+            with mock.patch.object(self.api._manager,
+                                   'cluster_get') as p_cluster_get:
+                self.assertEqual('test_cluster',
+                                 self.api.cluster_get(ctx, cluster).name)
+                self.assertEqual(0, p_cluster_get.call_count)
+
+            self.api.cluster_update(ctx, cluster, {'name': 'new_name'})
+            self.assertEqual('new_name',
+                             self.api.cluster_get(ctx, cluster).name)
+
+        self.assertIsNone(ctx.read_cache)
+
+    def test_cluster_read_cache_events(self):
+        ctx, cluster = self._make_sample()
+
+        with context.ReadCacheManager():
+            self.api.cluster_get(ctx, cluster)
+            step_id = self.api.cluster_provision_step_add(
+                ctx, cluster.id, {'step_name': 'some_name',
+                                  'step_type': 'some_type'})
+            self.api.cluster_event_add(ctx, step_id, {
+                'node_group_id': 'node_group_id',
+                'instance_id': 'instance_id',
+                'instance_name': 'instance_name',
+                'event_info': 'some_info',
+                'successful': True})
+            with mock.patch.object(self.api._manager,
+                                   'cluster_get') as p_cluster_get:
+                self.api.cluster_get(ctx, cluster)
+                self.assertEqual(0, p_cluster_get.call_count)
+
+            progress = self.api.cluster_get(
+                ctx, cluster, show_progress=True).provision_progress
+            self.assertEqual(1, len(progress))
+            self.assertEqual(1, len(progress[0].events))
+
+    def test_cluster_read_cache_template_update(self):
+        ctx, cluster = self._make_sample()
+
+        with context.ReadCacheManager():
+            self.api.cluster_get(ctx, cluster)
+            with mock.patch.object(self.api._manager,
+                                   'cluster_template_update'):
+                self.api.cluster_template_update(ctx, 'template_id', {})
+            with mock.patch.object(self.api._manager,
+                                   'cluster_get') as p_cluster_get:
+                self.api.cluster_get(ctx, cluster)
+                self.assertEqual(1, p_cluster_get.call_count)
+
+    def test_cluster_fields_get_all(self):
+        ctx, cluster = self._make_sample()
+
+        clusters = self.api.cluster_fields_get_all(ctx, ['id', 'name'])
+        self.assertEqual(1, len(clusters))
+        self.assertEqual({'id': cluster.id, 'name': 'test_cluster'},
+                         clusters[0].to_dict())
+
+        # node groups are not columns, the whole cluster is loaded
+        clusters = self.api.cluster_fields_get_all(
+            ctx, ['name', 'node_groups'], name='test_cluster')
+        self.assertEqual(['name', 'node_groups'],
+                         sorted(clusters[0].to_dict().keys()))
+        self.assertEqual('ng_1', clusters[0].node_groups[0].name)
+
+        self.assertEqual('test_cluster', self.api.cluster_fields_get(
+            ctx, cluster, ['name']).name)
+        self.assertNotIn('management_private_key', self.api.cluster_fields_get(
+            ctx, cluster, ['name', 'management_private_key']).to_dict())
@@ -176,6 +176,27 @@ class TestResource(testtools.TestCase):
         self.assertEqual('worker',
                          cluster.node_groups[1].instances[0].node_group.name)
 
+    def test_lazy_wrapping(self):
+        cluster_dict = copy.deepcopy(SAMPLE_CLUSTER_DICT)
+        cluster = r.ClusterResource(cluster_dict)
+
+        self.assertIs(cluster_dict['cluster_configs'],
+                      dict.__getitem__(cluster, 'cluster_configs'))
+
+        configs = cluster.cluster_configs
+        self.assertIsInstance(configs, r.Resource)
+        self.assertIs(configs, cluster.cluster_configs)
+        self.assertIs(configs, cluster.get('cluster_configs'))
+        self.assertEqual('somevalue', configs.general.some_overridden_config)
+
+        self.assertIsInstance(dict.__getitem__(cluster, 'node_groups'), list)
+        self.assertNotIsInstance(dict.__getitem__(cluster, 'node_groups'),
+                                 types.FrozenList)
+        for name, value in cluster.iteritems():
+            if isinstance(value, list):
+                self.assertIsInstance(value, types.FrozenList)
+            self.assertIs(value, dict.__getitem__(cluster, name))
+
     def test_to_dict(self):
         cluster = r.ClusterResource(SAMPLE_CLUSTER_DICT)
         self.assertEqual(SAMPLE_CLUSTER_DICT, cluster.to_dict())
@@ -461,6 +461,45 @@ class SaharaMigrationsCheckers(object):
         self.assertColumnNotExists(engine, 'cluster_provision_steps',
                                    'started_at')
 
+    def _pre_upgrade_021(self, engine):
+        t = db_utils.get_table(engine, 'job_executions')
+        engine.execute(t.insert(), id='123', info='{"status": "Running"}')
+        engine.execute(t.insert(), id='456', info=None)
+
+    def _check_021(self, engine, data):
+        self.assertColumnExists(engine, 'job_executions', 'status')
+        self.assertIndexMembers(engine, 'job_executions',
+                                'ix_job_executions_status', ['status'])
+        self.assertIndexMembers(engine, 'job_executions',
+                                'ix_job_executions_start_time',
+                                ['start_time'])
+        self.assertIndexMembers(engine, 'job_executions',
+                                'ix_job_executions_end_time', ['end_time'])
+        self.assertIndexMembers(engine, 'job_executions',
+                                'ix_job_executions_cluster_id',
+                                ['cluster_id'])
+
+        t = db_utils.get_table(engine, 'job_executions')
+        res = engine.execute(t.select().where(t.c.id == '123')).first()
+        self.assertEqual('RUNNING', res['status'])
+        res = engine.execute(t.select().where(t.c.id == '456')).first()
+        self.assertIsNone(res['status'])
+        engine.execute(t.delete())
+
+    def _check_022(self, engine, data):
+        self.assertIndexMembers(engine, 'clusters',
+                                'ix_clusters_status_is_transient_updated_at',
+                                ['status', 'is_transient', 'updated_at'])
+        self.assertIndexMembers(engine, 'clusters', 'ix_clusters_updated_at',
+                                ['updated_at'])
+
+    def _check_023(self, engine, data):
+        self.assertColumnExists(engine, 'clusters', 'revision')
+        self.assertColumnExists(engine, 'job_executions', 'revision')
+
+    def _check_024(self, engine, data):
+        self.assertColumnExists(engine, 'clusters', 'quota_reservation')
+
 
 class TestMigrationsMySQL(SaharaMigrationsCheckers,
                           base.BaseWalkMigrationTestCase,
@@ -16,6 +16,7 @@
 import testtools
 
 from sahara.plugins import base as pb
+from sahara.service import api
 
 
 class BasePluginsSupportTest(testtools.TestCase):
@@ -28,3 +29,14 @@ class BasePluginsSupportTest(testtools.TestCase):
         plugins = [p.name for p in pb.PLUGINS.get_plugins(pb.PluginInterface)]
         self.assertIn('vanilla', plugins)
         self.assertIn('hdp', plugins)
+
+    def test_plugin_resources_cached(self):
+        res = api.get_plugin('vanilla', '2.6.0')
+        self.assertIsNotNone(res.configs)
+        self.assertIs(res, api.get_plugin('vanilla', '2.6.0'))
+        self.assertIsNone(api.get_plugin('vanilla', 'unknown'))
+        self.assertNotIn(('plugin', 'vanilla', 'unknown'), pb.PLUGINS.cache)
+
+        # cached resources are dropped when plugins are set up again
+        pb.setup_plugins()
+        self.assertIsNot(res, api.get_plugin('vanilla', '2.6.0'))
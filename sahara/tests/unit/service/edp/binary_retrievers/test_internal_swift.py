@@ -42,15 +42,24 @@ class TestInternalSwift(base.SaharaTestCase):
                           client_instance)
         client_instance.head_object.assert_called_once_with('container',
                                                             'object')
+        self.assertEqual(0, client_instance.get_object.call_count)
 
         # valid return
         header = {'content-length': '4'}
-        body = 'data'
         client_instance.head_object.return_value = header
-        client_instance.get_object.return_value = (header, body)
-        self.assertEqual(body, i_s._get_raw_data(job_binary, client_instance))
-        client_instance.get_object.assert_called_once_with('container',
-                                                           'object')
+        client_instance.get_object.return_value = (header, iter(['da', 'ta']))
+        self.assertEqual('data', i_s._get_raw_data(job_binary,
+                                                   client_instance))
+        client_instance.get_object.assert_called_once_with(
+            'container', 'object', resp_chunk_size=65536, headers={})
+
+        # an object grown since its size was checked
+        client_instance.get_object.return_value = (
+            header, iter(['x' * 1000, 'x' * 1000]))
+        self.assertRaises(ex.DataTooBigException,
+                          i_s._get_raw_data,
+                          job_binary,
+                          client_instance)
 
     def test__validate_job_binary_url(self):
         @i_s._validate_job_binary_url
@@ -73,10 +82,10 @@ class TestInternalSwift(base.SaharaTestCase):
 
     @mock.patch(
         'sahara.service.edp.binary_retrievers.internal_swift._get_raw_data')
-    @mock.patch('sahara.utils.openstack.swift.client')
+    @mock.patch('sahara.utils.openstack.swift.connection')
     def test_get_raw_data(self, swift_client, _get_raw_data):
         client_instance = mock.Mock()
-        swift_client.return_value = client_instance
+        swift_client.return_value.__enter__.return_value = client_instance
 
         job_binary = mock.Mock()
         job_binary.url = 'swift://container/object'
@@ -101,10 +110,10 @@ class TestInternalSwift(base.SaharaTestCase):
     @mock.patch('sahara.context.ctx')
     @mock.patch(
         'sahara.service.edp.binary_retrievers.internal_swift._get_raw_data')
-    @mock.patch('sahara.utils.openstack.swift.client_from_token')
+    @mock.patch('sahara.utils.openstack.swift.connection_from_token')
     def test_get_raw_data_with_context(self, swift_client, _get_raw_data, ctx):
         client_instance = mock.Mock()
-        swift_client.return_value = client_instance
+        swift_client.return_value.__enter__.return_value = client_instance
         test_context = mock.Mock()
         test_context.auth_token = 'testtoken'
         ctx.return_value = test_context
@@ -18,7 +18,9 @@ from novaclient import exceptions as nova_exceptions
 
 from sahara import conductor as cond
 from sahara import context
+from sahara import exceptions as ex
 from sahara.service import direct_engine as e
+from sahara.service import networks
 from sahara.service import ops
 from sahara.tests.unit import base
 import sahara.utils.crypto as c
@@ -228,6 +230,38 @@ class IpManagementTest(AbstractInstanceTest):
         self.assertEqual(2, self.nova.floating_ips.create.call_count,
                          "Not expected floating IPs number found.")
 
+    def test_floating_ips_released_on_failure(self):
+        self.nova.floating_ips.create.side_effect = [_mock_ip('1'),
+                                                     MockException()]
+
+        self.assertRaises(ex.ThreadException, networks.assign_floating_ips,
+                          [('1', 'pool'), ('2', 'pool')])
+
+        self.nova.floating_ips.delete.assert_called_once_with('1')
+        self.assertEqual(0, self.nova.servers.add_floating_ip.call_count)
+
+    def test_floating_ips_released_on_association_failure(self):
+        self.nova.floating_ips.create.side_effect = [_mock_ip('1'),
+                                                     _mock_ip('2')]
+
+        def add_floating_ip(instance_id, ip):
+            if instance_id == '2':
+                raise MockException()
+        self.nova.servers.add_floating_ip.side_effect = add_floating_ip
+
+        self.assertRaises(ex.ThreadException, networks.assign_floating_ips,
+                          [('1', 'pool'), ('2', 'pool')])
+
+        self.nova.floating_ips.delete.assert_called_once_with('2')
+
+    @mock.patch('sahara.context.ThreadGroup')
+    def test_floating_ips_concurrency_bounded(self, thread_group):
+        self.override_config("floating_ip_concurrency", 3)
+
+        networks._release_floating_ips([])
+
+        thread_group.assert_called_once_with(3)
+
 
 class ShutdownClusterTest(AbstractInstanceTest):
 
@@ -304,6 +338,7 @@ def _mock_ip(id):
     ip = mock.Mock()
     ip.id = id
     ip.ip = "{0}.{0}.{0}.{0}" .format(id)
+    ip.instance_id = id
 
     return ip
 
@@ -334,11 +369,12 @@ def _create_nova_mock(novaclient):
     nova.servers.create.side_effect = _mock_instances(4)
     nova.servers.get.return_value = _mock_instance(1)
     nova.floating_ips.create.side_effect = _mock_ips(4)
-    nova.floating_ips.findall.return_value = _mock_ips(1)
+    nova.floating_ips.list.return_value = _mock_ips(2)
     nova.floating_ips.delete.side_effect = _mock_deletes(2)
     images = mock.Mock()
     images.username = "root"
     nova.images.get = lambda x: images
+    nova.images.list.return_value = []
     return nova
 
 
@@ -86,15 +86,19 @@ class TestOPS(base.SaharaWithDbTestCase):
     @mock.patch('sahara.service.trusts.create_trust_for_cluster')
     @mock.patch('sahara.conductor.API.job_execution_get_all')
     @mock.patch('sahara.service.edp.job_manager.run_job')
-    def test_provision_cluster(self, p_run_job, p_job_exec, p_create_trust,
-                               p_conf, p_cluster_get, p_change_status,
-                               p_prep_provisioning, p_update_sahara_info,
+    @mock.patch('sahara.service.quotas.release')
+    def test_provision_cluster(self, p_release, p_run_job, p_job_exec,
+                               p_create_trust, p_conf, p_cluster_get,
+                               p_change_status, p_prep_provisioning,
+                               p_update_sahara_info,
                                p_change_cluster_status_desc):
         del self.SEQUENCE[:]
         ops.INFRA = FakeINFRA()
+        p_release.side_effect = lambda cluster_id: self.SEQUENCE.append(
+            'release')
         ops._provision_cluster('123')
         # checking that order of calls is right
-        self.assertEqual(['update_infra', 'create_cluster',
+        self.assertEqual(['update_infra', 'create_cluster', 'release',
                           'configure_cluster', 'start_cluster'], self.SEQUENCE,
                          'Order of calls is wrong')
 
@@ -15,25 +15,35 @@
 
 import mock
 
+from sahara import conductor as cond
+from sahara import context
 from sahara import exceptions as exc
 from sahara.service import quotas
 from sahara.tests.unit import base
 
+conductor = cond.API
 
-class TestQuotas(base.SaharaTestCase):
+
+class TestQuotas(base.SaharaWithDbTestCase):
 
     LIST_LIMITS = ['ram', 'cpu', 'instances', 'floatingips',
                    'security_groups', 'security_group_rules', 'ports',
                    'volumes', 'volume_gbs']
 
+    def _create_cluster(self, name):
+        return conductor.cluster_create(context.ctx(), {
+            'name': name, 'plugin_name': 'fake',
+            'hadoop_version': '0.1', 'status': 'Validating'})
+
     def test_get_zero_limits(self):
         res = quotas._get_zero_limits()
         self.assertEqual(9, len(res))
         for key in self.LIST_LIMITS:
             self.assertEqual(0, res[key])
 
+    @mock.patch('sahara.service.quotas._get_reservations', return_value={})
     @mock.patch('sahara.service.quotas._get_avail_limits')
-    def test_check_limits(self, mock_avail_limits):
+    def test_check_limits(self, mock_avail_limits, reservations):
         avail_limits = {}
         req_limits = {}
 
@@ -62,9 +72,10 @@ class TestQuotas(base.SaharaTestCase):
         flavor_mock = mock.Mock()
         type(flavor_mock).ram = mock.PropertyMock(return_value=4)
         type(flavor_mock).vcpus = mock.PropertyMock(return_value=2)
+        type(flavor_mock).id = mock.PropertyMock(return_value=3)
 
         flavor_get_mock = mock.Mock()
-        flavor_get_mock.get.return_value = flavor_mock
+        flavor_get_mock.list.return_value = [flavor_mock]
 
         type(nova_mock.return_value).flavors = mock.PropertyMock(
             return_value=flavor_get_mock)
@@ -97,3 +108,105 @@ class TestQuotas(base.SaharaTestCase):
 
         self.assertEqual(6, limits['security_group_rules'])
         self.assertEqual(3, limits['ports'])
+
+    @mock.patch('sahara.conductor.API.cluster_update')
+    @mock.patch('sahara.service.quotas._check_limits')
+    @mock.patch('sahara.service.quotas._get_req_cluster_limits')
+    def test_check_clusters(self, req_limits_mock, check_limits_mock,
+                            cluster_update):
+        req_limits_mock.side_effect = [
+            dict(quotas._get_zero_limits(), instances=2,
+                 security_group_rules=6),
+            dict(quotas._get_zero_limits(), instances=3,
+                 security_group_rules=5)]
+
+        self.override_config('use_neutron', False)
+        quotas.check_clusters([mock.Mock(), mock.Mock()])
+
+        self.assertEqual(1, check_limits_mock.call_count)
+        limits = check_limits_mock.call_args[0][0]
+        self.assertEqual(5, limits['instances'])
+        self.assertEqual(6, limits['security_group_rules'])
+
+    @mock.patch('sahara.service.quotas._get_avail_limits')
+    @mock.patch('sahara.service.quotas._get_req_cluster_limits')
+    def test_check_cluster_reserves(self, req_limits_mock, avail_mock):
+        avail_mock.return_value = dict(quotas._get_zero_limits(),
+                                       instances=5)
+        req_limits_mock.return_value = dict(quotas._get_zero_limits(),
+                                            instances=3)
+        cluster1 = self._create_cluster('cluster_1')
+        cluster2 = self._create_cluster('cluster_2')
+
+        quotas.check_cluster(cluster1)
+        # 3 of 5 instances are reserved by cluster_1
+        self.assertRaises(exc.QuotaException,
+                          quotas.check_cluster, cluster2)
+        self.assertIsNone(conductor.cluster_get(
+            context.ctx(), cluster2).quota_reservation)
+
+        quotas.release(cluster1.id)
+        quotas.check_cluster(cluster2)
+        quotas.release(cluster2.id)
+
+        self.override_config('quota_reservation_timeout', 0)
+        quotas.check_cluster(cluster1)
+        # the reservation expires immediately
+        quotas.check_cluster(cluster2)
+
+    @mock.patch('sahara.service.quotas._get_avail_limits')
+    @mock.patch('sahara.service.quotas._get_req_cluster_limits')
+    def test_reservation_released_when_settled(self, req_limits_mock,
+                                               avail_mock):
+        avail_mock.return_value = dict(quotas._get_zero_limits(),
+                                       instances=5)
+        req_limits_mock.return_value = dict(quotas._get_zero_limits(),
+                                            instances=3)
+        cluster1 = self._create_cluster('cluster_1')
+        cluster2 = self._create_cluster('cluster_2')
+
+        quotas.check_cluster(cluster1)
+        conductor.cluster_update(context.ctx(), cluster1,
+                                 {'status': 'Spawning'})
+        self.assertRaises(exc.QuotaException,
+                          quotas.check_cluster, cluster2)
+
+        # the instances of cluster_1 are created by another process and
+        # counted in the usage from now on
+        conductor.cluster_update(context.ctx(), cluster1,
+                                 {'status': 'Configuring'})
+        quotas.check_cluster(cluster2)
+        self.assertEqual([cluster2.id],
+                         list(quotas._get_reservations(exclude=())))
+
+    @mock.patch('sahara.service.quotas._load_avail_limits')
+    @mock.patch('sahara.service.quotas._get_req_cluster_limits')
+    def test_check_without_shared_memory(self, req_limits_mock, load_mock):
+        self.override_config('quota_usage_cache_ttl', 10)
+        load_mock.return_value = dict(quotas._get_zero_limits(),
+                                      instances=5)
+        req_limits_mock.return_value = dict(quotas._get_zero_limits(),
+                                            instances=3)
+        cluster1 = self._create_cluster('cluster_1')
+        cluster2 = self._create_cluster('cluster_2')
+
+        # the checks are made by two processes with their own caches
+        with mock.patch.object(quotas, '_USAGE', quotas.base.TTLCache()):
+            quotas.check_cluster(cluster1)
+        with mock.patch.object(quotas, '_USAGE', quotas.base.TTLCache()):
+            self.assertRaises(exc.QuotaException,
+                              quotas.check_cluster, cluster2)
+
+        # the usage cached with the reservation of cluster_1 isn't used
+        # once it's released
+        usage = quotas.base.TTLCache()
+        with mock.patch.object(quotas, '_USAGE', usage):
+            self.assertRaises(exc.QuotaException,
+                              quotas.check_cluster, cluster2)
+            self.assertEqual(3, load_mock.call_count)
+            quotas.release(cluster1.id)
+            load_mock.return_value = dict(quotas._get_zero_limits(),
+                                          instances=2)
+            self.assertRaises(exc.QuotaException,
+                              quotas.check_cluster, cluster2)
+            self.assertEqual(4, load_mock.call_count)
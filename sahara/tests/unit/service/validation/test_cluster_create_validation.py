@@ -20,6 +20,7 @@ import testtools
 from sahara import exceptions
 from sahara import main
 from sahara.service import api
+from sahara.service.validations import base as b
 from sahara.service.validations import clusters as c
 from sahara.tests.unit import base
 from sahara.tests.unit.service.validation import utils as u
@@ -109,6 +110,37 @@ class TestClusterCreateValidation(u.ValidationTestCase):
                        "used as Heat stack name")
         )
 
+    @mock.patch('sahara.service.api.get_clusters', return_value=[])
+    @mock.patch('sahara.utils.openstack.heat.client')
+    def test_cluster_unique_names_heat_stacks_listed_once(self, heat_client,
+                                                          get_clusters):
+        main.CONF.set_override('infrastructure_engine', 'heat')
+        self.addCleanup(main.CONF.clear_override, 'infrastructure_engine')
+        stack = mock.Mock(stack_name='used')
+        heat_client.return_value.stacks.list.return_value = [stack]
+
+        b.check_cluster_unique_names(['c1', 'c2', 'c3'])
+        self.assertEqual(1, heat_client.return_value.stacks.list.call_count)
+
+        self.assertRaises(exceptions.NameAlreadyExistsException,
+                          b.check_cluster_unique_names, ['c1', 'used'])
+
+    @mock.patch('sahara.utils.openstack.nova.get_registered_images')
+    @mock.patch('sahara.utils.openstack.nova.get_registered_image')
+    def test_required_image_tags_refreshed(self, get_image, get_images):
+        # the tags were added through another process, the cache is stale
+        get_image.return_value = mock.Mock(tags=[])
+        get_images.return_value = {
+            'image_id': mock.Mock(tags=['vanilla', '1.2.1'])}
+
+        b.check_required_image_tags('vanilla', '1.2.1', 'image_id')
+        get_images.assert_called_once_with(refresh=True)
+
+        get_images.return_value = {'image_id': mock.Mock(tags=['vanilla'])}
+        self.assertRaises(exceptions.InvalidReferenceException,
+                          b.check_required_image_tags,
+                          'vanilla', '1.2.1', 'image_id')
+
     def test_cluster_create_v_keypair_exists(self):
         self._assert_create_object_validation(
             data={
@@ -185,6 +185,10 @@ def start_patch(patch_templates=True):
             else:
                 return ['wrong_tag']
 
+        @property
+        def username(self):
+            return 'ubuntu'
+
     def _get_image(id):
         if id == '550e8400-e29b-41d4-a716-446655440000':
             return Image()
@@ -192,8 +196,7 @@ def start_patch(patch_templates=True):
             return Image('wrong_test')
 
     get_image.side_effect = _get_image
-    nova().images.list_registered.return_value = [Image(),
-                                                  Image(name='wrong_name')]
+    nova().images.list.return_value = [Image(), Image(name='wrong_name')]
     ng_dict = tu.make_ng_dict('ng', '42', ['namenode'], 1)
     cluster = tu.create_cluster('test', 't', 'vanilla', '1.2.1', [ng_dict],
                                 id=1, status='Active')
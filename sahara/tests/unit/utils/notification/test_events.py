@@ -0,0 +1,101 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from sahara import exceptions as ex
+from sahara.tests.unit import base
+from sahara.utils.notification import events
+
+
+class EventBusTest(base.SaharaTestCase):
+
+    def setUp(self):
+        super(EventBusTest, self).setUp()
+        self.bus = events.EventBus()
+
+    def test_publish(self):
+        with self.bus.subscribe('tenant_1') as subscription:
+            self.bus.publish('tenant_2', 'cluster.status', {})
+            self.bus.publish('tenant_1', 'cluster.status',
+                             {'status': 'Active'})
+
+            event = subscription.get(0)
+            self.assertEqual('cluster.status', event['type'])
+            self.assertEqual({'status': 'Active'}, event['body'])
+            self.assertIsNone(subscription.get(0))
+
+        self.assertEqual({}, self.bus._subscriptions)
+
+    def test_close(self):
+        subscription = self.bus.subscribe('tenant_1')
+        self.bus.close()
+
+        self.assertTrue(subscription.closed)
+        # the reader waiting for events is woken up
+        self.assertIsNone(subscription.get(0))
+        self.assertEqual({}, self.bus._subscriptions)
+
+    def test_slow_subscriber(self):
+        self.override_config('event_stream_queue_size', 2)
+        with self.bus.subscribe('tenant_1') as subscription:
+            for status in ['Validating', 'Spawning', 'Active']:
+                self.bus.publish('tenant_1', 'cluster.status',
+                                 {'status': status})
+
+            self.assertEqual('Spawning', subscription.get(0)['body']['status'])
+            self.assertEqual('Active', subscription.get(0)['body']['status'])
+
+
+class EventDeliveryTest(base.SaharaTestCase):
+
+    def setUp(self):
+        super(EventDeliveryTest, self).setUp()
+        self.addCleanup(events.setup, False)
+        self.addCleanup(setattr, events, '_LISTENER_PID', None)
+
+    def test_local(self):
+        events.setup(False)
+        with events.subscribe('tenant_1') as subscription:
+            events.publish('tenant_1', 'cluster.status', status='Active')
+            self.assertEqual({'status': 'Active'},
+                             subscription.get(0)['body'])
+
+        self.override_config('api_workers', 2)
+        self.assertRaises(ex.NotImplementedException,
+                          events.check_available)
+
+    @mock.patch('eventlet.spawn_n')
+    @mock.patch('sahara.utils.notification.events.EventListener')
+    @mock.patch('sahara.utils.rpc.RPCClient')
+    def test_fanout(self, rpc_client, listener, spawn_n):
+        self.override_config('api_workers', 2)
+        events.setup(True)
+        events.check_available()
+
+        with events.subscribe('tenant_1') as subscription:
+            events.publish('tenant_1', 'cluster.status', status='Active')
+            # the event comes back from the message bus
+            self.assertIsNone(subscription.get(0))
+
+        with events.subscribe('tenant_1'):
+            pass
+
+        rpc_client.return_value.cast.assert_called_once_with(
+            'publish', tenant_id='tenant_1', event_type='cluster.status',
+            body={'status': 'Active'}, timestamp=mock.ANY)
+        # the listener is started once per process
+        self.assertEqual(1, listener.call_count)
+        spawn_n.assert_called_once_with(listener.return_value.start)
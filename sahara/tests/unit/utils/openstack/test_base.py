@@ -13,6 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+
+from sahara import context
+from sahara import exceptions as ex
 from sahara.tests.unit import base as testbase
 from sahara.utils.openstack import base
 
@@ -44,6 +48,49 @@ class TestBase(testbase.SaharaTestCase):
         self.assertEqual("http://172.18.184.6:8774/v2",
                          base.url_for(service_catalog, "compute"))
 
+    def test_url_for_static_endpoints(self):
+        service_catalog = (
+            '[{"endpoints": '
+            '  [{"region": "RegionOne", '
+            '    "publicURL": "http://172.18.184.5:8774/v2"}], '
+            '  "type": "compute", '
+            '  "name": "nova"}]')
+
+        self.assertRaises(ex.SystemError,
+                          base.url_for, service_catalog, "orchestration")
+
+        self.override_config("static_endpoints",
+                             {"orchestration": "http://heat/%(tenant_id)s"})
+        self.assertEqual("http://heat/tenant_1",
+                         base.url_for(service_catalog, "orchestration"))
+        self.assertEqual("http://172.18.184.5:8774/v2",
+                         base.url_for(service_catalog, "compute"))
+
+        # the catalog is shared with the other tenants
+        self.setup_context(tenant_id="tenant_2")
+        self.assertEqual("http://heat/tenant_2",
+                         base.url_for(service_catalog, "orchestration"))
+
+    def test_cached_client(self):
+        build = mock.Mock(side_effect=lambda: object())
+
+        client = base.cached_client('compute', 'http://nova', build)
+        self.assertIs(client, base.cached_client('compute', 'http://nova',
+                                                 build))
+        # threads spawned by the context share its clients
+        context.set_ctx(context.ctx().clone())
+        self.assertIs(client, base.cached_client('compute', 'http://nova',
+                                                 build))
+        self.assertEqual(1, build.call_count)
+
+        self.assertIsNot(client, base.cached_client('compute',
+                                                    'http://nova2', build))
+
+        context.ctx().auth_token = 'new_token'
+        self.assertIsNot(client, base.cached_client('compute', 'http://nova',
+                                                    build))
+        self.assertEqual(3, build.call_count)
+
 
 class AuthUrlTest(testbase.SaharaTestCase):
 
@@ -55,3 +55,24 @@ class TestImages(base.SaharaTestCase):
 
             images = nova.images.list_registered(tags=['bar', 'eggs'])
             self.assertEqual(0, len(images))
+
+    @mock.patch('sahara.utils.openstack.nova.client')
+    def test_registered_images_cache(self, client):
+        self.override_config('metadata_cache_ttl', 60, group='nova')
+        self.addCleanup(nova_client.invalidate_images)
+        foo = FakeImage('foo', ['bar'], 'test')
+        foo.id = 'foo_id'
+        client().images.list.return_value = [foo]
+
+        self.assertIs(foo, nova_client.get_registered_image('foo_id'))
+        self.assertEqual([foo], nova_client.get_registered_images().list(
+            tags=['bar']))
+        self.assertEqual(1, client().images.list.call_count)
+
+        # unknown images refresh the cache
+        self.assertIsNone(nova_client.get_registered_image('spam_id'))
+        self.assertEqual(2, client().images.list.call_count)
+
+        nova_client.invalidate_images()
+        nova_client.get_registered_images()
+        self.assertEqual(3, client().images.list.call_count)
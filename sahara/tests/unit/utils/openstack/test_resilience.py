@@ -0,0 +1,87 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+from novaclient import exceptions as nova_ex
+
+from sahara import context
+from sahara.tests.unit import base as testbase
+from sahara.utils.openstack import resilience
+
+
+class TestResilience(testbase.SaharaTestCase):
+
+    def setUp(self):
+        super(TestResilience, self).setUp()
+        self.setup_context()
+        self.override_config('api_retry_count', 3)
+        resilience._BUCKETS.clear()
+        self.addCleanup(resilience._BUCKETS.clear)
+
+    def _client(self, *side_effect):
+        client = mock.Mock()
+        client.servers.get.side_effect = side_effect
+        client.servers.create.side_effect = side_effect
+        return resilience.Resilient(client, 'compute')
+
+    @mock.patch('sahara.context.sleep')
+    def test_retry_transient_errors(self, sleep):
+        client = self._client(nova_ex.OverLimit(413), 'server')
+        self.assertEqual('server', client.servers.create())
+        self.assertEqual(1, sleep.call_count)
+
+        # the server may have been created, only reads are retried
+        client = self._client(nova_ex.ClientException(500), 'server')
+        self.assertRaises(nova_ex.ClientException, client.servers.create)
+        client = self._client(nova_ex.ClientException(500), 'server')
+        self.assertEqual('server', client.servers.get('id'))
+
+        client = self._client(nova_ex.NotFound(404), 'server')
+        self.assertRaises(nova_ex.NotFound, client.servers.get, 'id')
+
+        client = self._client(*([nova_ex.ClientException(503)] * 4))
+        self.assertRaises(nova_ex.ClientException, client.servers.get, 'id')
+        self.assertEqual(5, sleep.call_count)
+
+    @mock.patch('sahara.context.sleep')
+    def test_retry_budget(self, sleep):
+        self.override_config('api_retry_budget', 2)
+        with resilience.retry_budget():
+            budget = context.current().retry_budget
+            client = self._client(nova_ex.ClientException(503), 'server')
+            self.assertEqual('server', client.servers.get('id'))
+            self.assertIs(budget, context.current().clone().retry_budget)
+
+            client = self._client(*([nova_ex.ClientException(503)] * 2))
+            self.assertRaises(nova_ex.ClientException, client.servers.get,
+                              'id')
+
+        self.assertIsNone(context.current().retry_budget)
+        self.assertEqual(0, budget.retries)
+        self.assertEqual(2, sleep.call_count)
+
+    @mock.patch('sahara.context.sleep')
+    @mock.patch('time.time')
+    def test_rate_limit(self, time, sleep):
+        self.override_config('api_rate_limits', {'compute': '2'})
+        time.return_value = 100
+        client = self._client('server', 'server', 'server', 'server')
+        for i in range(3):
+            client.servers.get('id')
+        sleep.assert_called_once_with(0.5)
+
+        time.return_value = 102
+        client.servers.get('id')
+        self.assertEqual(1, sleep.call_count)
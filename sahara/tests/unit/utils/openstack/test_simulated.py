@@ -0,0 +1,108 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+from novaclient import exceptions as nova_ex
+from oslo_serialization import jsonutils as json
+
+from sahara import exceptions as ex
+from sahara.tests.unit import base as testbase
+from sahara.utils.openstack import heat
+from sahara.utils.openstack import nova
+from sahara.utils.openstack import simulated
+from sahara.utils import simulated_remote
+
+
+class TestSimulatedCloud(testbase.SaharaTestCase):
+
+    def setUp(self):
+        super(TestSimulatedCloud, self).setUp()
+        self.override_config('enabled', True, group='simulated_cloud')
+        self.override_config('seed', 1, group='simulated_cloud')
+        simulated.reset()
+        self.addCleanup(simulated.reset)
+
+    def _image_id(self):
+        return nova.client().images.find(name='simulated').id
+
+    @mock.patch('time.time')
+    def test_server_lifecycle(self, time):
+        time.return_value = 100
+        client = nova.client()
+        server = client.servers.create('node', self._image_id(), '2')
+        self.assertEqual('BUILD', client.servers.get(server.id).status)
+
+        time.return_value = 116
+        self.assertEqual('ACTIVE', client.servers.get(server.id).status)
+        self.assertEqual('fixed',
+                         server.addresses['private'][0]['OS-EXT-IPS:type'])
+
+        client.servers.delete(server.id)
+        time.return_value = 118
+        self.assertRaises(nova_ex.NotFound, client.servers.get, server.id)
+
+    def test_remote_files(self):
+        client = nova.client()
+        server = client.servers.create('node', self._image_id(), '1')
+        instance = mock.Mock(instance_id=server.id, tenant_id='tenant_1')
+
+        with simulated_remote.SimulatedRemote(instance) as r:
+            r.write_file_to('/etc/hosts', 'hosts')
+        with simulated_remote.SimulatedRemote(instance) as r:
+            self.assertEqual('hosts', r.read_file_from('/etc/hosts'))
+
+        client.servers.delete(server.id)
+        with simulated_remote.SimulatedRemote(instance) as r:
+            self.assertEqual('', r.read_file_from('/etc/hosts'))
+
+    def test_quotas(self):
+        self.override_config('quotas', {'instances': '1'},
+                             group='simulated_cloud')
+        client = nova.client()
+        client.servers.create('node-1', self._image_id(), '1')
+        self.assertRaises(nova_ex.Forbidden, client.servers.create,
+                          'node-2', self._image_id(), '1')
+
+        limits = client.limits.get().to_dict()['absolute']
+        self.assertEqual(1, limits['maxTotalInstances'])
+        self.assertEqual(1, limits['totalInstancesUsed'])
+
+    def test_stack(self):
+        self.override_config('stack_time', 0, group='simulated_cloud')
+        template = {'resources': {
+            'server': {'type': 'OS::Nova::Server',
+                       'properties': {'name': 'server',
+                                      'image': self._image_id(),
+                                      'flavor': '1'}},
+            'volume': {'type': 'OS::Cinder::Volume',
+                       'properties': {'size': '10'}},
+            'attachment': {'type': 'OS::Cinder::VolumeAttachment',
+                           'properties': {'instance_uuid': {'Ref': 'server'},
+                                          'volume_id': {'Ref': 'volume'}}}}}
+
+        client = heat.client()
+        client.stacks.create(stack_name='cluster',
+                             template=json.dumps(template))
+        self.assertEqual('CREATE_COMPLETE',
+                         heat.get_stack('cluster').stack_status)
+
+        server = client.resources.get('cluster', 'server')
+        self.assertEqual(['attachment'], server.required_by)
+        volumes = nova.client().volumes.get_server_volumes(
+            server.physical_resource_id)
+        self.assertEqual(['/dev/vdb'], [v.device for v in volumes])
+
+        client.stacks.delete('cluster')
+        self.assertRaises(ex.NotFoundException, heat.get_stack, 'cluster')
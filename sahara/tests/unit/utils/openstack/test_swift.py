@@ -0,0 +1,97 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import swiftclient
+
+from sahara.tests.unit import base as testbase
+from sahara.utils.openstack import swift
+
+
+class TestSwift(testbase.SaharaTestCase):
+
+    def setUp(self):
+        super(TestSwift, self).setUp()
+        self.override_config('connection_pool_size', 10, group='swift')
+        swift.POOL.clear()
+        self.addCleanup(swift.POOL.clear)
+
+    @mock.patch('sahara.swift.utils.retrieve_auth_url',
+                return_value='http://keystone:5000/v2.0')
+    @mock.patch('swiftclient.Connection')
+    def test_connection_pool(self, connection, auth_url):
+        connection.side_effect = lambda **kwargs: mock.Mock()
+
+        with swift.connection('user', 'secret') as conn:
+            first = conn
+        with swift.connection('user', 'secret') as conn:
+            self.assertIs(first, conn)
+        self.assertEqual(1, connection.call_count)
+
+        # connections in use are not shared
+        with swift.connection('user', 'secret') as conn:
+            with swift.connection('user', 'secret') as another:
+                self.assertIsNot(conn, another)
+        self.assertEqual(2, connection.call_count)
+
+        # other credentials get other connections
+        with swift.connection('user', 'other') as conn:
+            self.assertNotIn(conn, [first, another])
+
+        # connections failed not because of swift are dropped
+        swift.POOL.clear()
+        try:
+            with swift.connection('user', 'secret') as conn:
+                raise swiftclient.ClientException('error')
+        except swiftclient.ClientException:
+            pass
+        with swift.connection('user', 'secret') as another:
+            self.assertIsNot(conn, another)
+
+    @mock.patch('time.time')
+    @mock.patch('sahara.swift.utils.retrieve_preauth_url',
+                return_value='http://swift:8080/v1/AUTH_tenant')
+    @mock.patch('swiftclient.Connection')
+    def test_connection_pool_limits(self, connection, preauth_url, time):
+        self.override_config('connection_pool_total_size', 2, group='swift')
+        connection.side_effect = lambda **kwargs: mock.Mock()
+        time.return_value = 0
+
+        conns = []
+        for token in ['token_1', 'token_2', 'token_3']:
+            with swift.connection_from_token(token) as conn:
+                conns.append(conn)
+
+        # the least recently used connection is closed
+        self.assertEqual(1, conns[0].close.call_count)
+        self.assertEqual(2, swift.POOL._size)
+
+        # the expired connections of other tokens are closed as well
+        time.return_value = 601
+        with swift.connection_from_token('token_4'):
+            pass
+        self.assertEqual(1, conns[1].close.call_count)
+        self.assertEqual(1, conns[2].close.call_count)
+        self.assertEqual(1, swift.POOL._size)
+
+    def test_iter_object_range(self):
+        conn = mock.Mock()
+        conn.get_object.return_value = ({}, iter(['data']))
+
+        self.assertEqual(['data'], list(swift.iter_object(
+            conn, 'container', 'object', offset=10, length=4)))
+        conn.get_object.assert_called_once_with(
+            'container', 'object', resp_chunk_size=65536,
+            headers={'Range': 'bytes=10-13'})
@@ -0,0 +1,96 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import flask
+from oslo_serialization import jsonutils as json
+from six.moves.urllib import parse as urlparse
+
+from sahara.tests.unit import base
+from sahara.utils import api as u
+
+
+class Resource(object):
+    def __init__(self, id):
+        self.id = id
+
+    def to_dict(self):
+        return {'id': self.id, 'name': 'name-%s' % self.id}
+
+
+class RenderListTest(base.SaharaTestCase):
+
+    def setUp(self):
+        super(RenderListTest, self).setUp()
+        self.app = flask.Flask('sahara.api')
+
+    def _render(self, url, res, fields=None):
+        with self.app.test_request_context(url):
+            resp = u.render_list('clusters', res, fields)
+            return json.loads(resp.get_data())
+
+    def test_next_link(self):
+        body = self._render('/v1.1/tenant/clusters?limit=2&plugin_name=fake',
+                            [Resource('1'), Resource('2')])
+
+        self.assertEqual(['1', '2'], [c['id'] for c in body['clusters']])
+        link = body['links'][0]
+        self.assertEqual('next', link['rel'])
+        url = urlparse.urlparse(link['href'])
+        self.assertEqual('/v1.1/tenant/clusters', url.path)
+        self.assertEqual({'limit': ['2'], 'marker': ['2'],
+                          'plugin_name': ['fake']},
+                         urlparse.parse_qs(url.query))
+
+    def test_next_link_replaces_marker(self):
+        body = self._render('/v1.1/tenant/clusters?limit=1&marker=1',
+                            [Resource('2')])
+
+        query = urlparse.urlparse(body['links'][0]['href']).query
+        self.assertEqual({'limit': ['1'], 'marker': ['2']},
+                         urlparse.parse_qs(query))
+
+    def test_last_page(self):
+        body = self._render('/v1.1/tenant/clusters?limit=3',
+                            [Resource('1'), Resource('2')])
+        self.assertNotIn('links', body)
+
+        body = self._render('/v1.1/tenant/clusters', [Resource('1')])
+        self.assertNotIn('links', body)
+
+    def test_fields(self):
+        body = self._render('/v1.1/tenant/clusters?fields=id',
+                            [Resource('1')], fields=['id'])
+        self.assertEqual([{'id': '1'}], body['clusters'])
+
+    def test_next_link_with_fields(self):
+        body = self._render('/v1.1/tenant/clusters?limit=1&fields=name',
+                            [Resource('1')], fields=['name'])
+
+        self.assertEqual([{'name': 'name-1'}], body['clusters'])
+        link = urlparse.urlparse(body['links'][0]['href'])
+        self.assertEqual('1', urlparse.parse_qs(link.query)['marker'][0])
+
+    def test_load_fields(self):
+        with self.app.test_request_context('/v1.1/tenant/clusters?limit=1'):
+            self.assertEqual(['name', 'id'], u.get_load_fields(['name']))
+            self.assertEqual(['id'], u.get_load_fields(['id']))
+            self.assertIsNone(u.get_load_fields(None))
+        with self.app.test_request_context('/v1.1/tenant/clusters'):
+            self.assertEqual(['name'], u.get_load_fields(['name']))
+
+    def test_invalid_limit(self):
+        body = self._render('/v1.1/tenant/clusters?limit=all',
+                            [Resource('1')])
+        self.assertNotIn('links', body)
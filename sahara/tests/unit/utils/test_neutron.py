@@ -16,10 +16,16 @@
 import mock
 import testtools
 
+from sahara import exceptions as ex
 from sahara.utils.openstack import neutron as neutron_client
 
 
 class NeutronClientTest(testtools.TestCase):
+    def setUp(self):
+        super(NeutronClientTest, self).setUp()
+        self.addCleanup(neutron_client.invalidate_router,
+                        '33b47310-b7a8-4559-bf95-45ba669a448e')
+
     @mock.patch("neutronclient.neutron.client.Client")
     def test_get_router(self, patched):
         patched.side_effect = _test_get_neutron_client
@@ -28,6 +34,28 @@ class NeutronClientTest(testtools.TestCase):
         self.assertEqual('6c4d4e32-3667-4cd4-84ea-4cc1e98d18be',
                          neutron.get_router())
 
+    @mock.patch("neutronclient.neutron.client.Client")
+    def test_get_router_cached(self, patched):
+        fake_client = FakeNeutronClient()
+        patched.return_value = fake_client
+        neutron = neutron_client.NeutronClient(
+            '33b47310-b7a8-4559-bf95-45ba669a448e', None, None, None)
+
+        with mock.patch.object(fake_client, 'list_ports',
+                               wraps=fake_client.list_ports) as list_ports:
+            neutron.get_router()
+            self.assertEqual('6c4d4e32-3667-4cd4-84ea-4cc1e98d18be',
+                             neutron.get_router())
+            self.assertEqual(1, list_ports.call_count)
+
+            neutron_client.invalidate_router(
+                '33b47310-b7a8-4559-bf95-45ba669a448e')
+            neutron.get_router()
+            self.assertEqual(2, list_ports.call_count)
+
+        unknown = neutron_client.NeutronClient('unknown', None, None, None)
+        self.assertRaises(ex.SystemError, unknown.get_router)
+
 
 def _test_get_neutron_client(api_version, *args, **kwargs):
     return FakeNeutronClient()
@@ -42,8 +70,8 @@ class FakeNeutronClient(object):
             "routes": [],
             "id": "6c4d4e32-3667-4cd4-84ea-4cc1e98d18be"}]}
 
-    def list_ports(self, device_id=None):
-        return {"ports": [
+    def list_ports(self, network_id=None, device_owner=None, fields=None):
+        ports = [
             {"status": "ACTIVE", "name": "", "admin_state_up": True,
              "network_id": "33b47310-b7a8-4559-bf95-45ba669a448e",
              "tenant_id": "903809ded3434f8d89948ee71ca9f5bb",
@@ -66,4 +94,7 @@ class FakeNeutronClient(object):
                   "ip_address": "10.0.0.1"}],
              "id": "27193ae1-142a-436c-ab41-c77b1df032a1",
              "security_groups": [],
-             "device_id": "6c4d4e32-3667-4cd4-84ea-4cc1e98d18be"}]}
+             "device_id": "6c4d4e32-3667-4cd4-84ea-4cc1e98d18be"}]
+        return {"ports": [port for port in ports
+                          if port["network_id"] == network_id and
+                          port["device_owner"] in device_owner]}
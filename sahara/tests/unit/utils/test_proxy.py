@@ -20,12 +20,15 @@ import six
 
 from sahara.service.edp import job_utils
 from sahara.tests.unit import base
+from sahara.utils import edp
 from sahara.utils import proxy as p
 
 
 class TestProxyUtils(base.SaharaWithDbTestCase):
     def setUp(self):
         super(TestProxyUtils, self).setUp()
+        p.POOL.clear()
+        self.addCleanup(p.POOL.clear)
 
     @mock.patch('sahara.conductor.API.job_get')
     @mock.patch('sahara.conductor.API.data_source_get')
@@ -99,3 +102,61 @@ class TestProxyUtils(base.SaharaWithDbTestCase):
         data_source_count.assert_called_with('dummy',
                                              id=(myid,),
                                              url='swift://%')
+
+    @mock.patch('sahara.utils.proxy.time')
+    @mock.patch('sahara.conductor.API.job_execution_get')
+    @mock.patch('sahara.utils.proxy._delete_proxy_user_with_trust')
+    @mock.patch('sahara.utils.proxy._create_proxy_user_with_trust')
+    def test_proxy_user_pool(self, create, delete, job_execution_get, time):
+        self.override_config('proxy_user_lease_time', 60)
+        time.time.return_value = 1000
+        create.side_effect = lambda username: {'proxy_username': username}
+
+        configs = p.POOL.lease(mock.Mock(id='je_1'))
+        self.assertTrue(p.is_pooled_user(configs['proxy_username']))
+        self.assertEqual(configs, p.POOL.lease(mock.Mock(id='je_2')))
+        self.assertEqual(1, create.call_count)
+
+        # a retired proxy user is deleted once its jobs are terminated
+        time.time.return_value = 1060
+        job_execution_get.return_value = mock.Mock(
+            info={'status': 'RUNNING'})
+        p.POOL.reap()
+        self.assertIn(configs['proxy_username'], p.POOL)
+        self.assertEqual(0, delete.call_count)
+
+        p.POOL.release('je_1', configs['proxy_username'])
+        job_execution_get.return_value = None
+        p.POOL.reap()
+        self.assertNotIn(configs['proxy_username'], p.POOL)
+        delete.assert_called_once_with(configs)
+
+    @mock.patch('sahara.utils.proxy._create_proxy_user_with_trust')
+    def test_proxy_user_pool_lock(self, create):
+        self.override_config('proxy_user_lease_time', 60)
+
+        def _create(username):
+            # the registry stays available during keystone calls
+            self.assertFalse(p.POOL._lock.locked())
+            return {'proxy_username': username}
+        create.side_effect = _create
+
+        configs = p.POOL.lease(mock.Mock(id='je_1'))
+        self.assertTrue(p.is_pooled_user(configs['proxy_username']))
+        self.assertEqual(1, create.call_count)
+
+    @mock.patch('sahara.utils.proxy.time')
+    @mock.patch('sahara.conductor.API.job_execution_get_all')
+    def test_zombie_pooled_users(self, job_execution_get_all, time):
+        time.time.return_value = 1000
+        users = [mock.Mock(), mock.Mock(), mock.Mock()]
+        users[0].name = 'pool_900_used'
+        users[1].name = 'pool_900_unused'
+        users[2].name = 'pool_2000_active'
+        job_execution_get_all.return_value = [mock.Mock(
+            job_configs={'proxy_configs': {
+                'proxy_username': 'pool_900_used'}})]
+
+        self.assertEqual([users[1]], p.zombie_pooled_users(users))
+        job_execution_get_all.assert_called_once_with(
+            mock.ANY, exclude_status=edp.JOB_STATUSES_TERMINATED)
@@ -168,6 +168,20 @@ class TestInstanceInteropHelper(base.SaharaTestCase):
         p_simple_exec_func.assert_any_call(
             shlex.split('ssh fakerelay nc 10.0.0.3 8080'))
 
+    # When the connection through the namespace proxy fails, the cached
+    # router of the network should be dropped.
+    @mock.patch('sahara.utils.openstack.neutron.invalidate_router')
+    def test_use_namespaces_connect_failure(self, p_invalidate):
+        self.override_config('use_floating_ips', False)
+        self.override_config('use_namespaces', True)
+        self.run_in_subprocess.side_effect = ex.SystemError('test')
+
+        instance = FakeInstance('inst2', '10.0.0.2', 'user2', 'key2')
+        remote = ssh_remote.InstanceInteropHelper(instance)
+
+        self.assertRaises(ex.SystemError, remote.execute_command, '/bin/true')
+        p_invalidate.assert_called_once_with('network1')
+
     def test_proxy_command_bad(self):
         self.override_config('proxy_command', '{bad_kw} nc {host} {port}')
 
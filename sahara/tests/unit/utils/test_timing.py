@@ -0,0 +1,81 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from sahara.tests.unit import base
+from sahara.utils import timing
+
+
+class RequestTimingTest(base.SaharaTestCase):
+
+    def setUp(self):
+        super(RequestTimingTest, self).setUp()
+        timing.STATS.clear()
+        self.addCleanup(timing.STATS.clear)
+
+    @mock.patch('time.time')
+    def test_nested_phases(self, time):
+        self.override_config('slow_request_threshold', 0)
+        time.side_effect = [0, 1, 3, 4, 10, 11, 12]
+        request_timing = timing.start('GET', '/v1.1/tenant/clusters')
+        timing.start_route('GET /clusters')
+        with timing.measure('validation'):
+            with timing.measure('conductor'):
+                pass
+        timing.finish(request_timing)
+
+        self.assertIsNone(timing.current())
+        self.assertEqual({'auth': 1, 'validation': 2, 'conductor': 6},
+                         dict(request_timing.phases))
+
+        stats = timing.get_stats()['GET /clusters']
+        self.assertEqual(1, stats['count'])
+        self.assertEqual(12000, stats['total']['p99'])
+        self.assertEqual(3000, stats['other']['max'])
+        self.assertEqual(0, stats['openstack']['p50'])
+
+    def test_measure_outside_request(self):
+        with timing.measure('conductor'):
+            pass
+
+        client = mock.Mock()
+        self.assertIs(client, timing.measured_client(client))
+
+    def test_discard(self):
+        request_timing = timing.start('GET', '/v1.1/tenant/events')
+        timing.start_route('GET /events')
+        timing.discard()
+        timing.finish(request_timing)
+
+        self.assertEqual({}, timing.get_stats())
+
+    def test_percentiles(self):
+        for i in range(1, 101):
+            timing.STATS.add('GET /clusters', i / 1000.0,
+                             dict.fromkeys(timing.PHASES + ['other'], 0))
+
+        stats = timing.get_stats()['GET /clusters']
+        self.assertEqual({'p50': 50, 'p90': 90, 'p99': 99, 'max': 100},
+                         stats['total'])
+
+    @mock.patch('sahara.utils.timing.LOG.warning')
+    def test_slow_request_log(self, warning):
+        self.override_config('slow_request_threshold', 0.5)
+        request_timing = timing.start('POST', '/v1.1/tenant/clusters')
+        request_timing.started_at -= 1
+        timing.finish(request_timing)
+
+        self.assertEqual(1, warning.call_count)
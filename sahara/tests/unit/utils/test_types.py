@@ -27,3 +27,10 @@ class TypesTestCase(testtools.TestCase):
         self.assertFalse(types.is_int('1.1'))
         self.assertFalse(types.is_int('ab'))
         self.assertFalse(types.is_int(''))
+
+    def test_select_fields(self):
+        dct = {'id': '1', 'name': 'c', 'status': 'Active'}
+        self.assertEqual({'id': '1', 'status': 'Active'},
+                         types.select_fields(dct, ['id', 'status']))
+        self.assertEqual({}, types.select_fields(dct, []))
+        self.assertIs(dct, types.select_fields(dct, None))
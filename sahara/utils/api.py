@@ -13,16 +13,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+import hashlib
 import traceback
 
 import flask
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import encodeutils
+import six
 from werkzeug import datastructures
 
 from sahara import context
 from sahara import exceptions as ex
 from sahara.i18n import _
 from sahara.i18n import _LE
+from sahara.plugins import base as plugin_base
+from sahara.utils import timing
+from sahara.utils import types
 from sahara.utils import wsgi
 
 
@@ -61,6 +69,7 @@ class Rest(flask.Blueprint):
             endpoint = options.pop('endpoint', func.__name__)
 
             def handler(**kwargs):
+                timing.start_route('%s %s' % (flask.request.method, rule))
                 context.set_ctx(None)
 
                 LOG.debug("Rest.route.decorator.handler, kwargs={kwargs}"
@@ -105,6 +114,12 @@ class Rest(flask.Blueprint):
         return decorator
 
 
+# serialized immutable objects, see serialized()
+_SERIALIZED = {}
+
+# request arguments selecting the representation of the response
+VIEW_ARGS = ['fields', 'view']
+
 RT_JSON = datastructures.MIMEAccept([("application/json", 1)])
 RT_XML = datastructures.MIMEAccept([("application/xml", 1)])
 
@@ -129,22 +144,16 @@ def _init_resp_type(file_upload):
     flask.request.file_upload = file_upload
 
 
-def render(res=None, resp_type=None, status=None, **kwargs):
-    if not res:
-        res = {}
-    if type(res) is dict:
-        res.update(kwargs)
-    elif kwargs:
-        # can't merge kwargs into the non-dict res
-        abort_and_log(500,
-                      _("Non-dict and non-empty kwargs passed to render"))
-
+def _get_status_code(status=None):
     status_code = getattr(flask.request, 'status_code', None)
     if status:
         status_code = status
     if not status_code:
         status_code = 200
+    return status_code
+
 
+def _get_serializer(resp_type=None):
     if not resp_type:
         resp_type = getattr(flask.request, 'resp_type', RT_JSON)
 
@@ -161,13 +170,183 @@ def render(res=None, resp_type=None, status=None, **kwargs):
     else:
         abort_and_log(400, _("Content type '%s' isn't supported") % resp_type)
 
-    body = serializer.serialize(res)
-    resp_type = str(resp_type)
+    return str(resp_type), serializer
+
+
+def render(res=None, resp_type=None, status=None, **kwargs):
+    if not res:
+        res = {}
+    if type(res) is dict:
+        res.update(kwargs)
+    elif kwargs:
+        # can't merge kwargs into the non-dict res
+        abort_and_log(500,
+                      _("Non-dict and non-empty kwargs passed to render"))
+
+    status_code = _get_status_code(status)
+    resp_type, serializer = _get_serializer(resp_type)
+    with timing.measure('serialization'):
+        body = serializer.serialize(res)
+
+    return flask.Response(response=body, status=status_code,
+                          mimetype=resp_type)
+
+
+def render_list(name, res, fields=None):
+    """Render the list of resources under the given name.
+
+    If fields are given, only these fields of the resources are rendered.
+    If the request asked for a limited number of resources and the page
+    is full, a link to the next page is added to the response.
+
+    JSON responses are streamed, resources are converted and serialized
+    one by one. Items of res may also be serialized JSON documents
+    returned by serialized().
+    """
+    extra = {}
+    args = get_request_args().to_dict()
+    limit = args.get('limit')
+    marker = _get_id(res[-1]) if res else None
+    if (marker is not None and limit and types.is_int(limit) and
+            len(res) >= int(limit)):
+        args['marker'] = marker
+        query = six.moves.urllib.parse.urlencode(
+            {k: encodeutils.safe_encode(v) for k, v in six.iteritems(args)})
+        extra['links'] = [{'rel': 'next',
+                           'href': '%s?%s' % (flask.request.base_url, query)}]
+
+    status_code = _get_status_code()
+    resp_type, serializer = _get_serializer()
+
+    if isinstance(serializer, wsgi.JSONDictSerializer):
+        items = (r if isinstance(r, wsgi.SerializedJSON)
+                 else types.select_fields(r.to_dict(), fields) for r in res)
+        body = serializer.serialize_list(name, items, extra)
+    else:
+        items = [jsonutils.loads(r) if isinstance(r, wsgi.SerializedJSON)
+                 else types.select_fields(r.to_dict(), fields) for r in res]
+        extra[name] = items
+        body = serializer.serialize(extra)
 
     return flask.Response(response=body, status=status_code,
                           mimetype=resp_type)
 
 
+def _get_id(resource):
+    try:
+        return resource.id
+    except (AttributeError, KeyError):
+        # resources loaded without the id field raise KeyError
+        return None
+
+
+def get_plugin_cache():
+    """Return the cache dict kept while the plugins are loaded."""
+    return plugin_base.PLUGINS.cache
+
+
+def serialized(key, build, cache=None):
+    """Return the serialized JSON form of an immutable object.
+
+    The object is built by calling build() and serialized on the first
+    call only, later calls with the same key return the cached document.
+    Documents are kept in the cache dict if it's given.
+    """
+    if cache is None:
+        cache = _SERIALIZED
+    document = cache.get(key)
+    if document is None:
+        obj = build()
+        with timing.measure('serialization'):
+            document = wsgi.SerializedJSON(
+                wsgi.JSONDictSerializer().serialize(obj))
+        cache[key] = document
+    return document
+
+
+def render_static(key, build, cache=None):
+    """Render an immutable object built by build().
+
+    JSON responses are served from the document cached by serialized()
+    with an ETag, requests with a matching If-None-Match header get an
+    empty 304 response.
+    """
+    resp_type, serializer = _get_serializer()
+    if not isinstance(serializer, wsgi.JSONDictSerializer):
+        return render(build())
+
+    document = serialized(key, build, cache)
+    resp = flask.Response(response=document, status=_get_status_code(),
+                          mimetype=resp_type)
+    resp.set_etag(document.etag)
+    return resp.make_conditional(flask.request)
+
+
+def render_events(events):
+    """Stream events as server-sent events.
+
+    None items of events are sent as comments, which keep idle
+    connections open.
+    """
+    serializer = wsgi.JSONDictSerializer()
+    # streams are open as long as the client listens
+    timing.discard()
+
+    def stream():
+        for event in events:
+            if event is None:
+                yield ': keepalive\n\n'
+            else:
+                yield 'event: %s\ndata: %s\n\n' % (
+                    event['type'], serializer.serialize(event))
+
+    return flask.Response(response=stream(), mimetype='text/event-stream',
+                          headers={'Cache-Control': 'no-cache'})
+
+
+def conditional(revision_func, **revision_args):
+    """Answer conditional GET requests of an object with 304 if possible.
+
+    The ETag of the response is built from the revision of the object
+    returned by revision_func and from the representation asked for.
+    If the If-None-Match header of the request matches it, an empty 304
+    response is returned without calling the view. revision_func should
+    be much cheaper than loading the object, e.g. it may only look up
+    the time of the latest update.
+
+    revision_args map the arguments of revision_func to the arguments of
+    the view, like in validation.check_exists.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def handler(*args, **kwargs):
+            revision = revision_func(**{
+                arg: kwargs[view_arg]
+                for arg, view_arg in six.iteritems(revision_args)})
+            if revision is None:
+                # the view reports that the object doesn't exist
+                return func(*args, **kwargs)
+
+            representation = '%s %s %s' % (
+                revision, getattr(flask.request, 'resp_type', RT_JSON),
+                flask.request.query_string)
+            etag = hashlib.md5(
+                encodeutils.safe_encode(representation)).hexdigest()
+
+            if etag in flask.request.if_none_match:
+                resp = flask.Response(status=304)
+            else:
+                resp = func(*args, **kwargs)
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag)
+            return resp
+
+        return handler
+
+    return decorator
+
+
 def request_data():
     if hasattr(flask.request, 'parsed_data'):
         return flask.request.parsed_data
@@ -201,6 +380,45 @@ def get_request_args():
     return flask.request.args
 
 
+def get_search_args():
+    """Return the request arguments which are search options.
+
+    Arguments selecting the representation of the response are skipped.
+    """
+    args = get_request_args().to_dict()
+    for arg in VIEW_ARGS:
+        args.pop(arg, None)
+    return args
+
+
+def get_fields():
+    """Return the list of fields requested by the client or None.
+
+    Fields are requested as a comma separated list, e.g.
+    ?fields=id,name,status
+    """
+    fields = get_request_args().get('fields')
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(',') if f.strip()]
+
+
+def get_load_fields(fields):
+    """Return the fields to load for a list limited to a page.
+
+    The id of the last resource is the marker of the next page, so it's
+    loaded even if the client didn't request it. render_list() renders
+    the requested fields only.
+    """
+    if fields and 'id' not in fields and get_request_args().get('limit'):
+        return fields + ['id']
+    return fields
+
+
+def is_summary_view():
+    return get_request_args().get('view') == 'summary'
+
+
 def abort_and_log(status_code, descr, exc=None):
     LOG.error(_LE("Request aborted with status code {code} and "
                   "message '{message}'").format(code=status_code,
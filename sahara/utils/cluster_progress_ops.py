@@ -24,6 +24,7 @@ from sahara import conductor as c
 from sahara.conductor import resource
 from sahara import context
 from sahara.utils import general as g
+from sahara.utils.notification import events
 
 conductor = c.API
 CONF = cfg.CONF
@@ -38,6 +39,20 @@ event_log_opts = [
 CONF.register_opts(event_log_opts)
 
 
+def _add_event(instance, step_id, successful, event_info):
+    values = {
+        'successful': successful,
+        'node_group_id': instance.node_group_id,
+        'instance_id': instance.instance_id,
+        'instance_name': instance.instance_name,
+        'event_info': event_info,
+    }
+    conductor.cluster_event_add(context.ctx(), step_id, values)
+    events.publish(context.ctx().tenant_id, 'cluster.event',
+                   cluster_id=instance.cluster_id, step_id=step_id,
+                   **values)
+
+
 def add_successful_event(instance):
     if CONF.disable_event_log:
         return
@@ -45,13 +60,7 @@ def add_successful_event(instance):
     cluster_id = instance.cluster_id
     step_id = get_current_provisioning_step(cluster_id)
     if step_id:
-        conductor.cluster_event_add(context.ctx(), step_id, {
-            'successful': True,
-            'node_group_id': instance.node_group_id,
-            'instance_id': instance.instance_id,
-            'instance_name': instance.instance_name,
-            'event_info': None,
-        })
+        _add_event(instance, step_id, True, None)
 
 
 def add_fail_event(instance, exception):
@@ -63,13 +72,7 @@ def add_fail_event(instance, exception):
     event_info = six.text_type(exception)
 
     if step_id:
-        conductor.cluster_event_add(context.ctx(), step_id, {
-            'successful': False,
-            'node_group_id': instance.node_group_id,
-            'instance_id': instance.instance_id,
-            'instance_name': instance.instance_name,
-            'event_info': event_info,
-        })
+        _add_event(instance, step_id, False, event_info)
 
 
 def add_provisioning_step(cluster_id, step_name, total):
@@ -90,6 +93,9 @@ def add_provisioning_step(cluster_id, step_name, total):
             'started_at': timeutils.utcnow(),
         })
     context.current().current_instance_info.step_id = new_step
+    events.publish(context.ctx().tenant_id, 'cluster.provision_step',
+                   cluster_id=cluster_id, step_id=new_step,
+                   step_name=step_name, step_type=step_type, total=total)
     return new_step
 
 
@@ -22,6 +22,7 @@ from sahara import conductor as c
 from sahara import context
 from sahara import exceptions as e
 from sahara.i18n import _LI
+from sahara.utils.notification import events
 from sahara.utils.notification import sender
 
 conductor = c.API
@@ -89,14 +90,17 @@ def change_cluster_status(cluster, status, status_description=None):
 
     # Update cluster status. Race conditions with deletion are still possible,
     # but this reduces probability at least.
-    cluster = conductor.cluster_get(ctx, cluster) if cluster else None
+    cluster = conductor.cluster_status_get(ctx, cluster) if cluster else None
 
     if status_description is not None:
         change_cluster_status_description(cluster, status_description)
 
+    if cluster is None:
+        return None
+
     # 'Deleting' is final and can't be changed
-    if cluster is None or cluster.status == 'Deleting':
-        return cluster
+    if cluster.status == 'Deleting':
+        return conductor.cluster_get(ctx, cluster)
 
     update_dict = {"status": status}
     cluster = conductor.cluster_update(ctx, cluster, update_dict)
@@ -107,6 +111,9 @@ def change_cluster_status(cluster, status, status_description=None):
 
     sender.notify(ctx, cluster.id, cluster.name, cluster.status,
                   "update")
+    events.publish(cluster.tenant_id, 'cluster.status',
+                   cluster_id=cluster.id, cluster_name=cluster.name,
+                   status=cluster.status)
 
     return cluster
 
@@ -118,7 +125,7 @@ def count_instances(cluster):
 def check_cluster_exists(cluster):
     ctx = context.ctx()
     # check if cluster still exists (it might have been removed)
-    cluster = conductor.cluster_get(ctx, cluster)
+    cluster = conductor.cluster_status_get(ctx, cluster)
     return cluster is not None
 
 
@@ -0,0 +1,221 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bus of cluster and job execution status events.
+
+Events are published by the code changing the statuses and delivered to
+the subscribers of the tenant owning the changed object, e.g. to the
+event streams of the REST API. If the API and the engine run in
+different processes, see setup(), the events are fanned out over the
+message bus to every process with subscribers.
+"""
+
+import os
+import socket
+
+import eventlet
+from eventlet import queue
+from oslo_config import cfg
+from oslo_log import log as logging
+import oslo_messaging as messaging
+from oslo_utils import timeutils
+
+from sahara import exceptions as ex
+from sahara.i18n import _
+from sahara.i18n import _LW
+from sahara.utils import rpc as rpc_utils
+
+
+LOG = logging.getLogger(__name__)
+
+event_stream_opts = [
+    cfg.IntOpt('event_stream_queue_size',
+               default=100,
+               help='Maximum number of events queued for a subscriber of '
+                    'the event stream, the oldest events are dropped when '
+                    'a subscriber falls behind'),
+    cfg.IntOpt('event_stream_keepalive_interval',
+               default=30,
+               help='Interval in seconds between keepalive messages sent '
+                    'to idle event stream subscribers')
+]
+
+CONF = cfg.CONF
+CONF.register_opts(event_stream_opts)
+
+TOPIC = 'sahara-events'
+
+# client fanning the events out to the API processes, see setup()
+_FANOUT = None
+
+# process the event listener was started in, see _start_listener()
+_LISTENER_PID = None
+
+
+class Subscription(object):
+    """Queue of the events of a tenant."""
+
+    def __init__(self, bus, tenant_id):
+        self.tenant_id = tenant_id
+        self._bus = bus
+        self._queue = queue.LightQueue(CONF.event_stream_queue_size)
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # don't block the publisher on a slow subscriber
+            self._queue.get_nowait()
+            self._queue.put_nowait(event)
+            LOG.debug("Event stream of tenant {tenant} fell behind, the "
+                      "oldest event was dropped".format(
+                          tenant=self.tenant_id))
+
+    def get(self, timeout=None):
+        """Return the next event or None if there is none in timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.closed = True
+        self._bus.unsubscribe(self)
+
+
+class EventBus(object):
+    def __init__(self):
+        self._subscriptions = {}
+
+    def subscribe(self, tenant_id):
+        subscription = Subscription(self, tenant_id)
+        self._subscriptions.setdefault(tenant_id, set()).add(subscription)
+        return subscription
+
+    def close(self):
+        """Close all of the subscriptions and wake their readers up."""
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+                subscription.put(None)
+
+    def unsubscribe(self, subscription):
+        subscriptions = self._subscriptions.get(subscription.tenant_id, set())
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            self._subscriptions.pop(subscription.tenant_id, None)
+
+    def publish(self, tenant_id, event_type, body, timestamp=None):
+        subscriptions = self._subscriptions.get(tenant_id)
+        if not subscriptions:
+            return
+
+        event = {'type': event_type,
+                 'timestamp': timestamp or timeutils.utcnow().isoformat(),
+                 'body': body}
+        for subscription in list(subscriptions):
+            subscription.put(event)
+
+
+BUS = EventBus()
+
+
+class EventListener(rpc_utils.RPCServer):
+    """Delivers the fanned out events to the subscribers of the process."""
+
+    def __init__(self):
+        target = messaging.Target(
+            topic=TOPIC, server='%s.%d' % (socket.gethostname(),
+                                           os.getpid()))
+        super(EventListener, self).__init__(target)
+
+    def publish(self, ctx, tenant_id, event_type, body, timestamp):
+        BUS.publish(tenant_id, event_type, body, timestamp)
+
+
+def setup(distributed):
+    """Set up the delivery of the events published by the process.
+
+    :param distributed: whether the API and the engine run in different
+                        processes, the message bus must be set up then
+    """
+    global _FANOUT
+
+    if distributed:
+        _FANOUT = rpc_utils.RPCClient(messaging.Target(topic=TOPIC,
+                                                       fanout=True))
+    else:
+        _FANOUT = None
+
+
+def check_available():
+    """Check that the subscribers of the process get all of the events.
+
+    Without the message bus, only the events published by the process
+    itself are delivered, which are all of them only if the API serves
+    the requests in the process running the engine.
+    """
+    if _FANOUT is None and CONF.api_workers > 0:
+        raise ex.NotImplementedException(
+            _("Event streams of multiple API workers without the "
+              "distributed mode"))
+
+
+def _start_listener():
+    global _LISTENER_PID
+
+    # API workers forked after setup() listen on their own
+    if _LISTENER_PID == os.getpid():
+        return
+    _LISTENER_PID = os.getpid()
+    eventlet.spawn_n(EventListener().start)
+
+
+def subscribe(tenant_id):
+    """Subscribe to the events of the tenant.
+
+    The returned subscription should be closed once it's not used.
+    """
+    if _FANOUT is not None:
+        _start_listener()
+    return BUS.subscribe(tenant_id)
+
+
+def close_subscriptions():
+    """End the event streams of the process, e.g. before it exits."""
+    BUS.close()
+
+
+def publish(tenant_id, event_type, **body):
+    """Deliver the event to the current subscribers of the tenant."""
+    timestamp = timeutils.utcnow().isoformat()
+    if _FANOUT is None:
+        BUS.publish(tenant_id, event_type, body, timestamp)
+        return
+
+    try:
+        _FANOUT.cast('publish', tenant_id=tenant_id, event_type=event_type,
+                     body=body, timestamp=timestamp)
+    except Exception as e:
+        # a status change must not fail because of its event
+        LOG.warning(_LW("Failed to publish event {type}: {error}").format(
+            type=event_type, error=e))
@@ -13,15 +13,126 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import time
+
+from eventlet import semaphore
 from oslo_config import cfg
 from oslo_serialization import jsonutils as json
+import six
 from six.moves.urllib import parse as urlparse
 
 from sahara import context
 from sahara import exceptions as ex
 from sahara.i18n import _
 
+opts = [
+    cfg.DictOpt('static_endpoints',
+                default={},
+                help='Endpoints of the services missing in the service '
+                     'catalog by service type, e.g. '
+                     'compute:http://nova:8774/v2/%(tenant_id)s. '
+                     '%(tenant_id)s is replaced with the tenant of the '
+                     'request.')
+]
+
 CONF = cfg.CONF
+CONF.register_opts(opts)
+
+# parsed service catalogs by their JSON documents, see _get_catalog()
+_CATALOGS = collections.OrderedDict()
+_CATALOGS_SIZE = 100
+
+# auth URLs by auth URI and identity API version
+_AUTH_URLS = {}
+
+
+def cached_client(service, endpoint, build):
+    """Return a client of the service of the current context.
+
+    The client is built by build() once per service, endpoint, token and
+    region, later calls in the context and in the threads spawned by it
+    reuse the client. The cache goes away with the context, so clients
+    don't outlive the token they are built with.
+    """
+    ctx = context.current()
+    key = (service, endpoint, ctx.auth_token, CONF.os_region_name)
+    clients = getattr(ctx, 'clients', None)
+    if clients is None:
+        return build()
+
+    client = clients.get(key)
+    if client is None:
+        client = build()
+        clients[key] = client
+    return client
+
+
+class TTLCache(object):
+    """Data loaded from OpenStack services, kept for a number of seconds.
+
+    Entries are grouped by kind, e.g. 'flavors', and keyed within a kind,
+    e.g. by tenant. invalidate() drops entries of a kind, entries being
+    loaded while an invalidation happens aren't stored. An entry is loaded
+    by one thread at a time, other threads wait for it.
+    """
+
+    # expired entries are purged when the cache grows over this size
+    PURGE_SIZE = 1000
+
+    def __init__(self):
+        self._entries = {}
+        self._generations = collections.defaultdict(int)
+        self._locks = collections.defaultdict(semaphore.Semaphore)
+
+    def get(self, kind, key, load, ttl):
+        """Return the cached value or the value returned by load().
+
+        Nothing is cached if ttl isn't positive.
+        """
+        if ttl <= 0:
+            return load()
+
+        value = self._get_fresh(kind, key)
+        if value is not None:
+            return value
+
+        with self._locks[(kind, key)]:
+            # the entry may have been loaded while waiting for the lock
+            value = self._get_fresh(kind, key)
+            if value is not None:
+                return value
+
+            generation = self._generations[kind]
+            value = load()
+            if self._generations[kind] == generation:
+                if len(self._entries) >= self.PURGE_SIZE:
+                    self._purge()
+                self._entries[(kind, key)] = (time.time() + ttl, value)
+            return value
+
+    def _get_fresh(self, kind, key):
+        entry = self._entries.get((kind, key))
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+        return None
+
+    def invalidate(self, kind, key=None):
+        """Drop the entry of the key or all entries of the kind."""
+        self._generations[kind] += 1
+        if key is not None:
+            self._entries.pop((kind, key), None)
+        else:
+            for entry_key in list(self._entries):
+                if entry_key[0] == kind:
+                    self._entries.pop(entry_key, None)
+
+    def _purge(self):
+        now = time.time()
+        for key, entry in list(six.iteritems(self._entries)):
+            if entry[0] <= now:
+                self._entries.pop(key, None)
+                self._locks.pop(key, None)
 
 
 def url_for(service_catalog, service_type, admin=False, endpoint_type=None):
@@ -30,15 +141,48 @@ def url_for(service_catalog, service_type, admin=False, endpoint_type=None):
     if admin:
         endpoint_type = 'adminURL'
 
-    service = _get_service_from_catalog(service_catalog, service_type)
+    return _get_catalog(service_catalog).url_for(service_type, endpoint_type)
+
+
+class ServiceCatalog(object):
+    """Service catalog of a token indexed by service type.
+
+    Endpoints are resolved once per service type, endpoint type and
+    region. Services missing in the catalog are looked up in the
+    static_endpoints option, the tenant is substituted in them on every
+    call as catalogs are shared by the tenants.
+    """
+
+    def __init__(self, catalog):
+        self._services = {}
+        for service in json.loads(catalog) if catalog else []:
+            self._services.setdefault(service['type'], service)
+        self._urls = {}
+
+    def url_for(self, service_type, endpoint_type):
+        key = (service_type, endpoint_type, CONF.os_region_name)
+        found = self._urls.get(key)
+        if found is None:
+            found = self._find_url(service_type, endpoint_type)
+            self._urls[key] = found
+
+        url, static = found
+        if static:
+            return url % {'tenant_id': context.current().tenant_id}
+        return url
+
+    def _find_url(self, service_type, endpoint_type):
+        """Return the URL and whether it's a static endpoint template."""
+        service = self._services.get(service_type)
+        if not service:
+            return _get_static_url(service_type), True
 
-    if service:
         endpoints = service['endpoints']
         if CONF.os_region_name:
             endpoints = [e for e in endpoints
                          if e['region'] == CONF.os_region_name]
         try:
-            return _get_endpoint_url(endpoints, endpoint_type)
+            return _get_endpoint_url(endpoints, endpoint_type), False
         except Exception:
             raise ex.SystemError(
                 _("Endpoint with type %(type)s is not found for service "
@@ -46,19 +190,30 @@ def url_for(service_catalog, service_type, admin=False, endpoint_type=None):
                 % {'type': endpoint_type,
                    'service': service_type})
 
-    else:
-        raise ex.SystemError(
-            _('Service "%s" not found in service catalog') % service_type)
 
+def _get_catalog(service_catalog):
+    """Return the parsed service catalog.
+
+    Catalogs are parsed once, the latest ones are kept.
+    """
+    if not isinstance(service_catalog, six.string_types):
+        return ServiceCatalog(service_catalog)
 
-def _get_service_from_catalog(catalog, service_type):
-    if catalog:
-        catalog = json.loads(catalog)
-        for service in catalog:
-            if service['type'] == service_type:
-                return service
+    catalog = _CATALOGS.pop(service_catalog, None)
+    if catalog is None:
+        catalog = ServiceCatalog(service_catalog)
+        if len(_CATALOGS) >= _CATALOGS_SIZE:
+            _CATALOGS.popitem(last=False)
+    _CATALOGS[service_catalog] = catalog
+    return catalog
 
-    return None
+
+def _get_static_url(service_type):
+    url = CONF.static_endpoints.get(service_type)
+    if not url:
+        raise ex.SystemError(
+            _('Service "%s" not found in service catalog') % service_type)
+    return url
 
 
 def _get_endpoint_url(endpoints, endpoint_type):
@@ -80,7 +235,13 @@ def _get_case_insensitive(dictionary, key):
 
 
 def retrieve_auth_url():
-    info = urlparse.urlparse(context.current().auth_uri)
+    auth_uri = context.current().auth_uri
     version = 'v3' if CONF.use_identity_api_v3 else 'v2.0'
-
-    return "%s://%s:%s/%s/" % (info.scheme, info.hostname, info.port, version)
+    key = (auth_uri, version)
+    auth_url = _AUTH_URLS.get(key)
+    if auth_url is None:
+        info = urlparse.urlparse(auth_uri)
+        auth_url = "%s://%s:%s/%s/" % (info.scheme, info.hostname, info.port,
+                                       version)
+        _AUTH_URLS[key] = auth_url
+    return auth_url
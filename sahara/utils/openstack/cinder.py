@@ -24,6 +24,9 @@ from sahara import context
 from sahara import exceptions as ex
 from sahara.i18n import _LW
 from sahara.utils.openstack import base
+from sahara.utils.openstack import resilience
+from sahara.utils.openstack import simulated
+from sahara.utils import timing
 
 
 LOG = logging.getLogger(__name__)
@@ -64,18 +67,28 @@ def validate_config():
         CONF.set_override('api_version', 2, group='cinder')
 
 
+@resilience.resilient('volume')
+@simulated.stand_in('volume')
 def client():
     ctx = context.current()
+    if CONF.cinder.api_version == 1:
+        service_type = 'volume'
+    else:
+        service_type = 'volumev2'
+    volume_url = base.url_for(ctx.service_catalog, service_type)
+    return timing.measured_client(base.cached_client(
+        service_type, volume_url, lambda: _client(ctx, volume_url)))
+
+
+def _client(ctx, volume_url):
     args = {
         'insecure': CONF.cinder.api_insecure,
         'cacert': CONF.cinder.ca_file
     }
     if CONF.cinder.api_version == 1:
-        volume_url = base.url_for(ctx.service_catalog, 'volume')
         cinder = cinder_client_v1.Client(ctx.username, ctx.auth_token,
                                          ctx.tenant_id, volume_url, **args)
     else:
-        volume_url = base.url_for(ctx.service_catalog, 'volumev2')
         cinder = cinder_client_v2.Client(ctx.username, ctx.auth_token,
                                          ctx.tenant_id, volume_url, **args)
 
@@ -86,6 +99,8 @@ def client():
 
 
 def check_cinder_exists():
+    if simulated.enabled():
+        return True
     if CONF.cinder.api_version == 1:
         service_type = 'volume'
     else:
@@ -20,6 +20,9 @@ from sahara import context
 from sahara import exceptions as ex
 from sahara.i18n import _
 from sahara.utils.openstack import base
+from sahara.utils.openstack import resilience
+from sahara.utils.openstack import simulated
+from sahara.utils import timing
 
 
 opts = [
@@ -39,12 +42,16 @@ CONF.register_group(heat_group)
 CONF.register_opts(opts, group=heat_group)
 
 
+@resilience.resilient('orchestration')
+@simulated.stand_in('orchestration')
 def client():
     ctx = context.current()
     heat_url = base.url_for(ctx.service_catalog, 'orchestration')
-    return heat_client.Client('1', heat_url, token=ctx.auth_token,
-                              cert_file=CONF.heat.ca_file,
-                              insecure=CONF.heat.api_insecure)
+    return timing.measured_client(base.cached_client(
+        'orchestration', heat_url,
+        lambda: heat_client.Client('1', heat_url, token=ctx.auth_token,
+                                   cert_file=CONF.heat.ca_file,
+                                   insecure=CONF.heat.api_insecure)))
 
 
 def get_stack(stack_name):
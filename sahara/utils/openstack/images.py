@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
 from novaclient.v2 import images
 
 from sahara import exceptions as exc
@@ -69,6 +71,35 @@ class SaharaImage(images.Image):
         return result
 
 
+class RegisteredImages(object):
+    """Images registered in Sahara indexed by id and tag."""
+
+    def __init__(self, images):
+        self._images = [i for i in images if i.username]
+        self._ids = None
+        # positions of the images by tag
+        self._tags = collections.defaultdict(set)
+        for pos, image in enumerate(self._images):
+            for tag in image.tags:
+                self._tags[tag].add(pos)
+
+    def get(self, image_id):
+        if self._ids is None:
+            self._ids = {i.id: i for i in self._images}
+        return self._ids.get(image_id)
+
+    def list(self, name=None, tags=None):
+        tags = _ensure_tags(tags)
+        images = self._images
+        if tags:
+            positions = set.intersection(*[self._tags.get(tag, set())
+                                           for tag in tags])
+            images = [images[pos] for pos in sorted(positions)]
+        if name:
+            images = [i for i in images if i.name == name]
+        return images
+
+
 class SaharaImageManager(images.ImageManager):
     """Manage :class:`SaharaImage` resources.
 
@@ -120,13 +151,7 @@ class SaharaImageManager(images.ImageManager):
         return [i for i in self.list() if set(tags).issubset(i.tags)]
 
     def list_registered(self, name=None, tags=None):
-        tags = _ensure_tags(tags)
-        images = [i for i in self.list()
-                  if i.username and set(tags).issubset(i.tags)]
-        if name:
-            return [i for i in images if i.name == name]
-        else:
-            return images
+        return RegisteredImages(self.list()).list(name, tags)
 
     def get_registered_image(self, image):
         img = self.get(image)
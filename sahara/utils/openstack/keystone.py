@@ -21,6 +21,8 @@ from oslo_config import cfg
 
 from sahara import context
 from sahara.utils.openstack import base
+from sahara.utils.openstack import resilience
+from sahara.utils.openstack import simulated
 
 
 opts = [
@@ -65,10 +67,14 @@ def client():
     '''Return the current context client.'''
     ctx = context.current()
 
-    return _client(username=ctx.username, token=ctx.auth_token,
-                   tenant_id=ctx.tenant_id)
+    return base.cached_client(
+        'identity', ctx.auth_uri,
+        lambda: _client(username=ctx.username, token=ctx.auth_token,
+                        tenant_id=ctx.tenant_id))
 
 
+@resilience.resilient('identity')
+@simulated.stand_in('identity')
 def _client(username, password=None, token=None, tenant_name=None,
             tenant_id=None, trust_id=None, domain_name=None):
 
@@ -22,6 +22,9 @@ from sahara import context
 from sahara import exceptions as ex
 from sahara.i18n import _
 from sahara.utils.openstack import base
+from sahara.utils.openstack import resilience
+from sahara.utils.openstack import simulated
+from sahara.utils import timing
 
 
 opts = [
@@ -30,7 +33,11 @@ opts = [
                 help='Allow to perform insecure SSL requests to neutron.'),
     cfg.StrOpt('ca_file',
                help='Location of ca certificates file to use for neutron '
-                    'client requests.')
+                    'client requests.'),
+    cfg.IntOpt('router_cache_ttl',
+               default=300,
+               help='Number of seconds the routers of the networks are '
+                    'cached for (0 disables the cache).')
 ]
 
 neutron_group = cfg.OptGroup(name='neutron',
@@ -42,15 +49,30 @@ CONF.register_opts(opts, group=neutron_group)
 
 LOG = logging.getLogger(__name__)
 
+# owners of the ports connecting routers to networks
+ROUTER_INTERFACE_OWNERS = ['network:router_interface',
+                           'network:router_interface_distributed']
 
+# routers of the networks shared by the threads of the process
+_ROUTERS = base.TTLCache()
+
+
+@resilience.resilient('network')
+@simulated.stand_in('network')
 def client():
     ctx = context.ctx()
+    network_url = base.url_for(ctx.service_catalog, 'network')
+    return timing.measured_client(base.cached_client(
+        'network', network_url, lambda: _client(ctx, network_url)))
+
+
+def _client(ctx, network_url):
     args = {
         'username': ctx.username,
         'tenant_name': ctx.tenant_name,
         'tenant_id': ctx.tenant_id,
         'token': ctx.auth_token,
-        'endpoint_url': base.url_for(ctx.service_catalog, 'network'),
+        'endpoint_url': network_url,
         'ca_cert': CONF.neutron.ca_file,
         'insecure': CONF.neutron.api_insecure
     }
@@ -59,39 +81,44 @@ def client():
 
 class NeutronClient(object):
     neutron = None
-    routers = {}
 
     def __init__(self, network, uri, token, tenant_name):
-        self.neutron = neutron_cli.Client('2.0',
-                                          endpoint_url=uri,
-                                          token=token,
-                                          tenant_name=tenant_name,
-                                          ca_cert=CONF.neutron.ca_file,
-                                          insecure=CONF.neutron.api_insecure)
+        self.neutron = timing.measured_client(
+            _client_for_endpoint(uri, token, tenant_name))
         self.network = network
 
     def get_router(self):
-        matching_router = NeutronClient.routers.get(self.network, None)
-        if matching_router:
-            LOG.debug('Returning cached qrouter')
-            return matching_router['id']
-
-        routers = self.neutron.list_routers()['routers']
-        for router in routers:
-            device_id = router['id']
-            ports = self.neutron.list_ports(device_id=device_id)['ports']
-            port = next((port for port in ports
-                         if port['network_id'] == self.network), None)
-            if port:
-                matching_router = router
-                NeutronClient.routers[self.network] = matching_router
-                break
-
-        if not matching_router:
+        router_id = _ROUTERS.get('router', self.network, self._find_router,
+                                 CONF.neutron.router_cache_ttl)
+        if not router_id:
             raise ex.SystemError(_('Neutron router corresponding to network '
                                    '%s is not found') % self.network)
-
-        return matching_router['id']
+        return router_id
+
+    def _find_router(self):
+        # only the router interfaces on the network are queried
+        ports = self.neutron.list_ports(
+            network_id=self.network, device_owner=ROUTER_INTERFACE_OWNERS,
+            fields=['device_id'])['ports']
+        if not ports:
+            return None
+        return ports[0]['device_id']
+
+
+@resilience.resilient('network')
+@simulated.stand_in('network')
+def _client_for_endpoint(uri, token, tenant_name):
+    return neutron_cli.Client('2.0',
+                              endpoint_url=uri,
+                              token=token,
+                              tenant_name=tenant_name,
+                              ca_cert=CONF.neutron.ca_file,
+                              insecure=CONF.neutron.api_insecure)
+
+
+def invalidate_router(network):
+    """Drop the cached router of the network, e.g. after it changed."""
+    _ROUTERS.invalidate('router', network)
 
 
 def get_private_network_cidrs(cluster):
@@ -18,8 +18,13 @@ from novaclient.v2 import client as nova_client
 from oslo_config import cfg
 
 from sahara import context
+from sahara import exceptions as ex
+from sahara.i18n import _
 import sahara.utils.openstack.base as base
 from sahara.utils.openstack import images
+from sahara.utils.openstack import resilience
+from sahara.utils.openstack import simulated
+from sahara.utils import timing
 
 
 opts = [
@@ -28,7 +33,12 @@ opts = [
                 help='Allow to perform insecure SSL requests to nova.'),
     cfg.StrOpt('ca_file',
                help='Location of ca certificates file to use for nova '
-                    'client requests.')
+                    'client requests.'),
+    cfg.IntOpt('metadata_cache_ttl',
+               default=60,
+               help='Number of seconds the flavors and the images '
+                    'registered in Sahara are cached for (0 disables the '
+                    'cache).')
 ]
 
 nova_group = cfg.OptGroup(name='nova',
@@ -39,11 +49,17 @@ CONF.register_group(nova_group)
 CONF.register_opts(opts, group=nova_group)
 
 
+@resilience.resilient('compute')
+@simulated.stand_in('compute')
 def client():
     ctx = context.current()
-    auth_url = base.retrieve_auth_url()
     compute_url = base.url_for(ctx.service_catalog, 'compute')
+    return timing.measured_client(base.cached_client(
+        'compute', compute_url, lambda: _client(ctx, compute_url)))
+
 
+def _client(ctx, compute_url):
+    auth_url = base.retrieve_auth_url()
     nova = nova_client.Client(username=ctx.username,
                               api_key=None,
                               project_id=ctx.tenant_id,
@@ -57,6 +73,57 @@ def client():
     return nova
 
 
+# flavors and registered images of the tenants
+_CACHE = base.TTLCache()
+
+
+def _get_cached(kind, load, refresh=False):
+    key = (context.current().tenant_id, CONF.os_region_name)
+    if refresh:
+        _CACHE.invalidate(kind, key)
+    return _CACHE.get(kind, key, load, CONF.nova.metadata_cache_ttl)
+
+
+def _get_flavors_by_id(refresh=False):
+    return _get_cached(
+        'flavors', lambda: {f.id: f for f in client().flavors.list()},
+        refresh)
+
+
+def get_flavor_by_id(flavor_id):
+    """Return the flavor from the cache of the flavors of the tenant.
+
+    The cache is refreshed if the flavor isn't found in it.
+    """
+    flavor = (_get_flavors_by_id().get(flavor_id) or
+              _get_flavors_by_id(refresh=True).get(flavor_id))
+    if flavor is None:
+        raise ex.NotFoundException(
+            flavor_id, _("Requested flavor '%s' not found"))
+    return flavor
+
+
+def get_registered_images(refresh=False):
+    """Return the images registered in Sahara and visible to the tenant."""
+    return _get_cached(
+        'images', lambda: images.RegisteredImages(client().images.list()),
+        refresh)
+
+
+def get_registered_image(image_id):
+    """Return the registered image or None if it isn't registered.
+
+    The cache is refreshed if the image isn't found in it.
+    """
+    return (get_registered_images().get(image_id) or
+            get_registered_images(refresh=True).get(image_id))
+
+
+def invalidate_images():
+    """Drop the cached images after registration or tags changes."""
+    _CACHE.invalidate('images')
+
+
 def get_flavors():
     return [flavor.name for flavor in client().flavors.list()]
 
@@ -0,0 +1,268 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rate limits and retries of the calls to the OpenStack services.
+
+The clients returned by the factories of sahara.utils.openstack are
+wrapped by resilient(). The calls to a service are spread by a token
+bucket of the service, the calls failing with transient errors are
+retried with an exponential backoff. The retries made by an operation,
+e.g. by a cluster provisioning, are limited by the budget the operation
+runs with, so a control plane in trouble fails the operation instead of
+being hammered further.
+"""
+
+import contextlib
+import functools
+import random
+import socket
+import time
+
+from heatclient import exc as heat_exc
+from keystoneclient import exceptions as keystone_ex
+from neutronclient.common import exceptions as neutron_ex
+from novaclient import exceptions as nova_ex
+from oslo_config import cfg
+from oslo_log import log as logging
+from requests import exceptions as requests_ex
+import six
+
+from sahara import context
+from sahara.i18n import _LW
+
+
+LOG = logging.getLogger(__name__)
+
+opts = [
+    cfg.DictOpt('api_rate_limits',
+                default={},
+                help='Maximum numbers of calls per second to the OpenStack '
+                     'services by service type, e.g. compute:20,network:20. '
+                     'Up to a second worth of calls is made at once. The '
+                     'calls to the missing services are not limited.'),
+    cfg.IntOpt('api_retry_count',
+               default=5,
+               help='Number of times a call to an OpenStack service failed '
+                    'with a transient error is retried (0 disables the '
+                    'retries).'),
+    cfg.FloatOpt('api_retry_initial_delay',
+                 default=0.5,
+                 help='Maximum number of seconds the first retry of a call '
+                      'to an OpenStack service is delayed for, the delay '
+                      'doubles with each further retry.'),
+    cfg.FloatOpt('api_retry_max_delay',
+                 default=15.0,
+                 help='Maximum number of seconds a retry of a call to an '
+                      'OpenStack service is delayed for.'),
+    cfg.IntOpt('api_retry_budget',
+               default=100,
+               help='Number of retries of the calls to the OpenStack '
+                    'services a cluster operation can make in total, '
+                    'further transient errors fail the operation.')
+]
+
+CONF = cfg.CONF
+CONF.register_opts(opts)
+
+# the service refused the request without processing it
+REJECTED_STATUSES = (409, 413, 429, 503)
+
+# the calls with names starting with these are safe to repeat
+READ_PREFIXES = ('get', 'list', 'find', 'show')
+
+# the request may or may not have reached the service
+CONNECTION_ERRORS = (socket.error,
+                     requests_ex.ConnectionError,
+                     requests_ex.Timeout,
+                     heat_exc.CommunicationError,
+                     keystone_ex.ConnectionRefused,
+                     neutron_ex.ConnectionFailed,
+                     nova_ex.ConnectionRefused)
+
+# token buckets of the services of the process
+_BUCKETS = {}
+
+
+class TokenBucket(object):
+    """Spreads the calls to a service to the given rate per second.
+
+    The calls over the rate reserve their tokens in advance and sleep
+    until the tokens are refilled, so the waiting calls are served in
+    order.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.time()
+
+    def acquire(self):
+        now = time.time()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            context.sleep(-self._tokens / self.rate)
+
+
+def _bucket(service):
+    rate = float(CONF.api_rate_limits.get(service, 0))
+    if rate <= 0:
+        return None
+
+    bucket = _BUCKETS.get(service)
+    if bucket is None or bucket.rate != rate:
+        bucket = TokenBucket(rate)
+        _BUCKETS[service] = bucket
+    return bucket
+
+
+class RetryBudget(object):
+    """Retries the calls of an operation can still make."""
+
+    def __init__(self, retries):
+        self.retries = retries
+
+    def spend(self):
+        if self.retries <= 0:
+            return False
+        self.retries -= 1
+        return True
+
+
+@contextlib.contextmanager
+def retry_budget():
+    """Run the block with a retry budget of its own.
+
+    The budget is shared by the threads spawned in the block. The calls
+    made out of such blocks, e.g. by API requests, are only limited by
+    the api_retry_count option.
+    """
+    ctx = context.current()
+    prev_budget = ctx.retry_budget
+    ctx.retry_budget = RetryBudget(CONF.api_retry_budget)
+    try:
+        yield
+    finally:
+        ctx.retry_budget = prev_budget
+
+
+def _spend_retry():
+    if not context.has_ctx():
+        return True
+    budget = getattr(context.current(), 'retry_budget', None)
+    return budget is None or budget.spend()
+
+
+def _status(e):
+    # the clients keep the HTTP status in attributes named differently
+    for attr in ('code', 'status_code', 'http_status'):
+        status = getattr(e, attr, None)
+        if isinstance(status, six.integer_types):
+            return status
+    return None
+
+
+def is_transient(e, read=False):
+    """Tell whether a call failed with the error can be retried.
+
+    The calls refused by the service are always retried. The calls which
+    may have been processed, e.g. the ones failed with a connection
+    reset, are retried only if they read.
+    """
+    status = _status(e)
+    if status in REJECTED_STATUSES:
+        return True
+    if (status is not None and status >= 500 or
+            isinstance(e, CONNECTION_ERRORS)):
+        return read
+    return False
+
+
+def _backoff(attempt, e):
+    delay = min(CONF.api_retry_max_delay,
+                CONF.api_retry_initial_delay * 2 ** attempt)
+    # full jitter spreads the retries of the calls failed together
+    delay = random.uniform(0, delay)
+
+    retry_after = getattr(e, 'retry_after', None)
+    if isinstance(retry_after, six.integer_types + (float,)):
+        delay = max(delay, min(retry_after, CONF.api_retry_max_delay))
+    return delay
+
+
+def _resilient_call(func, service, name):
+    read = name.startswith(READ_PREFIXES)
+
+    def handler(*args, **kwargs):
+        attempt = 0
+        while True:
+            bucket = _bucket(service)
+            if bucket:
+                bucket.acquire()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if (attempt >= CONF.api_retry_count or
+                        not is_transient(e, read) or not _spend_retry()):
+                    raise
+
+                delay = _backoff(attempt, e)
+                LOG.warning(_LW("Call {name} to {service} failed: {error}, "
+                                "retrying in {delay:.1f} seconds").format(
+                    name=name, service=service, error=e, delay=delay))
+            attempt += 1
+            context.sleep(delay)
+
+    return handler
+
+
+class Resilient(object):
+    """Proxy rate limiting and retrying the method calls of the client.
+
+    The managers of the client, e.g. servers of a Nova client, are
+    wrapped as well.
+    """
+
+    _plain_types = six.string_types + six.integer_types + (
+        float, bool, list, tuple, dict, set, type(None))
+
+    def __init__(self, obj, service, depth=1):
+        self._obj = obj
+        self._service = service
+        self._depth = depth
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if callable(attr):
+            return _resilient_call(attr, self._service, name)
+        if self._depth > 0 and not isinstance(attr, self._plain_types):
+            return Resilient(attr, self._service, self._depth - 1)
+        return attr
+
+
+def resilient(service):
+    """Make the calls of the clients returned by the factory resilient."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def handler(*args, **kwargs):
+            return Resilient(func(*args, **kwargs), service)
+
+        return handler
+
+    return decorator
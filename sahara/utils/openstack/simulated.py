@@ -0,0 +1,1376 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""OpenStack cloud simulated in memory of the Sahara process.
+
+If [simulated_cloud] enabled is set, the client factories of the
+sahara.utils.openstack modules return the clients of this cloud instead
+of the clients of the real services. Together with the 'simulated'
+remote and the 'fake' plugin it allows to run cluster lifecycles without
+any cloud, e.g. to load test and profile the provisioning code.
+
+The cloud models the part of the APIs used by Sahara: instances booting
+for some time, quotas of the projects, floating IPs, volumes, stacks of
+the resources of Heat templates, trusts and proxy users and objects of
+Swift. Every API call can be delayed and fail with a transient error,
+resources being created can get to the error status.
+"""
+
+import copy
+import functools
+import itertools
+import random
+import time
+import uuid
+
+from cinderclient import exceptions as cinder_ex
+from heatclient import exc as heat_exc
+from keystoneclient import exceptions as keystone_ex
+from neutronclient.common import exceptions as neutron_ex
+from novaclient import exceptions as nova_ex
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_serialization import jsonutils as json
+import six
+import swiftclient
+
+from sahara import context
+from sahara.utils.openstack import images
+
+
+LOG = logging.getLogger(__name__)
+
+opts = [
+    cfg.BoolOpt('enabled',
+                default=False,
+                help='Use the OpenStack cloud simulated in memory of the '
+                     'process instead of the real services.'),
+    cfg.IntOpt('seed',
+               help='Seed of the random delays and failures, makes the runs '
+                    'reproducible.'),
+    cfg.FloatOpt('api_latency',
+                 default=0.0,
+                 help='Time in seconds every API call takes.'),
+    cfg.FloatOpt('api_error_rate',
+                 default=0.0,
+                 help='Probability of an API call to fail with a transient '
+                      'error (HTTP 503).'),
+    cfg.FloatOpt('boot_time',
+                 default=10.0,
+                 help='Mean time in seconds instances spend booting.'),
+    cfg.FloatOpt('volume_time',
+                 default=2.0,
+                 help='Mean time in seconds volumes spend being created.'),
+    cfg.FloatOpt('stack_time',
+                 default=5.0,
+                 help='Mean time in seconds stacks spend being created, '
+                      'updated or deleted.'),
+    cfg.FloatOpt('delete_time',
+                 default=1.0,
+                 help='Mean time in seconds instances spend being deleted.'),
+    cfg.FloatOpt('failure_rate',
+                 default=0.0,
+                 help='Probability of an instance, a volume or a stack to '
+                      'get to the error status.'),
+    cfg.FloatOpt('remote_latency',
+                 default=0.0,
+                 help='Time in seconds every command executed on the '
+                      'instances by the simulated remote takes.'),
+    cfg.DictOpt('quotas',
+                default={},
+                help='Quotas of the projects, e.g. instances:100,cores:200. '
+                     'The quotas are instances, cores, ram, floating_ips, '
+                     'security_groups, security_group_rules, ports, '
+                     'volumes and gigabytes, the missing ones are '
+                     'unlimited.'),
+    cfg.ListOpt('images',
+                default=['simulated'],
+                help='Names of the images of the cloud.'),
+    cfg.StrOpt('image_username',
+               default='ubuntu',
+               help='Username the images are registered in Sahara with.'),
+    cfg.ListOpt('image_tags',
+                default=['fake', '0.1'],
+                help='Tags the images are registered in Sahara with.')
+]
+
+simulated_group = cfg.OptGroup(name='simulated_cloud',
+                               title='Simulated OpenStack cloud options')
+
+CONF = cfg.CONF
+CONF.register_group(simulated_group)
+CONF.register_opts(opts, group=simulated_group)
+
+UNLIMITED = -1
+
+# id, name, ram, vcpus, disk of the default flavors of nova
+FLAVORS = [
+    ('1', 'm1.tiny', 512, 1, 1),
+    ('2', 'm1.small', 2048, 1, 20),
+    ('3', 'm1.medium', 4096, 2, 40),
+    ('4', 'm1.large', 8192, 4, 80),
+    ('5', 'm1.xlarge', 16384, 8, 160)
+]
+
+AVAILABILITY_ZONE = 'nova'
+VOLUME_TYPE = 'lvmdriver-1'
+FLOATING_IP_POOL = 'public'
+PRIVATE_CIDR = '10.0.0.0/16'
+
+# transient error and not found errors raised by the clients of the services
+ERRORS = {
+    'compute': (lambda: nova_ex.ClientException(503, 'Service Unavailable'),
+                lambda msg: nova_ex.NotFound(404, msg)),
+    'volume': (lambda: cinder_ex.ClientException(503, 'Service Unavailable'),
+               lambda msg: cinder_ex.NotFound(404, msg)),
+    'network': (lambda: neutron_ex.NeutronClientException(
+                    message='Service Unavailable', status_code=503),
+                lambda msg: neutron_ex.NeutronClientException(
+                    message=msg, status_code=404)),
+    'orchestration': (lambda: heat_exc.HTTPServiceUnavailable(),
+                      lambda msg: heat_exc.HTTPNotFound(msg)),
+    'identity': (lambda: keystone_ex.ServiceUnavailable(),
+                 lambda msg: keystone_ex.NotFound(msg)),
+    'object-store': (lambda: swiftclient.ClientException(
+                         'Service Unavailable', http_status=503),
+                     lambda msg: swiftclient.ClientException(
+                         msg, http_status=404))
+}
+
+
+def enabled():
+    return CONF.simulated_cloud.enabled
+
+
+class Resource(object):
+    """Resource of the simulated cloud with the attributes given."""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def to_dict(self):
+        return {k: v for k, v in six.iteritems(self.__dict__)
+                if not k.startswith('_')}
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, getattr(self, 'id', ''))
+
+
+class Cloud(object):
+    def __init__(self):
+        self.random = random.Random(CONF.simulated_cloud.seed)
+        self.projects = {}
+        self.images = {}
+        self.users = {}
+        self.trusts = {}
+        self._ips = itertools.count(1)
+        for name in CONF.simulated_cloud.images:
+            self.add_image(name)
+
+    def add_image(self, name):
+        metadata = {images.PROP_USERNAME: CONF.simulated_cloud.image_username}
+        for tag in CONF.simulated_cloud.image_tags:
+            metadata[images.PROP_TAG + tag] = True
+        image_id = six.text_type(uuid.uuid5(uuid.NAMESPACE_URL, name))
+        self.images[image_id] = {'id': image_id, 'name': name,
+                                 'status': 'ACTIVE', 'metadata': metadata}
+        return image_id
+
+    def project(self, tenant_id):
+        project = self.projects.get(tenant_id)
+        if project is None:
+            project = Project(self, tenant_id)
+            self.projects[tenant_id] = project
+        return project
+
+    def api_call(self, service):
+        """Delay the API call, it could fail with a transient error."""
+        if CONF.simulated_cloud.api_latency > 0:
+            context.sleep(CONF.simulated_cloud.api_latency)
+        if self.random.random() < CONF.simulated_cloud.api_error_rate:
+            raise ERRORS[service][0]()
+
+    def not_found(self, service, msg):
+        return ERRORS[service][1](msg)
+
+    def delay(self, mean):
+        """Return the time a transition of a resource completes at."""
+        return time.time() + mean * self.random.uniform(0.5, 1.5)
+
+    def fails(self):
+        return self.random.random() < CONF.simulated_cloud.failure_rate
+
+    def next_ip(self, prefix):
+        n = next(self._ips)
+        return '%s.%d.%d' % (prefix, n // 250 % 250, n % 250 + 2)
+
+
+def _quota(name):
+    return int(CONF.simulated_cloud.quotas.get(name, UNLIMITED))
+
+
+def _new_id():
+    return six.text_type(uuid.uuid4())
+
+
+class Server(Resource):
+    @property
+    def status(self):
+        now = time.time()
+        if self._deleted_at is not None:
+            return 'DELETED'
+        if now < self._ready_at:
+            return 'BUILD'
+        return 'ERROR' if self._failed else 'ACTIVE'
+
+    @property
+    def addresses(self):
+        addresses = [{'addr': self._fixed_ip, 'version': 4,
+                      'OS-EXT-IPS:type': 'fixed'}]
+        if self._floating_ip and self.status == 'ACTIVE':
+            addresses.append({'addr': self._floating_ip, 'version': 4,
+                              'OS-EXT-IPS:type': 'floating'})
+        return {'private': addresses} if self.status == 'ACTIVE' else {}
+
+    def gone(self):
+        return (self._deleted_at is not None and
+                time.time() >= self._deleted_at)
+
+
+class Volume(Resource):
+    @property
+    def status(self):
+        if time.time() < self._ready_at:
+            return 'creating'
+        if self._failed:
+            return 'error'
+        return 'in-use' if self._server_id else 'available'
+
+    def delete(self):
+        self._project.delete_volume(self.id)
+
+
+class Stack(Resource):
+    @property
+    def stack_status(self):
+        if time.time() < self._ready_at:
+            status = 'IN_PROGRESS'
+        else:
+            status = 'FAILED' if self._failed else 'COMPLETE'
+        return '%s_%s' % (self.action, status)
+
+    @property
+    def status(self):
+        return self.stack_status.split('_', 1)[1]
+
+    def get(self):
+        # the status is always up to date
+        pass
+
+    def update(self, **kwargs):
+        self._project.update_stack(self, kwargs['template'])
+
+    def gone(self):
+        return self.action == 'DELETE' and self.status == 'COMPLETE'
+
+
+class Project(object):
+    """Resources of a project of the simulated cloud."""
+
+    def __init__(self, cloud, tenant_id):
+        self.cloud = cloud
+        self.tenant_id = tenant_id
+        self.servers = {}
+        self.volumes = {}
+        self.floating_ips = {}
+        self.security_groups = {}
+        self.server_groups = {}
+        self.ports = {}
+        self.networks = {}
+        self.stacks = {}
+        self.containers = {}
+
+    # Compute
+
+    def _servers(self):
+        return [s for s in self.servers.values() if not s.gone()]
+
+    def _check_quota(self, name, used, required, error):
+        limit = _quota(name)
+        if limit != UNLIMITED and used + required > limit:
+            raise error('Quota exceeded for %s: requested %d, but already '
+                        'used %d of %d' % (name, required, used, limit))
+
+    def usage(self):
+        servers = [s for s in self._servers() if s._deleted_at is None]
+        flavors = [self.flavor(s.flavor['id']) for s in servers]
+        return {
+            'instances': len(servers),
+            'cores': sum(f.vcpus for f in flavors),
+            'ram': sum(f.ram for f in flavors),
+            'floating_ips': len(self.floating_ips),
+            'security_groups': len(self.security_groups),
+            'security_group_rules': sum(len(g.rules) for g in
+                                        self.security_groups.values()),
+            'ports': len(self.ports),
+            'volumes': len(self.volumes),
+            'gigabytes': sum(v.size for v in self.volumes.values())
+        }
+
+    def flavor(self, flavor_id):
+        for f in FLAVORS:
+            if f[0] == six.text_type(flavor_id):
+                return Resource(id=f[0], name=f[1], ram=f[2], vcpus=f[3],
+                                disk=f[4])
+        raise self.cloud.not_found(
+            'compute', 'Flavor %s could not be found' % flavor_id)
+
+    def create_server(self, name, image, flavor, network_id=None):
+        flavor = self.flavor(flavor)
+        if image not in self.cloud.images:
+            raise self.cloud.not_found(
+                'compute', 'Image %s could not be found' % image)
+        usage = self.usage()
+        quota_error = lambda msg: nova_ex.Forbidden(403, msg)
+        self._check_quota('instances', usage['instances'], 1, quota_error)
+        self._check_quota('cores', usage['cores'], flavor.vcpus, quota_error)
+        self._check_quota('ram', usage['ram'], flavor.ram, quota_error)
+
+        server = Server(id=_new_id(), name=name, tenant_id=self.tenant_id,
+                        flavor={'id': flavor.id}, image={'id': image},
+                        _ready_at=self.cloud.delay(
+                            CONF.simulated_cloud.boot_time),
+                        _failed=self.cloud.fails(), _deleted_at=None,
+                        _fixed_ip=self.cloud.next_ip('10.0'),
+                        _floating_ip=None, _volumes={}, _files={})
+        self._purge_servers()
+        self.servers[server.id] = server
+        if network_id:
+            self.create_port(network_id, server.id, 'compute:nova',
+                             server._fixed_ip)
+        return server
+
+    def get_server(self, server_id):
+        server = self.servers.get(getattr(server_id, 'id', server_id))
+        if server is None or server.gone():
+            raise self.cloud.not_found(
+                'compute', 'Instance %s could not be found' % server_id)
+        return server
+
+    def _purge_servers(self):
+        for server_id, server in list(six.iteritems(self.servers)):
+            if server.gone():
+                del self.servers[server_id]
+
+    def server_files(self, server_id):
+        """Return the files written to the server by the remote."""
+        server = self.servers.get(server_id)
+        return server._files if server is not None else {}
+
+    def delete_server(self, server_id):
+        server = self.get_server(server_id)
+        if server._deleted_at is not None:
+            return
+        server._deleted_at = self.cloud.delay(
+            CONF.simulated_cloud.delete_time)
+        server._files.clear()
+        for ip in self.floating_ips.values():
+            if ip.instance_id == server.id:
+                ip.instance_id = None
+                ip.fixed_ip = None
+        for volume_id in list(server._volumes):
+            self.detach_volume(server.id, volume_id)
+        for port_id, port in list(self.ports.items()):
+            if port['device_id'] == server.id:
+                del self.ports[port_id]
+
+    def create_floating_ip(self, pool=None):
+        usage = self.usage()
+        self._check_quota('floating_ips', usage['floating_ips'], 1,
+                          lambda msg: nova_ex.OverLimit(413, msg))
+        ip = Resource(id=_new_id(), ip=self.cloud.next_ip('172.24'),
+                      pool=pool or FLOATING_IP_POOL, instance_id=None,
+                      fixed_ip=None)
+        self.floating_ips[ip.id] = ip
+        return ip
+
+    def get_floating_ip(self, ip_id):
+        ip = self.floating_ips.get(getattr(ip_id, 'id', ip_id))
+        if ip is None:
+            raise self.cloud.not_found(
+                'compute', 'Floating ip %s not found' % ip_id)
+        return ip
+
+    def associate_floating_ip(self, server_id, address):
+        server = self.get_server(server_id)
+        address = getattr(address, 'ip', address)
+        for ip in self.floating_ips.values():
+            if ip.ip == address:
+                ip.instance_id = server.id
+                ip.fixed_ip = server._fixed_ip
+                server._floating_ip = ip.ip
+                return
+        raise self.cloud.not_found(
+            'compute', 'Floating ip %s not found' % address)
+
+    def delete_floating_ip(self, ip_id):
+        ip = self.get_floating_ip(ip_id)
+        if ip.instance_id in self.servers:
+            self.servers[ip.instance_id]._floating_ip = None
+        del self.floating_ips[ip.id]
+
+    def create_security_group(self, name, description=''):
+        usage = self.usage()
+        self._check_quota('security_groups', usage['security_groups'], 1,
+                          lambda msg: nova_ex.OverLimit(413, msg))
+        group = Resource(id=_new_id(), name=name, description=description,
+                         tenant_id=self.tenant_id, rules=[])
+        self.security_groups[group.id] = group
+        return group
+
+    def get_security_group(self, group):
+        group = getattr(group, 'id', group)
+        for g in self.security_groups.values():
+            if group in (g.id, g.name):
+                return g
+        raise self.cloud.not_found(
+            'compute', 'Security group %s not found' % group)
+
+    def create_security_group_rule(self, group_id, protocol, from_port,
+                                   to_port, cidr):
+        group = self.get_security_group(group_id)
+        usage = self.usage()
+        self._check_quota('security_group_rules',
+                          usage['security_group_rules'], 1,
+                          lambda msg: nova_ex.OverLimit(413, msg))
+        rule = Resource(id=_new_id(), parent_group_id=group.id,
+                        ip_protocol=protocol, from_port=from_port,
+                        to_port=to_port, ip_range={'cidr': cidr})
+        group.rules.append(rule)
+        return rule
+
+    # Volumes
+
+    def create_volume(self, size, name=None, **kwargs):
+        size = int(size)
+        usage = self.usage()
+        quota_error = lambda msg: cinder_ex.OverLimit(413, msg)
+        self._check_quota('volumes', usage['volumes'], 1, quota_error)
+        self._check_quota('gigabytes', usage['gigabytes'], size, quota_error)
+        volume = Volume(id=_new_id(), size=size, name=name,
+                        display_name=name,
+                        volume_type=kwargs.get('volume_type'),
+                        availability_zone=kwargs.get('availability_zone',
+                                                     AVAILABILITY_ZONE),
+                        _ready_at=self.cloud.delay(
+                            CONF.simulated_cloud.volume_time),
+                        _failed=self.cloud.fails(), _server_id=None,
+                        _project=self)
+        self.volumes[volume.id] = volume
+        return volume
+
+    def get_volume(self, volume_id):
+        volume = self.volumes.get(getattr(volume_id, 'id', volume_id))
+        if volume is None:
+            raise self.cloud.not_found(
+                'volume', 'Volume %s could not be found' % volume_id)
+        return volume
+
+    def delete_volume(self, volume_id):
+        volume = self.get_volume(volume_id)
+        if volume._server_id:
+            raise cinder_ex.BadRequest(
+                400, 'Volume %s is attached' % volume.id)
+        del self.volumes[volume.id]
+
+    def attach_volume(self, server_id, volume_id, device=None):
+        server = self.get_server(server_id)
+        volume = self.get_volume(volume_id)
+        if volume.status != 'available':
+            raise nova_ex.BadRequest(
+                400, 'Volume %s is %s' % (volume.id, volume.status))
+        if not device:
+            device = '/dev/vd%s' % chr(ord('b') + len(server._volumes))
+        volume._server_id = server.id
+        server._volumes[volume.id] = device
+        return Resource(id=volume.id, volumeId=volume.id,
+                        serverId=server.id, device=device)
+
+    def detach_volume(self, server_id, volume_id):
+        server = self.servers.get(server_id)
+        volume = self.get_volume(volume_id)
+        if server is not None:
+            server._volumes.pop(volume.id, None)
+        volume._server_id = None
+
+    def server_volumes(self, server_id):
+        server = self.get_server(server_id)
+        return [Resource(id=volume_id, volumeId=volume_id,
+                         serverId=server.id, device=device)
+                for volume_id, device in six.iteritems(server._volumes)]
+
+    # Network
+
+    def network(self, network_id):
+        network = self.networks.get(network_id)
+        if network is None:
+            # every network requested exists and has a router
+            subnet_id = _new_id()
+            network = {'id': network_id, 'name': network_id,
+                       'subnets': [subnet_id], 'tenant_id': self.tenant_id,
+                       '_subnet': {'id': subnet_id, 'cidr': PRIVATE_CIDR,
+                                   'network_id': network_id}}
+            self.networks[network_id] = network
+            self.create_port(network_id, _new_id(),
+                             'network:router_interface', '10.0.0.1')
+        return network
+
+    def create_port(self, network_id, device_id, device_owner, ip_address):
+        usage = self.usage()
+        self._check_quota('ports', usage['ports'], 1,
+                          lambda msg: neutron_ex.NeutronClientException(
+                              message=msg, status_code=409))
+        self.network(network_id)
+        port = {'id': _new_id(), 'network_id': network_id,
+                'device_id': device_id, 'device_owner': device_owner,
+                'tenant_id': self.tenant_id,
+                'fixed_ips': [{'ip_address': ip_address}]}
+        self.ports[port['id']] = port
+        return port
+
+    def bind_port(self, port_id, server):
+        port = self.ports.get(port_id)
+        if port is None:
+            return
+        port['device_id'] = server.id
+        port['fixed_ips'] = [{'ip_address': server._fixed_ip}]
+        for ip in self.floating_ips.values():
+            if getattr(ip, '_port_id', None) == port_id:
+                self.associate_floating_ip(server.id, ip.ip)
+
+    # Orchestration
+
+    def get_stack(self, stack_id):
+        for stack in self.stacks.values():
+            if stack_id in (stack.id, stack.stack_name) and not stack.gone():
+                return stack
+        raise self.cloud.not_found(
+            'orchestration', 'The Stack (%s) could not be found' % stack_id)
+
+    def create_stack(self, stack_name, template, **kwargs):
+        for stack in self.stacks.values():
+            if stack.stack_name == stack_name and not stack.gone():
+                raise heat_exc.HTTPConflict(
+                    'The Stack (%s) already exists' % stack_name)
+        stack = Stack(id=_new_id(), stack_name=stack_name,
+                      action='CREATE', _resources={}, _project=self,
+                      _ready_at=0, _failed=False)
+        self.stacks[stack.id] = stack
+        self.update_stack(stack, template)
+        stack.action = 'CREATE'
+        return stack
+
+    def update_stack(self, stack, template):
+        if isinstance(template, six.string_types):
+            template = json.loads(template)
+        resources = template.get('resources', {})
+        stack.action = 'UPDATE'
+        stack._ready_at = self.cloud.delay(CONF.simulated_cloud.stack_time)
+        stack._failed = False
+        try:
+            for name in _deletion_order(stack._resources):
+                if name not in resources:
+                    self._delete_stack_resource(stack._resources.pop(name))
+            for name in _creation_order(resources):
+                if name not in stack._resources:
+                    stack._resources[name] = self._create_stack_resource(
+                        stack, name, resources[name])
+        except Exception as e:
+            LOG.debug("Simulated stack {stack} failed: {reason}".format(
+                stack=stack.stack_name, reason=e))
+            stack._failed = True
+        if self.cloud.fails():
+            stack._failed = True
+        _update_required_by(stack._resources, resources)
+
+    def delete_stack(self, stack_id):
+        stack = self.get_stack(stack_id)
+        for name in _deletion_order(stack._resources):
+            try:
+                self._delete_stack_resource(stack._resources[name])
+            except Exception as e:
+                LOG.debug("Simulated resource {name} of stack {stack} is "
+                          "not deleted: {reason}".format(
+                              name=name, stack=stack.stack_name, reason=e))
+        stack._resources = {}
+        stack.action = 'DELETE'
+        stack._ready_at = self.cloud.delay(CONF.simulated_cloud.stack_time)
+        stack._failed = False
+
+    def _create_stack_resource(self, stack, name, resource):
+        props = _resolve(resource.get('properties') or {}, stack._resources)
+        res_type = resource['type']
+        physical_id = _new_id()
+        if res_type == 'OS::Nova::Server':
+            networks = props.get('networks') or []
+            network_id = next((n['network'] for n in networks
+                               if n.get('network')), None)
+            server = self.create_server(props.get('name', name),
+                                        props['image'], props['flavor'],
+                                        network_id)
+            # the ports created by the template are bound to the server
+            for port_id in [n.get('port') for n in networks]:
+                self.bind_port(port_id, server)
+            physical_id = server.id
+        elif res_type == 'OS::Neutron::Port':
+            physical_id = self.create_port(props['network_id'], '',
+                                           'compute:nova', None)['id']
+        elif res_type in ('OS::Nova::FloatingIP', 'OS::Neutron::FloatingIP'):
+            ip = self.create_floating_ip(props.get('pool'))
+            ip._port_id = props.get('port_id')
+            port = self.ports.get(ip._port_id)
+            if port and port['device_id'] in self.servers:
+                self.associate_floating_ip(port['device_id'], ip.ip)
+            physical_id = ip.id
+        elif res_type == 'OS::Nova::FloatingIPAssociation':
+            ip = self.get_floating_ip(props['floating_ip'])
+            self.associate_floating_ip(props['server_id'], ip.ip)
+        elif res_type == 'OS::Cinder::Volume':
+            volume = self.create_volume(
+                props['size'], props.get('name'),
+                volume_type=props.get('volume_type'),
+                availability_zone=props.get('availability_zone',
+                                            AVAILABILITY_ZONE))
+            # heat waits for the volume to be created
+            volume._ready_at = 0
+            physical_id = volume.id
+        elif res_type == 'OS::Cinder::VolumeAttachment':
+            self.attach_volume(props['instance_uuid'], props['volume_id'],
+                               props.get('mountpoint'))
+            physical_id = props['volume_id']
+        elif res_type == 'AWS::EC2::SecurityGroup':
+            group = self.create_security_group(name)
+            for rule in props.get('SecurityGroupIngress') or []:
+                self.create_security_group_rule(
+                    group.id, rule.get('IpProtocol'), rule.get('FromPort'),
+                    rule.get('ToPort'), rule.get('CidrIp'))
+            physical_id = group.id
+        elif res_type == 'OS::Nova::ServerGroup':
+            group = Resource(id=_new_id(), name=props.get('name', name),
+                             policies=props.get('policies'), members=[])
+            self.server_groups[group.id] = group
+            physical_id = group.id
+
+        return Resource(resource_name=name, resource_type=res_type,
+                        physical_resource_id=physical_id,
+                        resource_status='CREATE_COMPLETE', required_by=[])
+
+    def _delete_stack_resource(self, resource):
+        physical_id = resource.physical_resource_id
+        res_type = resource.resource_type
+        if res_type == 'OS::Nova::Server':
+            self.delete_server(physical_id)
+        elif res_type == 'OS::Neutron::Port':
+            self.ports.pop(physical_id, None)
+        elif res_type in ('OS::Nova::FloatingIP', 'OS::Neutron::FloatingIP'):
+            self.delete_floating_ip(physical_id)
+        elif res_type == 'OS::Cinder::VolumeAttachment':
+            volume = self.get_volume(physical_id)
+            self.detach_volume(volume._server_id, volume.id)
+        elif res_type == 'OS::Cinder::Volume':
+            self.delete_volume(physical_id)
+        elif res_type == 'AWS::EC2::SecurityGroup':
+            self.security_groups.pop(physical_id, None)
+        elif res_type == 'OS::Nova::ServerGroup':
+            self.server_groups.pop(physical_id, None)
+
+
+def _refs(value):
+    """Return the names of the resources referenced by the value."""
+    if isinstance(value, dict):
+        if set(value) == {'Ref'}:
+            return [value['Ref']]
+        if set(value) == {'get_resource'}:
+            return [value['get_resource']]
+        return sum([_refs(v) for v in value.values()], [])
+    if isinstance(value, list):
+        return sum([_refs(v) for v in value], [])
+    return []
+
+
+def _resolve(value, resources):
+    """Replace the references to the resources with their physical ids."""
+    if isinstance(value, dict):
+        if set(value) in ({'Ref'}, {'get_resource'}):
+            name = list(value.values())[0]
+            return resources[name].physical_resource_id
+        return {k: _resolve(v, resources) for k, v in six.iteritems(value)}
+    if isinstance(value, list):
+        return [_resolve(v, resources) for v in value]
+    return value
+
+
+def _creation_order(resources):
+    """Sort the resources of the template so that references go first."""
+    order = []
+
+    def visit(name, path):
+        if name in order or name not in resources:
+            return
+        if name in path:
+            raise ValueError('Circular reference of resource %s' % name)
+        deps = _refs(resources[name].get('properties') or {})
+        deps += resources[name].get('depends_on') or []
+        for dep in deps:
+            visit(dep, path + [name])
+        order.append(name)
+
+    for name in sorted(resources):
+        visit(name, [])
+    return order
+
+
+# resources referencing others are deleted first
+DELETION_ORDER = [
+    'OS::Cinder::VolumeAttachment', 'OS::Nova::FloatingIPAssociation',
+    'OS::Nova::FloatingIP', 'OS::Neutron::FloatingIP', 'OS::Nova::Server',
+    'OS::Cinder::Volume', 'OS::Neutron::Port'
+]
+
+
+def _deletion_order(resources):
+    def priority(name):
+        res_type = resources[name].resource_type
+        if res_type in DELETION_ORDER:
+            return DELETION_ORDER.index(res_type)
+        return len(DELETION_ORDER)
+
+    return sorted(resources, key=priority)
+
+
+def _update_required_by(created, resources):
+    for resource in created.values():
+        resource.required_by = []
+    for name, resource in six.iteritems(resources):
+        for ref in set(_refs(resource.get('properties') or {})):
+            if ref in created and name in created:
+                created[ref].required_by.append(name)
+
+
+class Manager(object):
+    def __init__(self, client):
+        self.client = client
+        self.cloud = client.cloud
+        self.project = client.project
+
+    def _call(self):
+        self.cloud.api_call(self.client.service)
+
+
+def _find(items, kwargs, service, cloud):
+    found = [i for i in items if all(getattr(i, k, None) == v
+                                     for k, v in six.iteritems(kwargs))]
+    if not found:
+        raise cloud.not_found(service, 'No %s matching %s' % (
+            service, kwargs))
+    return found[0]
+
+
+class _Servers(Manager):
+    def create(self, name, image, flavor, nics=None, **kwargs):
+        self._call()
+        network_id = nics[0].get('net-id') if nics else None
+        return self.project.create_server(name, image, flavor, network_id)
+
+    def get(self, server):
+        self._call()
+        return self.project.get_server(server)
+
+    def list(self, *args, **kwargs):
+        self._call()
+        return self.project._servers()
+
+    def delete(self, server):
+        self._call()
+        self.project.delete_server(server)
+
+    def add_floating_ip(self, server, address, fixed_address=None):
+        self._call()
+        self.project.associate_floating_ip(server, address)
+
+
+class _Flavors(Manager):
+    def list(self, *args, **kwargs):
+        self._call()
+        return [self.project.flavor(f[0]) for f in FLAVORS]
+
+    def get(self, flavor):
+        self._call()
+        return self.project.flavor(getattr(flavor, 'id', flavor))
+
+    def find(self, **kwargs):
+        return _find(self.list(), kwargs, 'compute', self.cloud)
+
+
+class _Images(images.SaharaImageManager):
+    """Images of the simulated cloud with the Sahara extensions."""
+
+    def __init__(self, client):
+        super(_Images, self).__init__(client)
+        self.client = client
+        self.cloud = client.cloud
+
+    def _image(self, info):
+        return images.SaharaImage(self, copy.deepcopy(info), loaded=True)
+
+    def get(self, image):
+        self.cloud.api_call('compute')
+        info = self.cloud.images.get(getattr(image, 'id', image))
+        if info is None:
+            raise self.cloud.not_found(
+                'compute', 'Image %s could not be found' % image)
+        return self._image(info)
+
+    def list(self, detailed=True, limit=None):
+        self.cloud.api_call('compute')
+        return [self._image(info) for info in self.cloud.images.values()]
+
+    def find(self, **kwargs):
+        return _find(self.list(), kwargs, 'compute', self.cloud)
+
+    def set_meta(self, image, metadata):
+        self.get(image)
+        info = self.cloud.images[getattr(image, 'id', image)]
+        info['metadata'].update(metadata)
+
+    def delete_meta(self, image, keys):
+        self.get(image)
+        info = self.cloud.images[getattr(image, 'id', image)]
+        for key in keys:
+            info['metadata'].pop(key, None)
+
+
+class _Limits(Manager):
+    def get(self, *args, **kwargs):
+        self._call()
+        usage = self.project.usage()
+        if self.client.service == 'compute':
+            absolute = {
+                'maxTotalInstances': _quota('instances'),
+                'totalInstancesUsed': usage['instances'],
+                'maxTotalCores': _quota('cores'),
+                'totalCoresUsed': usage['cores'],
+                'maxTotalRAMSize': _quota('ram'),
+                'totalRAMUsed': usage['ram'],
+                'maxTotalFloatingIps': _quota('floating_ips'),
+                'totalFloatingIpsUsed': usage['floating_ips'],
+                'maxSecurityGroups': _quota('security_groups'),
+                'totalSecurityGroupsUsed': usage['security_groups'],
+                'maxSecurityGroupRules': _quota('security_group_rules')}
+        else:
+            absolute = {
+                'maxTotalVolumes': _quota('volumes'),
+                'totalVolumesUsed': usage['volumes'],
+                'maxTotalVolumeGigabytes': _quota('gigabytes'),
+                'totalGigabytesUsed': usage['gigabytes']}
+
+        limits = Resource(absolute=[Resource(name=k, value=v)
+                                    for k, v in six.iteritems(absolute)])
+        limits.to_dict = lambda: {'absolute': absolute}
+        return limits
+
+
+class _FloatingIPs(Manager):
+    def create(self, pool=None):
+        self._call()
+        return self.project.create_floating_ip(pool)
+
+    def list(self, *args, **kwargs):
+        self._call()
+        return list(self.project.floating_ips.values())
+
+    def get(self, floating_ip):
+        self._call()
+        return self.project.get_floating_ip(floating_ip)
+
+    def delete(self, floating_ip):
+        self._call()
+        self.project.delete_floating_ip(floating_ip)
+
+
+class _FloatingIPPools(Manager):
+    def list(self):
+        self._call()
+        return [Resource(name=FLOATING_IP_POOL)]
+
+
+class _SecurityGroups(Manager):
+    def create(self, name, description):
+        self._call()
+        return self.project.create_security_group(name, description)
+
+    def get(self, group):
+        self._call()
+        return self.project.get_security_group(group)
+
+    def list(self, *args, **kwargs):
+        self._call()
+        return list(self.project.security_groups.values())
+
+    def delete(self, group):
+        self._call()
+        group = self.project.get_security_group(group)
+        del self.project.security_groups[group.id]
+
+
+class _SecurityGroupRules(Manager):
+    def create(self, parent_group_id, ip_protocol=None, from_port=None,
+               to_port=None, cidr=None, group_id=None):
+        self._call()
+        return self.project.create_security_group_rule(
+            parent_group_id, ip_protocol, from_port, to_port, cidr)
+
+
+class _ServerGroups(Manager):
+    def create(self, name, policies):
+        self._call()
+        group = Resource(id=_new_id(), name=name, policies=policies,
+                         members=[])
+        self.project.server_groups[group.id] = group
+        return group
+
+    def list(self):
+        self._call()
+        return list(self.project.server_groups.values())
+
+    def findall(self, **kwargs):
+        return [g for g in self.list()
+                if all(getattr(g, k, None) == v
+                       for k, v in six.iteritems(kwargs))]
+
+    def delete(self, group_id):
+        self._call()
+        self.project.server_groups.pop(group_id, None)
+
+
+class _Keypairs(Manager):
+    def get(self, keypair):
+        # every keypair requested exists
+        self._call()
+        return Resource(id=keypair, name=keypair,
+                        public_key='ssh-rsa simulated')
+
+
+class _AvailabilityZones(Manager):
+    def list(self, *args, **kwargs):
+        self._call()
+        return [Resource(zoneName=AVAILABILITY_ZONE,
+                         zoneState={'available': True})]
+
+
+class _ServerVolumes(Manager):
+    def create_server_volume(self, server_id, volume_id, device=None):
+        self._call()
+        return self.project.attach_volume(server_id, volume_id, device)
+
+    def get_server_volumes(self, server_id):
+        self._call()
+        return self.project.server_volumes(server_id)
+
+    def delete_server_volume(self, server_id, attachment_id):
+        self._call()
+        self.project.detach_volume(server_id, attachment_id)
+
+
+class _NovaNetworks(Manager):
+    def find(self, **kwargs):
+        self._call()
+        network = self.project.network(kwargs.get('id') or
+                                       kwargs.get('label'))
+        return Resource(id=network['id'], label=network['name'],
+                        cidr=PRIVATE_CIDR)
+
+
+class _Volumes(Manager):
+    def create(self, size, name=None, display_name=None, **kwargs):
+        self._call()
+        return self.project.create_volume(size, name or display_name,
+                                          **kwargs)
+
+    def get(self, volume_id):
+        self._call()
+        return self.project.get_volume(volume_id)
+
+    def list(self, *args, **kwargs):
+        self._call()
+        return list(self.project.volumes.values())
+
+    def delete(self, volume):
+        self._call()
+        self.project.delete_volume(volume)
+
+
+class _VolumeTypes(Manager):
+    def list(self, search_opts=None):
+        self._call()
+        return [VOLUME_TYPE]
+
+
+class _Stacks(Manager):
+    def create(self, stack_name, template, **kwargs):
+        self._call()
+        stack = self.project.create_stack(stack_name, template, **kwargs)
+        return {'stack': {'id': stack.id}}
+
+    def list(self, *args, **kwargs):
+        self._call()
+        return [s for s in self.project.stacks.values() if not s.gone()]
+
+    def get(self, stack_id):
+        self._call()
+        return self.project.get_stack(stack_id)
+
+    def update(self, stack_id, **kwargs):
+        self._call()
+        self.project.get_stack(stack_id).update(**kwargs)
+
+    def delete(self, stack_id):
+        self._call()
+        self.project.delete_stack(stack_id)
+
+
+class _StackResources(Manager):
+    def get(self, stack_id, resource_name):
+        self._call()
+        stack = self.project.get_stack(stack_id)
+        resource = stack._resources.get(resource_name)
+        if resource is None:
+            raise self.cloud.not_found(
+                'orchestration', 'The Resource (%s) could not be found' %
+                resource_name)
+        return resource
+
+    def list(self, stack_id, *args, **kwargs):
+        self._call()
+        return list(self.project.get_stack(stack_id)._resources.values())
+
+
+class Client(object):
+    """Client of a service of the simulated cloud bound to a project."""
+
+    def __init__(self, cloud, service, tenant_id):
+        self.cloud = cloud
+        self.service = service
+        self.project = cloud.project(tenant_id)
+
+
+class ComputeClient(Client):
+    def __init__(self, cloud, tenant_id):
+        super(ComputeClient, self).__init__(cloud, 'compute', tenant_id)
+        self.servers = _Servers(self)
+        self.flavors = _Flavors(self)
+        self.images = _Images(self)
+        self.limits = _Limits(self)
+        self.floating_ips = _FloatingIPs(self)
+        self.floating_ip_pools = _FloatingIPPools(self)
+        self.security_groups = _SecurityGroups(self)
+        self.security_group_rules = _SecurityGroupRules(self)
+        self.server_groups = _ServerGroups(self)
+        self.keypairs = _Keypairs(self)
+        self.availability_zones = _AvailabilityZones(self)
+        self.volumes = _ServerVolumes(self)
+        self.networks = _NovaNetworks(self)
+
+
+class VolumeClient(Client):
+    def __init__(self, cloud, tenant_id):
+        super(VolumeClient, self).__init__(cloud, 'volume', tenant_id)
+        self.volumes = _Volumes(self)
+        self.volume_types = _VolumeTypes(self)
+        self.limits = _Limits(self)
+        self.availability_zones = _AvailabilityZones(self)
+
+
+def _filter(items, filters):
+    filters = {k: v for k, v in six.iteritems(filters) if k != 'fields'}
+    res = []
+    for item in items:
+        for key, value in six.iteritems(filters):
+            values = value if isinstance(value, (list, tuple)) else [value]
+            if item.get(key) not in values:
+                break
+        else:
+            res.append(item)
+    return res
+
+
+class NetworkClient(Client):
+    """Neutron client of the simulated cloud, it returns dicts."""
+
+    def __init__(self, cloud, tenant_id):
+        super(NetworkClient, self).__init__(cloud, 'network', tenant_id)
+
+    def _call(self):
+        self.cloud.api_call(self.service)
+
+    def show_network(self, network_id):
+        self._call()
+        network = self.project.network(network_id)
+        return {'network': {k: v for k, v in six.iteritems(network)
+                            if not k.startswith('_')}}
+
+    def show_subnet(self, subnet_id):
+        self._call()
+        for network in self.project.networks.values():
+            if network['_subnet']['id'] == subnet_id:
+                return {'subnet': dict(network['_subnet'])}
+        raise self.cloud.not_found('network',
+                                   'Subnet %s could not be found' % subnet_id)
+
+    def list_networks(self, **filters):
+        self._call()
+        networks = [self.show_network(n)['network']
+                    for n in self.project.networks]
+        return {'networks': _filter(networks, filters)}
+
+    def list_ports(self, **filters):
+        self._call()
+        if isinstance(filters.get('network_id'), six.string_types):
+            self.project.network(filters['network_id'])
+        return {'ports': _filter(
+            [dict(p) for p in self.project.ports.values()], filters)}
+
+    def list_floatingips(self, **filters):
+        self._call()
+        ips = []
+        for ip in self.project.floating_ips.values():
+            port_id = None
+            for port in self.project.ports.values():
+                if ip.instance_id and port['device_id'] == ip.instance_id:
+                    port_id = port['id']
+            ips.append({'id': ip.id, 'floating_ip_address': ip.ip,
+                        'fixed_ip_address': ip.fixed_ip, 'port_id': port_id,
+                        'tenant_id': self.project.tenant_id})
+        return {'floatingips': _filter(ips, filters)}
+
+    def list_security_groups(self, **filters):
+        self._call()
+        groups = [{'id': g.id, 'name': g.name,
+                   'tenant_id': self.project.tenant_id}
+                  for g in self.project.security_groups.values()]
+        return {'security_groups': _filter(groups, filters)}
+
+    def list_security_group_rules(self, **filters):
+        self._call()
+        rules = [{'id': r.id, 'security_group_id': g.id,
+                  'tenant_id': self.project.tenant_id}
+                 for g in self.project.security_groups.values()
+                 for r in g.rules]
+        return {'security_group_rules': _filter(rules, filters)}
+
+    def show_quota(self, tenant_id):
+        self._call()
+        return {'quota': {'floatingip': _quota('floating_ips'),
+                          'security_group': _quota('security_groups'),
+                          'security_group_rule': _quota(
+                              'security_group_rules'),
+                          'port': _quota('ports')}}
+
+
+class OrchestrationClient(Client):
+    def __init__(self, cloud, tenant_id):
+        super(OrchestrationClient, self).__init__(cloud, 'orchestration',
+                                                  tenant_id)
+        self.stacks = _Stacks(self)
+        self.resources = _StackResources(self)
+
+
+class _Trusts(Manager):
+    def create(self, trustor_user, trustee_user, **kwargs):
+        self._call()
+        trust = Resource(id=_new_id(), trustor_user_id=trustor_user,
+                         trustee_user_id=trustee_user, **kwargs)
+        self.cloud.trusts[trust.id] = trust
+        return trust
+
+    def delete(self, trust):
+        self._call()
+        if self.cloud.trusts.pop(getattr(trust, 'id', trust), None) is None:
+            raise self.cloud.not_found('identity',
+                                       'Could not find trust %s' % trust)
+
+
+class _Users(Manager):
+    def create(self, name, password=None, domain=None, **kwargs):
+        self._call()
+        user = Resource(id=_new_id(), name=name, domain_id=domain)
+        self.cloud.users[user.id] = user
+        return user
+
+    def list(self, domain=None, name=None, **kwargs):
+        self._call()
+        return [u for u in self.cloud.users.values()
+                if (domain is None or u.domain_id == domain) and
+                (name is None or u.name == name)]
+
+    def delete(self, user):
+        self._call()
+        if self.cloud.users.pop(getattr(user, 'id', user), None) is None:
+            raise self.cloud.not_found('identity',
+                                       'Could not find user %s' % user)
+
+
+class _Domains(Manager):
+    def list(self, name=None, **kwargs):
+        # every domain requested exists
+        self._call()
+        return [Resource(id=name or 'default', name=name or 'default')]
+
+
+class IdentityClient(Client):
+    def __init__(self, cloud, tenant_id, username=None, trust_id=None,
+                 **kwargs):
+        super(IdentityClient, self).__init__(cloud, 'identity', tenant_id)
+        self.cloud.api_call(self.service)
+        self.username = username
+        self.user_id = six.text_type(uuid.uuid5(uuid.NAMESPACE_URL,
+                                                username or ''))
+        if trust_id:
+            trust = self.cloud.trusts.get(trust_id)
+            if trust is None:
+                raise self.cloud.not_found(
+                    'identity', 'Could not find trust %s' % trust_id)
+            self.tenant_id = trust.project
+        else:
+            self.tenant_id = tenant_id
+        self.project_id = self.tenant_id
+        self.auth_token = _new_id()
+        self.management_url = 'simulated://identity'
+        self.service_catalog = Resource(catalog={'catalog': []})
+        self.trusts = _Trusts(self)
+        self.users = _Users(self)
+        self.domains = _Domains(self)
+
+
+class ObjectStoreConnection(Client):
+    """Swift connection of the simulated cloud."""
+
+    def __init__(self, cloud, tenant_id):
+        super(ObjectStoreConnection, self).__init__(cloud, 'object-store',
+                                                    tenant_id)
+        self.url = 'simulated://object-store/AUTH_%s' % tenant_id
+        self.token = _new_id()
+
+    def _call(self):
+        self.cloud.api_call(self.service)
+
+    def get_auth(self):
+        self._call()
+        return self.url, self.token
+
+    def put_container(self, container, *args, **kwargs):
+        self._call()
+        self.project.containers.setdefault(container, {})
+
+    def put_object(self, container, obj, contents, *args, **kwargs):
+        self._call()
+        if hasattr(contents, 'read'):
+            contents = contents.read()
+        self.project.containers.setdefault(container, {})[obj] = contents
+
+    def _object(self, container, obj):
+        data = self.project.containers.get(container, {}).get(obj)
+        if data is None:
+            raise self.cloud.not_found('object-store',
+                                       'Object GET failed: %s/%s' % (
+                                           container, obj))
+        return data
+
+    def head_object(self, container, obj, *args, **kwargs):
+        self._call()
+        return {'content-length': six.text_type(
+            len(self._object(container, obj)))}
+
+    def get_object(self, container, obj, resp_chunk_size=None,
+                   headers=None, **kwargs):
+        self._call()
+        data = self._object(container, obj)
+        byte_range = (headers or {}).get('Range')
+        if byte_range:
+            first, last = byte_range[len('bytes='):].split('-')
+            data = data[int(first):int(last) + 1 if last else None]
+        resp_headers = {'content-length': six.text_type(len(data))}
+        if resp_chunk_size:
+            return resp_headers, (
+                data[i:i + resp_chunk_size]
+                for i in six.moves.xrange(0, len(data), resp_chunk_size))
+        return resp_headers, data
+
+    def delete_object(self, container, obj, *args, **kwargs):
+        self._call()
+        self._object(container, obj)
+        del self.project.containers[container][obj]
+
+
+CLIENTS = {
+    'compute': ComputeClient,
+    'volume': VolumeClient,
+    'network': NetworkClient,
+    'orchestration': OrchestrationClient,
+    'identity': IdentityClient,
+    'object-store': ObjectStoreConnection
+}
+
+CLOUD = None
+
+
+def get_cloud():
+    global CLOUD
+    if CLOUD is None:
+        CLOUD = Cloud()
+    return CLOUD
+
+
+def reset():
+    """Drop all the resources of the simulated cloud."""
+    global CLOUD
+    CLOUD = None
+
+
+def client(service, **kwargs):
+    """Return the client of the service for the project of the context."""
+    tenant_id = kwargs.pop('tenant_id', None)
+    if not tenant_id and context.has_ctx():
+        tenant_id = context.current().tenant_id
+    return CLIENTS[service](get_cloud(), tenant_id, **kwargs)
+
+
+def stand_in(service):
+    """Make the client factory return the client of the simulated cloud.
+
+    Keyword arguments of the factory are passed to the identity client.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def handler(*args, **kwargs):
+            if not enabled():
+                return func(*args, **kwargs)
+            if service != 'identity':
+                kwargs = {}
+            return client(service, **kwargs)
+
+        return handler
+
+    return decorator
@@ -13,12 +13,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import contextlib
+import hashlib
+import time
+
 from oslo_config import cfg
+from oslo_utils import encodeutils
+import six
 import swiftclient
 
 from sahara.swift import swift_helper as sh
 from sahara.swift import utils as su
+from sahara.utils.openstack import base
 from sahara.utils.openstack import keystone as k
+from sahara.utils.openstack import simulated
+from sahara.utils import timing
 
 opts = [
     cfg.BoolOpt('api_insecure',
@@ -26,7 +36,29 @@ opts = [
                 help='Allow to perform insecure SSL requests to swift.'),
     cfg.StrOpt('ca_file',
                help='Location of ca certificates file to use for swift '
-                    'client requests.')
+                    'client requests.'),
+    cfg.IntOpt('connection_pool_size',
+               default=10,
+               help='Maximum number of idle authenticated connections kept '
+                    'per user and endpoint (0 disables the pool).'),
+    cfg.IntOpt('connection_pool_total_size',
+               default=100,
+               help='Maximum number of idle authenticated connections kept '
+                    'in total, the least recently used ones are closed '
+                    'first.'),
+    cfg.IntOpt('connection_pool_ttl',
+               default=600,
+               help='Time in seconds an authenticated connection is reused '
+                    'for, it should be less than the lifetime of keystone '
+                    'tokens.'),
+    cfg.IntOpt('object_metadata_cache_ttl',
+               default=30,
+               help='Time in seconds the metadata of swift objects is '
+                    'cached for (0 disables the cache).'),
+    cfg.IntOpt('download_chunk_size',
+               default=65536,
+               help='Size in bytes of the chunks swift objects are '
+                    'downloaded by.')
 ]
 
 swift_group = cfg.OptGroup(name='swift',
@@ -37,6 +69,110 @@ CONF.register_group(swift_group)
 CONF.register_opts(opts, group=swift_group)
 
 
+class ConnectionPool(object):
+    """Idle authenticated Swift connections.
+
+    Connections are pooled by the credentials and the endpoint they were
+    created for. A connection keeps the token it got on the first request
+    so reusing it saves the authentication round trip to keystone.
+    """
+
+    def __init__(self):
+        # key -> [(expires_at, connection)], the keys used least recently
+        # come first
+        self._idle = collections.OrderedDict()
+        self._size = 0
+
+    def _take(self, key):
+        idle = self._idle.pop(key, [])
+        now = time.time()
+        pooled = None
+        while idle and pooled is None:
+            expires_at, conn = idle.pop()
+            self._size -= 1
+            if expires_at > now:
+                pooled = (expires_at, conn)
+            else:
+                _close(conn)
+        if idle:
+            self._idle[key] = idle
+        return pooled
+
+    def _give_back(self, key, expires_at, conn):
+        # most keys, e.g. tokens of job executions, are never used again,
+        # so the expired connections of all keys are dropped here
+        self._purge()
+        idle = self._idle.pop(key, [])
+        if (expires_at > time.time() and
+                len(idle) < CONF.swift.connection_pool_size):
+            idle.append((expires_at, conn))
+            self._size += 1
+        else:
+            _close(conn)
+        if idle:
+            self._idle[key] = idle
+
+        while self._size > CONF.swift.connection_pool_total_size:
+            lru_key, lru_idle = next(six.iteritems(self._idle))
+            _close(lru_idle.pop(0)[1])
+            self._size -= 1
+            if not lru_idle:
+                del self._idle[lru_key]
+
+    def _purge(self):
+        now = time.time()
+        for key, idle in list(six.iteritems(self._idle)):
+            for expires_at, conn in [c for c in idle if c[0] <= now]:
+                idle.remove((expires_at, conn))
+                self._size -= 1
+                _close(conn)
+            if not idle:
+                del self._idle[key]
+
+    @staticmethod
+    def _reusable(exc):
+        # the connection is fine if swift answered the request
+        return (isinstance(exc, swiftclient.ClientException) and
+                exc.http_status is not None and exc.http_status != 401)
+
+    @contextlib.contextmanager
+    def get(self, key, connect):
+        """Yield an idle connection for the key or a new one."""
+        pooled = self._take(key)
+        if pooled is None:
+            pooled = (time.time() + CONF.swift.connection_pool_ttl,
+                      connect())
+        expires_at, conn = pooled
+
+        try:
+            yield conn
+        except Exception as e:
+            if self._reusable(e):
+                self._give_back(key, expires_at, conn)
+            raise
+        else:
+            self._give_back(key, expires_at, conn)
+
+    def clear(self):
+        for idle in six.itervalues(self._idle):
+            for expires_at, conn in idle:
+                _close(conn)
+        self._idle.clear()
+        self._size = 0
+
+
+def _close(conn):
+    # older swift clients close the connection once it's collected
+    close = getattr(conn, 'close', None)
+    if close is not None:
+        close()
+
+
+POOL = ConnectionPool()
+
+_METADATA = base.TTLCache()
+
+
 def client(username, password, trust_id=None):
     '''return a Swift client
 
@@ -53,23 +189,96 @@ def client(username, password, trust_id=None):
     :returns: A Swift client object
 
     '''
+    return timing.measured_client(_connect(username, password, trust_id))
+
+
+@simulated.stand_in('object-store')
+def _connect(username, password, trust_id=None):
     if trust_id:
         proxyclient = k.client_for_proxy_user(username, password, trust_id)
-        return client_from_token(proxyclient.auth_token)
+        return _connect_with_token(proxyclient.auth_token)
     else:
-        return swiftclient.Connection(auth_version='2.0',
-                                      cacert=CONF.swift.ca_file,
-                                      insecure=CONF.swift.api_insecure,
-                                      authurl=su.retrieve_auth_url(),
-                                      user=username,
-                                      key=password,
-                                      tenant_name=sh.retrieve_tenant())
+        return swiftclient.Connection(
+            auth_version='2.0',
+            cacert=CONF.swift.ca_file,
+            insecure=CONF.swift.api_insecure,
+            authurl=su.retrieve_auth_url(),
+            user=username,
+            key=password,
+            tenant_name=sh.retrieve_tenant())
 
 
 def client_from_token(token):
     '''return a Swift client authenticated from a token.'''
-    return swiftclient.Connection(auth_version='2.0',
-                                  cacert=CONF.swift.ca_file,
-                                  insecure=CONF.swift.api_insecure,
-                                  preauthurl=su.retrieve_preauth_url(),
-                                  preauthtoken=token)
+    return timing.measured_client(_connect_with_token(token))
+
+
+@simulated.stand_in('object-store')
+def _connect_with_token(token):
+    return swiftclient.Connection(
+        auth_version='2.0',
+        cacert=CONF.swift.ca_file,
+        insecure=CONF.swift.api_insecure,
+        preauthurl=su.retrieve_preauth_url(),
+        preauthtoken=token)
+
+
+@contextlib.contextmanager
+def connection(username, password, trust_id=None):
+    '''yield a pooled Swift client
+
+    The arguments are the same as for the client function. The client
+    must not be used outside of the with block.
+    '''
+    password_hash = hashlib.sha1(
+        encodeutils.safe_encode(password or '')).hexdigest()
+    if trust_id:
+        key = ('trust', username, password_hash, trust_id,
+               su.retrieve_preauth_url())
+    else:
+        key = ('user', username, password_hash, su.retrieve_auth_url(),
+               sh.retrieve_tenant())
+
+    with POOL.get(key, lambda: _connect(username, password,
+                                        trust_id)) as conn:
+        yield timing.measured_client(conn)
+
+
+@contextlib.contextmanager
+def connection_from_token(token):
+    '''yield a pooled Swift client authenticated from a token.'''
+    preauth_url = su.retrieve_preauth_url()
+    with POOL.get(('token', token, preauth_url),
+                  lambda: _connect_with_token(token)) as conn:
+        yield timing.measured_client(conn)
+
+
+def get_object_metadata(conn, container, obj):
+    '''return the headers of an object
+
+    The headers are cached by the storage url of the client for a short
+    time.
+    '''
+    url = conn.url or conn.get_auth()[0]
+    return _METADATA.get('object', (url, container, obj),
+                         lambda: conn.head_object(container, obj),
+                         CONF.swift.object_metadata_cache_ttl)
+
+
+def iter_object(conn, container, obj, offset=None, length=None):
+    '''download an object by chunks
+
+    :param offset: The first byte of the range to download (optional)
+    :param length: The number of bytes to download (optional)
+    :returns: An iterator over the chunks of the object or the range
+    '''
+    headers = {}
+    if offset is not None or length is not None:
+        first = offset or 0
+        last = first + length - 1 if length is not None else ''
+        headers['Range'] = 'bytes=%s-%s' % (first, last)
+
+    resp_headers, body = conn.get_object(
+        container, obj, resp_chunk_size=CONF.swift.download_chunk_size,
+        headers=headers)
+    return body
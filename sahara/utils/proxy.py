@@ -13,8 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 import uuid
 
+from eventlet import semaphore
 from oslo_config import cfg
 from oslo_log import log as logging
 import six
@@ -23,9 +25,11 @@ from sahara import conductor as c
 from sahara import context
 from sahara import exceptions as ex
 from sahara.i18n import _
+from sahara.i18n import _LW
 from sahara.service.edp import job_utils
 from sahara.service import trusts as t
 from sahara.swift import utils as su
+from sahara.utils import edp
 from sahara.utils.openstack import keystone as k
 
 
@@ -47,36 +51,239 @@ opts = [
     cfg.ListOpt('proxy_user_role_names',
                 default=['Member'],
                 help='A list of the role names that the proxy user should '
-                     'assume through trust for Swift object access.')
+                     'assume through trust for Swift object access.'),
+    cfg.IntOpt('proxy_user_lease_time',
+               default=0,
+               help='Time in seconds a proxy user and its trust are leased '
+                    'to the new job executions of the same user and '
+                    'project. Retired proxy users are deleted once the job '
+                    'executions using them are terminated. 0 creates a '
+                    'proxy user for every job execution.')
 ]
 CONF.register_opts(opts)
 
+POOLED_USER_PREFIX = 'pool_'
 
-def create_proxy_user_for_job_execution(job_execution):
-    '''Creates a proxy user and adds the credentials to the job execution
+# minimal interval in seconds between the revocations of retired proxy
+# users made by the leases
+REAP_INTERVAL = 60
+
+
+def _pooled_username(expires_at):
+    # the expiration is a part of the name to find the zombie users
+    return '{prefix}{expires}_{suffix}'.format(
+        prefix=POOLED_USER_PREFIX, expires=int(expires_at),
+        suffix=uuid.uuid4().hex[:8])
+
+
+def _pooled_user_expiration(username):
+    try:
+        return int(username[len(POOLED_USER_PREFIX):].split('_', 1)[0])
+    except ValueError:
+        return None
 
-    :param job_execution: The job execution model to update
+
+def is_pooled_user(username):
+    return bool(username) and username.startswith(POOLED_USER_PREFIX)
+
+
+class ProxyUserPool(object):
+    """Registry of the proxy users shared by job executions.
+
+    A proxy user and its trust are leased to the job executions of the
+    same user, project and roles until the lease time passes. Then the
+    proxy user is retired and it's deleted with its trust once all the
+    job executions it was leased to are terminated. The registry is local
+    to the process creating the job executions, proxy users left by the
+    processes restarted are deleted by the periodic zombie check.
+    """
+
+    def __init__(self):
+        # key -> proxy user leased to new job executions
+        self._active = {}
+        self._retired = []
+        # guards the registry, it's never held across keystone calls
+        self._lock = semaphore.Semaphore()
+        # key -> lock serializing the proxy user creations of the key
+        self._key_locks = {}
+        self._next_reap = 0
+
+    @staticmethod
+    def _key(ctx):
+        return ctx.user_id, ctx.tenant_id, tuple(sorted(ctx.roles or []))
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, semaphore.Semaphore())
+
+    def _lease_active(self, key, job_execution_id):
+        with self._lock:
+            entry = self._active.get(key)
+            if entry is not None and entry['expires_at'] <= time.time():
+                self._retired.append(self._active.pop(key))
+                entry = None
+            if entry is not None:
+                entry['job_execution_ids'].add(job_execution_id)
+            return entry
+
+    def lease(self, job_execution):
+        """Return the proxy configs of a proxy user for the job execution."""
+        self.reap_lazily()
+        key = self._key(context.ctx())
+        # only the leases of the same key wait for a proxy user creation
+        with self._key_lock(key):
+            entry = self._lease_active(key, job_execution.id)
+            if entry is None:
+                expires_at = time.time() + CONF.proxy_user_lease_time
+                entry = {'expires_at': expires_at,
+                         'proxy_configs': _create_proxy_user_with_trust(
+                             _pooled_username(expires_at)),
+                         'job_execution_ids': set([job_execution.id])}
+                with self._lock:
+                    self._active[key] = entry
+            return dict(entry['proxy_configs'])
+
+    def _entries(self):
+        return list(self._active.values()) + self._retired
+
+    def release(self, job_execution_id, username):
+        for entry in self._entries():
+            if entry['proxy_configs']['proxy_username'] == username:
+                entry['job_execution_ids'].discard(job_execution_id)
+
+    def __contains__(self, username):
+        return any(entry['proxy_configs']['proxy_username'] == username
+                   for entry in self._entries())
+
+    def reap_lazily(self):
+        if time.time() >= self._next_reap:
+            self._next_reap = time.time() + REAP_INTERVAL
+            self.reap()
+
+    def reap(self):
+        """Delete the retired proxy users not used by job executions."""
+        with self._lock:
+            now = time.time()
+            for key, entry in list(self._active.items()):
+                if entry['expires_at'] <= now:
+                    self._retired.append(self._active.pop(key))
+
+            unused = []
+            for entry in self._retired:
+                entry['job_execution_ids'] = set(
+                    je_id for je_id in entry['job_execution_ids']
+                    if not _job_execution_terminated(je_id))
+                if not entry['job_execution_ids']:
+                    unused.append(entry)
+            self._retired = [entry for entry in self._retired
+                             if entry not in unused]
+
+            for key, lock in list(self._key_locks.items()):
+                if key not in self._active and not lock.locked():
+                    del self._key_locks[key]
+
+        for entry in unused:
+            try:
+                _delete_proxy_user_with_trust(entry['proxy_configs'])
+            except Exception as e:
+                # the user is left to the zombie check
+                LOG.warning(_LW("Can't delete proxy user {username}: "
+                                "{reason}").format(
+                    username=entry['proxy_configs']['proxy_username'],
+                    reason=e))
+
+    def clear(self):
+        self._active.clear()
+        self._retired = []
+        self._key_locks.clear()
+        self._next_reap = 0
+
+
+POOL = ProxyUserPool()
+
+
+def _job_execution_terminated(job_execution_id):
+    je = conductor.job_execution_get(context.ctx(), job_execution_id)
+    return je is None or je.info['status'] in edp.JOB_STATUSES_TERMINATED
+
+
+def zombie_pooled_users(users):
+    '''Return the pooled proxy users left by the restarted processes.
+
+    The proxy users in the registry of this process are deleted by it. A
+    proxy user is not leased after its expiration, once it's expired it's
+    a zombie if no job execution in progress uses it.
+
+    :param users: The users of the proxy domain.
+    :returns: A list of the zombie users.
 
     '''
-    username = 'job_{0}'.format(job_execution.id)
+    now = time.time()
+    expired = []
+    for user in users:
+        if not is_pooled_user(user.name) or user.name in POOL:
+            continue
+        expires_at = _pooled_user_expiration(user.name)
+        if expires_at is not None and expires_at <= now:
+            expired.append(user)
+    if not expired:
+        return []
+
+    in_use = set()
+    for je in conductor.job_execution_get_all(
+            context.ctx(), exclude_status=edp.JOB_STATUSES_TERMINATED):
+        proxy_configs = je.job_configs.get('proxy_configs') or {}
+        in_use.add(proxy_configs.get('proxy_username'))
+    return [user for user in expired if user.name not in in_use]
+
+
+def _create_proxy_user_with_trust(username):
     password = proxy_user_create(username)
     current_user = k.client()
     proxy_user = k.client_for_proxy_user(username, password)
     trust_id = t.create_trust(trustor=current_user,
                               trustee=proxy_user,
                               role_names=CONF.proxy_user_role_names)
-    update = {'job_configs': job_execution.job_configs.to_dict()}
-    update['job_configs']['proxy_configs'] = {
+    return {
         'proxy_username': username,
         'proxy_password': password,
         'proxy_trust_id': trust_id
         }
+
+
+def _delete_proxy_user_with_trust(proxy_configs):
+    proxy_username = proxy_configs.get('proxy_username')
+    proxy_password = proxy_configs.get('proxy_password')
+    proxy_trust_id = proxy_configs.get('proxy_trust_id')
+    proxy_user = k.client_for_proxy_user(proxy_username,
+                                         proxy_password,
+                                         proxy_trust_id)
+    t.delete_trust(proxy_user, proxy_trust_id)
+    proxy_user_delete(proxy_username)
+
+
+def create_proxy_user_for_job_execution(job_execution):
+    '''Creates a proxy user and adds the credentials to the job execution
+
+    :param job_execution: The job execution model to update
+
+    '''
+    if CONF.proxy_user_lease_time > 0:
+        proxy_configs = POOL.lease(job_execution)
+    else:
+        proxy_configs = _create_proxy_user_with_trust(
+            'job_{0}'.format(job_execution.id))
+    update = {'job_configs': job_execution.job_configs.to_dict()}
+    update['job_configs']['proxy_configs'] = proxy_configs
     conductor.job_execution_update(context.ctx(), job_execution, update)
 
 
 def delete_proxy_user_for_job_execution(job_execution):
     '''Delete a proxy user based on a JobExecution
 
+    A pooled proxy user is only released, it's deleted once it's retired
+    and not used by other job executions.
+
     :param job_execution: The job execution with proxy user information
     :returns: An updated job_configs dictionary or None
 
@@ -84,13 +291,10 @@ def delete_proxy_user_for_job_execution(job_execution):
     proxy_configs = job_execution.job_configs.get('proxy_configs')
     if proxy_configs is not None:
         proxy_username = proxy_configs.get('proxy_username')
-        proxy_password = proxy_configs.get('proxy_password')
-        proxy_trust_id = proxy_configs.get('proxy_trust_id')
-        proxy_user = k.client_for_proxy_user(proxy_username,
-                                             proxy_password,
-                                             proxy_trust_id)
-        t.delete_trust(proxy_user, proxy_trust_id)
-        proxy_user_delete(proxy_username)
+        if is_pooled_user(proxy_username):
+            POOL.release(job_execution.id, proxy_username)
+        else:
+            _delete_proxy_user_with_trust(proxy_configs)
         update = job_execution.job_configs.to_dict()
         del update['proxy_configs']
         return update
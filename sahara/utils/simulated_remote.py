@@ -0,0 +1,127 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Remote of the instances of the simulated cloud.
+
+Files written to the instances are kept in memory, commands succeed
+without output except for the ones reading files and the partitions of
+the attached volumes. See sahara.utils.openstack.simulated.
+"""
+
+from oslo_config import cfg
+import six
+
+from sahara import context
+from sahara import exceptions as ex
+from sahara.i18n import _
+from sahara.utils.openstack import simulated
+from sahara.utils import remote
+
+
+CONF = cfg.CONF
+
+
+class SimulatedRemoteDriver(remote.RemoteDriver):
+    def get_type_and_version(self):
+        return "simulated.1.0"
+
+    def setup_remote(self, engine):
+        pass
+
+    def get_remote(self, instance):
+        return SimulatedRemote(instance)
+
+    def get_userdata_template(self):
+        return ""
+
+
+class SimulatedRemote(remote.Remote):
+    def __init__(self, instance):
+        self.instance = instance
+        self.project = simulated.get_cloud().project(instance.tenant_id)
+        # the files go away with the server
+        self.files = self.project.server_files(instance.instance_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def _delay(self):
+        if CONF.simulated_cloud.remote_latency > 0:
+            context.sleep(CONF.simulated_cloud.remote_latency)
+
+    def get_neutron_info(self):
+        return {}
+
+    def get_http_client(self, port, info=None):
+        raise ex.NotImplementedException(
+            _("HTTP access to the simulated instances"))
+
+    def close_http_session(self, port):
+        pass
+
+    def _partitions(self):
+        lines = ['major minor  #blocks  name', '']
+        lines.append('253        0   10485760 vda')
+        for volume in self.project.server_volumes(self.instance.instance_id):
+            lines.append('253       16   10485760 %s' %
+                         volume.device[len('/dev/'):])
+        return '\n'.join(lines)
+
+    def execute_command(self, cmd, run_as_root=False, get_stderr=False,
+                        raise_when_error=True, timeout=300):
+        self._delay()
+        stdout = ''
+        if cmd == 'cat /proc/partitions':
+            stdout = self._partitions()
+        elif cmd.startswith('cat '):
+            stdout = self.files.get(cmd[len('cat '):].strip(), '')
+        elif cmd.startswith('sudo mv '):
+            src, dst = cmd[len('sudo mv '):].split()
+            if src in self.files:
+                self.files[dst] = self.files.pop(src)
+
+        if get_stderr:
+            return 0, stdout, ''
+        return 0, stdout
+
+    def write_file_to(self, remote_file, data, run_as_root=False, timeout=120):
+        self._delay()
+        self.files[remote_file] = data
+
+    def append_to_file(self, r_file, data, run_as_root=False, timeout=120):
+        self._delay()
+        self.files[r_file] = self.files.get(r_file, '') + data
+
+    def write_files_to(self, files, run_as_root=False, timeout=120):
+        self._delay()
+        self.files.update(files)
+
+    def append_to_files(self, files, run_as_root=False, timeout=120):
+        self._delay()
+        for r_file, data in six.iteritems(files):
+            self.files[r_file] = self.files.get(r_file, '') + data
+
+    def read_file_from(self, remote_file, run_as_root=False, timeout=120):
+        self._delay()
+        return self.files.get(remote_file, '')
+
+    def replace_remote_string(self, remote_file, old_str, new_str,
+                              timeout=120):
+        self._delay()
+        self.files[remote_file] = self.files.get(remote_file, '').replace(
+            old_str, new_str)
@@ -622,12 +622,22 @@ class InstanceInteropHelper(remote.Remote):
                 gateway_host,
                 gateway_image_username)
 
+    def _connect_subprocess(self, proc):
+        conn_params = self._get_conn_params()
+        try:
+            procutils.run_in_subprocess(proc, _connect, conn_params)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                if conn_params[3]:
+                    # the proxy may go through a router that has changed
+                    neutron.invalidate_router(
+                        self.instance.cluster.neutron_management_network)
+
     def _run(self, func, *args, **kwargs):
         proc = procutils.start_subprocess()
 
         try:
-            procutils.run_in_subprocess(proc, _connect,
-                                        self._get_conn_params())
+            self._connect_subprocess(proc)
             return procutils.run_in_subprocess(proc, func, args, kwargs)
         except Exception:
             with excutils.save_and_reraise_exception():
@@ -772,8 +782,7 @@ class BulkInstanceInteropHelper(InstanceInteropHelper):
         super(BulkInstanceInteropHelper, self).__init__(instance)
         self.proc = procutils.start_subprocess()
         try:
-            procutils.run_in_subprocess(self.proc, _connect,
-                                        self._get_conn_params())
+            self._connect_subprocess(self.proc)
         except Exception:
             with excutils.save_and_reraise_exception():
                 procutils.shutdown_subprocess(self.proc, _cleanup)
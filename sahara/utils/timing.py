@@ -0,0 +1,267 @@
+# Copyright (c) 2015 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Breakdown of the time spent on serving API requests.
+
+The time of a request is split into phases: authentication, validation,
+conductor (database) calls, calls to other OpenStack services and
+serialization of the response, the rest of the time is reported as
+'other'. Phases are measured in the green thread serving the request,
+see sahara.api.middleware.timing. A phase measured inside another one,
+e.g. a conductor call made by a validator, is only accounted to the
+inner phase.
+
+Percentiles of the phases are aggregated per route in memory of the API
+process serving the requests.
+"""
+
+import collections
+import contextlib
+import math
+import time
+
+from eventlet.green import threading
+from oslo_config import cfg
+from oslo_log import log as logging
+import six
+
+from sahara.i18n import _LW
+
+
+LOG = logging.getLogger(__name__)
+
+timing_opts = [
+    cfg.FloatOpt('slow_request_threshold',
+                 default=5.0,
+                 help='Requests served in more than this number of seconds '
+                      'are logged with the breakdown of their time '
+                      '(0 disables the log).'),
+    cfg.IntOpt('request_timing_samples',
+               default=1000,
+               help='Number of the latest requests of every API route '
+                    'used to compute the percentiles of the request '
+                    'timings.')
+]
+
+CONF = cfg.CONF
+CONF.register_opts(timing_opts)
+
+PHASES = ['auth', 'validation', 'conductor', 'openstack', 'serialization']
+
+PERCENTILES = [50, 90, 99]
+
+_local = threading.local()
+
+
+class RequestTiming(object):
+    """Time spent on the phases of a request."""
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.route = None
+        self.discarded = False
+        self.started_at = time.time()
+        self.phases = collections.defaultdict(float)
+        # [phase, time the phase was entered or resumed at]
+        self._stack = []
+
+    def elapsed(self):
+        return time.time() - self.started_at
+
+    def add(self, phase, seconds):
+        self.phases[phase] += seconds
+
+    def enter(self, phase):
+        now = time.time()
+        if self._stack:
+            outer = self._stack[-1]
+            self.phases[outer[0]] += now - outer[1]
+        self._stack.append([phase, now])
+
+    def exit(self):
+        now = time.time()
+        phase, resumed_at = self._stack.pop()
+        self.phases[phase] += now - resumed_at
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def breakdown(self, total):
+        res = {phase: self.phases.get(phase, 0.0) for phase in PHASES}
+        res['other'] = max(total - sum(six.itervalues(self.phases)), 0.0)
+        return res
+
+
+def _percentile(values, percent):
+    """Nearest-rank percentile of the sorted values."""
+    rank = int(math.ceil(percent / 100.0 * len(values)))
+    return values[max(rank - 1, 0)]
+
+
+def _summarize(values):
+    """Return percentiles of the values in seconds as milliseconds."""
+    values = sorted(values)
+    res = {'p%d' % p: round(_percentile(values, p) * 1000, 1)
+           for p in PERCENTILES}
+    res['max'] = round(values[-1] * 1000, 1)
+    return res
+
+
+class RouteStats(object):
+    """Timings of the latest requests of every route."""
+
+    def __init__(self):
+        self._samples = {}
+        self._counts = collections.defaultdict(int)
+
+    def add(self, route, total, breakdown):
+        samples = self._samples.get(route)
+        if samples is None:
+            samples = collections.deque(maxlen=CONF.request_timing_samples)
+            self._samples[route] = samples
+        samples.append((total, breakdown))
+        self._counts[route] += 1
+
+    def get(self):
+        res = {}
+        for route, samples in six.iteritems(self._samples.copy()):
+            samples = list(samples)
+            if not samples:
+                continue
+            stats = {'count': self._counts[route],
+                     'total': _summarize([s[0] for s in samples])}
+            for phase in PHASES + ['other']:
+                stats[phase] = _summarize([s[1][phase] for s in samples])
+            res[route] = stats
+        return res
+
+    def clear(self):
+        self._samples.clear()
+        self._counts.clear()
+
+
+STATS = RouteStats()
+
+
+def current():
+    """Return the timing of the request served by this thread or None."""
+    return getattr(_local, 'timing', None)
+
+
+def start(method, path):
+    timing = RequestTiming(method, path)
+    _local.timing = timing
+    return timing
+
+
+def start_route(route):
+    """Mark the start of the view of the route.
+
+    The time spent on the request before, i.e. in the authentication
+    middleware, is accounted to the 'auth' phase.
+    """
+    timing = current()
+    if timing is not None:
+        timing.route = route
+        timing.add('auth', timing.elapsed())
+
+
+def discard():
+    """Don't account the current request, e.g. long-lived streams."""
+    timing = current()
+    if timing is not None:
+        timing.discarded = True
+
+
+def finish(timing):
+    _local.timing = None
+    if timing.discarded:
+        return
+
+    total = timing.elapsed()
+    breakdown = timing.breakdown(total)
+    if timing.route:
+        STATS.add(timing.route, total, breakdown)
+
+    threshold = CONF.slow_request_threshold
+    if threshold > 0 and total >= threshold:
+        LOG.warning(_LW("Slow request {method} {path} served in {total:.3f} "
+                        "seconds: {breakdown}").format(
+                    method=timing.method, path=timing.path, total=total,
+                    breakdown=', '.join(
+                        '%s %.3f' % (phase, breakdown[phase])
+                        for phase in PHASES + ['other'])))
+
+
+def get_stats():
+    return STATS.get()
+
+
+@contextlib.contextmanager
+def measure(phase):
+    """Account the time spent in the block to the phase of the request."""
+    timing = current()
+    if timing is None:
+        yield
+        return
+
+    timing.enter(phase)
+    try:
+        yield
+    finally:
+        timing.exit()
+
+
+def _measured_call(func, phase):
+    def handler(*args, **kwargs):
+        with measure(phase):
+            return func(*args, **kwargs)
+
+    return handler
+
+
+class Measured(object):
+    """Proxy measuring the method calls of the wrapped object.
+
+    Objects referenced by the attributes of the wrapped object, e.g. the
+    managers of an OpenStack client, are wrapped as well up to the given
+    depth.
+    """
+
+    _plain_types = six.string_types + six.integer_types + (
+        float, bool, list, tuple, dict, set, type(None))
+
+    def __init__(self, obj, phase, depth=0):
+        self._obj = obj
+        self._phase = phase
+        self._depth = depth
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if callable(attr):
+            return _measured_call(attr, self._phase)
+        if self._depth > 0 and not isinstance(attr, self._plain_types):
+            return Measured(attr, self._phase, self._depth - 1)
+        return attr
+
+
+def measured_client(client):
+    """Measure the calls of an OpenStack client made by API requests.
+
+    The client is returned as is outside of API requests.
+    """
+    if current() is None:
+        return client
+    return Measured(client, 'openstack', depth=1)
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import six
+
 from sahara.i18n import _
 
 
@@ -94,3 +96,13 @@ def is_int(s):
         return True
     except Exception:
         return False
+
+
+def select_fields(dct, fields):
+    """Return a dictionary containing only the given fields of dct.
+
+    The whole dct is returned if fields is None.
+    """
+    if fields is None:
+        return dct
+    return {k: v for k, v in six.iteritems(dct) if k in fields}
@@ -20,14 +20,17 @@
 
 import datetime
 import errno
+import hashlib
 import os
 import signal
+import time
 from xml.dom import minidom
 from xml.parsers import expat
 from xml import sax
 from xml.sax import expatreader
 
 import eventlet
+from eventlet.support import greenlets as greenlet
 from eventlet import wsgi
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -40,6 +43,7 @@ from sahara.i18n import _
 from sahara.i18n import _LE
 from sahara.i18n import _LI
 from sahara.openstack.common import sslutils
+from sahara.utils.notification import events
 
 LOG = logging.getLogger(__name__)
 
@@ -50,6 +54,16 @@ wsgi_opts = [
                     "max_header_line may need to be increased when using "
                     "large tokens (typically those generated by the "
                     "Keystone v3 API with big service catalogs)."),
+    cfg.IntOpt('api_worker_stats_interval',
+               default=300,
+               help="Interval in seconds between the reports of the number "
+                    "and latency of the requests served by each API worker "
+                    "(0 disables the reports)."),
+    cfg.IntOpt('api_worker_drain_timeout',
+               default=60,
+               help="Maximum number of seconds an API worker replaced on "
+                    "reload waits for its running requests to complete, "
+                    "the connections still open then are dropped."),
 ]
 
 CONF = cfg.CONF
@@ -133,16 +147,49 @@ class DictSerializer(ActionDispatcher):
         return ""
 
 
+def _sanitizer(obj):
+    if isinstance(obj, datetime.datetime):
+        _dtime = obj - datetime.timedelta(microseconds=obj.microsecond)
+        return _dtime.isoformat()
+    return unicode(obj)
+
+
+class SerializedJSON(six.text_type):
+    """JSON document inserted into serialized lists as is."""
+
+    @property
+    def etag(self):
+        if '_etag' not in self.__dict__:
+            self._etag = hashlib.md5(self.encode('utf-8')).hexdigest()
+        return self._etag
+
+
 class JSONDictSerializer(DictSerializer):
     """Default JSON request body serialization."""
 
     def default(self, data):
-        def sanitizer(obj):
-            if isinstance(obj, datetime.datetime):
-                _dtime = obj - datetime.timedelta(microseconds=obj.microsecond)
-                return _dtime.isoformat()
-            return unicode(obj)
-        return jsonutils.dumps(data, default=sanitizer)
+        return jsonutils.dumps(data, default=_sanitizer)
+
+    def serialize_list(self, name, items, extra=None):
+        """Serialize {name: items} updated with extra chunk by chunk.
+
+        Items are serialized one at a time while the chunks are consumed,
+        so that the whole list never has to be held in memory in its
+        serialized form. SerializedJSON items are inserted as is.
+        """
+        yield '{%s: [' % self.default(name)
+        for index, item in enumerate(items):
+            if index:
+                yield ', '
+            if isinstance(item, SerializedJSON):
+                yield item
+            else:
+                yield self.default(item)
+        yield ']'
+
+        for key, value in six.iteritems(extra or {}):
+            yield ', %s: %s' % (self.default(key), self.default(value))
+        yield '}'
 
 
 class XMLDictSerializer(DictSerializer):
@@ -335,6 +382,41 @@ class XMLDeserializer(TextDeserializer):
         return {'body': self._from_xml(datastring)}
 
 
+class WorkerStats(object):
+    """Number and latency of the requests served by an API worker."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = time.time()
+        self.requests = 0
+        self.total_time = 0.0
+
+    def wrap(self, application):
+        def handler(environ, start_response):
+            started_at = time.time()
+            try:
+                return application(environ, start_response)
+            finally:
+                self.requests += 1
+                self.total_time += time.time() - started_at
+
+        return handler
+
+    def report(self):
+        """Log the stats collected since the last report and reset them."""
+        elapsed = time.time() - self.started_at
+        LOG.info(_LI("API worker {pid}: {requests} requests in {elapsed:.0f} "
+                     "seconds, {rate:.2f} requests/s, average latency "
+                     "{latency:.1f} ms").format(
+                 pid=os.getpid(), requests=self.requests, elapsed=elapsed,
+                 rate=self.requests / elapsed if elapsed else 0,
+                 latency=(self.total_time / self.requests * 1000
+                          if self.requests else 0)))
+        self.reset()
+
+
 class Server(object):
     """Server class to manage multiple WSGI sockets and applications."""
 
@@ -342,12 +424,24 @@ class Server(object):
         eventlet.wsgi.MAX_HEADER_LINE = CONF.max_header_line
         self.threads = threads
         self.children = []
+        # children replaced on reload, which are finishing their requests
+        self.retiring = set()
         self.running = True
+        self.reloading = False
+        self.warm_up = None
+        self.reload = None
+        self.stats = WorkerStats()
 
-    def start(self, application):
+    def start(self, application, warm_up=None, reload=None):
         """Run a WSGI server with the given application.
 
         :param application: The application to run in the WSGI server
+        :param warm_up: A function building the state shared by the
+                        workers, it's called before the workers are forked,
+                        so that they share the state copy-on-write
+        :param reload: A function applying the reloaded configuration to
+                       the state shared by the workers, it's called on
+                       reload before warm_up
         """
         def kill_children(*args):
             """Kills the entire process group."""
@@ -357,25 +451,29 @@ class Server(object):
             os.killpg(0, signal.SIGTERM)
 
         def hup(*args):
-            """Shuts down the server(s).
+            """Reloads the workers.
 
-            Shuts down the server(s), but allows running requests to complete
+            The workers are replaced one by one, the replaced workers
+            complete the running requests before they exit.
             """
-            LOG.error(_LE('SIGHUP received'))
-            signal.signal(signal.SIGHUP, signal.SIG_IGN)
-            os.killpg(0, signal.SIGHUP)
-            signal.signal(signal.SIGHUP, hup)
+            LOG.info(_LI('SIGHUP received, reloading workers'))
+            self.reloading = True
 
-        self.application = application
+        self.application = self.stats.wrap(application)
+        self.warm_up = warm_up
+        self.reload = reload
         self.sock = eventlet.listen((CONF.host, CONF.port), backlog=500)
         if sslutils.is_enabled():
             LOG.info(_LI("Using HTTPS for port %s"), CONF.port)
             self.sock = sslutils.wrap(self.sock)
 
+        if self.warm_up:
+            self.warm_up()
+
         if CONF.api_workers == 0:
             # Useful for profiling, test, debug etc.
             self.pool = eventlet.GreenPool(size=self.threads)
-            self.pool.spawn_n(self._single_run, application, self.sock)
+            self.pool.spawn_n(self._single_run, self.application, self.sock)
             return
 
         LOG.debug("Starting %d workers", CONF.api_workers)
@@ -387,11 +485,18 @@ class Server(object):
     def wait_on_children(self):
         while self.running:
             try:
+                if self.reloading:
+                    self.reloading = False
+                    self.reload_children()
                 pid, status = os.wait()
                 if os.WIFEXITED(status) or os.WIFSIGNALED(status):
-                    LOG.error(_LE('Removing dead child %s'), pid)
                     self.children.remove(pid)
-                    self.run_child()
+                    if pid in self.retiring:
+                        LOG.info(_LI('Replaced child %s exited'), pid)
+                        self.retiring.remove(pid)
+                    else:
+                        LOG.error(_LE('Removing dead child %s'), pid)
+                        self.run_child()
             except OSError as err:
                 if err.errno not in (errno.EINTR, errno.ECHILD):
                     raise
@@ -403,6 +508,28 @@ class Server(object):
         self.sock.close()
         LOG.debug('Server exited')
 
+    def reload_children(self):
+        """Reload the configuration and replace the children one by one.
+
+        A new child is started before an old one is asked to stop, so
+        that there are always workers accepting requests.
+        """
+        try:
+            CONF.reload_config_files()
+            if self.reload:
+                self.reload()
+        except Exception:
+            LOG.exception(_LE('Failed to reload, the workers are kept'))
+            return
+
+        if self.warm_up:
+            self.warm_up()
+
+        for pid in [pid for pid in self.children if pid not in self.retiring]:
+            self.run_child()
+            self.retiring.add(pid)
+            os.kill(pid, signal.SIGHUP)
+
     def wait(self):
         """Wait until all servers have completed running."""
         try:
@@ -416,25 +543,56 @@ class Server(object):
     def run_child(self):
         pid = os.fork()
         if pid == 0:
-            signal.signal(signal.SIGHUP, signal.SIG_DFL)
+            signal.signal(signal.SIGHUP, self._stop_child)
             signal.signal(signal.SIGTERM, signal.SIG_DFL)
             self.run_server()
             LOG.debug('Child %d exiting normally', os.getpid())
-            return
+            # don't return to the loops of the parent
+            os._exit(0)
         else:
             LOG.info(_LI('Started child %s'), pid)
             self.children.append(pid)
 
+    def _stop_child(self, *args):
+        """Stops accepting requests, running requests are completed.
+
+        Event streams never complete on their own, they are ended. The
+        requests still running and the idle keep-alive connections are
+        dropped after api_worker_drain_timeout seconds.
+        """
+        LOG.info(_LI('Child %d stopping'), os.getpid())
+        eventlet.spawn_n(self.server.kill)
+        events.close_subscriptions()
+        eventlet.spawn_after(CONF.api_worker_drain_timeout, self._exit_child)
+
+    def _exit_child(self):
+        LOG.info(_LI('Child %d exiting with open connections'), os.getpid())
+        os._exit(0)
+
     def run_server(self):
         """Run a WSGI server."""
         self.pool = eventlet.GreenPool(size=self.threads)
-        wsgi.server(self.sock,
-                    self.application,
-                    custom_pool=self.pool,
-                    log=loggers.WritableLogger(LOG),
-                    debug=False)
+        if CONF.api_worker_stats_interval > 0:
+            eventlet.spawn_n(self._report_stats)
+
+        self.server = eventlet.spawn(wsgi.server,
+                                     self.sock,
+                                     self.application,
+                                     custom_pool=self.pool,
+                                     log=loggers.WritableLogger(LOG),
+                                     debug=False)
+        try:
+            self.server.wait()
+        except greenlet.GreenletExit:
+            pass
         self.pool.waitall()
 
+    def _report_stats(self):
+        self.stats.reset()
+        while True:
+            eventlet.sleep(CONF.api_worker_stats_interval)
+            self.stats.report()
+
     def _single_run(self, application, sock):
         """Start a WSGI server in a new green thread."""
         LOG.info(_LI("Starting single process server"))